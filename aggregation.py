@@ -0,0 +1,270 @@
+# Verantwortung: Kennzahlen in einem Durchlauf über CSV-Zeilen aggregieren (konstanter Speicher
+# für Noten/ECTS). Keine IO/GUI hier; die Formeln selbst liegen in Studiengang.
+from __future__ import annotations
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+import hashlib
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import messung
+from csv_daten import CsvLesefehler, CsvRepository
+from dekodierer import Zeilendekodierer
+from klassen import Kurs, KursStatus, Pruefungsleistung, SemesterIndex, Studiengang, _teilsumme_addieren
+from mapping import zeile_mappen
+from statistik import Notenstatistik
+
+@dataclass
+class KennzahlenAggregat:
+    """
+    Laufende Teilergebnisse: Notensumme/-anzahl, abgeschlossene ECTS, belegte Kurse.
+    Die Notensumme wird exakt als Teilsummen geführt, damit serielle, parallele und
+    inkrementelle Läufe bitgleiche Durchschnitte liefern.
+    - kurse_behalten=False: belegte Kurse nur zählen (konstanter Speicher, z. B. im Exportvergleich)
+    """
+    notenteile: List[float] = field(default_factory=list)
+    notenanzahl: int = 0
+    ects_abgeschlossen: int = 0
+    belegte_kurse: List[Kurs] = field(default_factory=list)
+    zeilen: int = 0
+    anzahl_belegt: int = 0
+    kurse_behalten: bool = True
+
+    def hinzufuegen(self, kurs: Kurs, pruefungsleistung: Optional[Pruefungsleistung]) -> None:
+        """Verarbeitet eine gemappte CSV-Zeile (gleiche Regeln wie die Studiengang-Methoden)."""
+        self.zeilen += 1
+        if pruefungsleistung is not None and pruefungsleistung.note is not None:
+            _teilsumme_addieren(self.notenteile, pruefungsleistung.note)
+            self.notenanzahl += 1
+        if kurs.status == KursStatus.ABGESCHLOSSEN and kurs.ects is not None:
+            self.ects_abgeschlossen += kurs.ects
+        elif kurs.status == KursStatus.BELEGT:
+            self.anzahl_belegt += 1
+            if self.kurse_behalten:
+                self.belegte_kurse.append(kurs)
+
+    def zusammenfuehren(self, anderes: "KennzahlenAggregat") -> None:
+        """Hängt ein später in der Datei liegendes Teilergebnis an (Reihenfolge bleibt erhalten)."""
+        self.zeilen += anderes.zeilen
+        for teil in anderes.notenteile:
+            _teilsumme_addieren(self.notenteile, teil)
+        self.notenanzahl += anderes.notenanzahl
+        self.ects_abgeschlossen += anderes.ects_abgeschlossen
+        self.anzahl_belegt += anderes.anzahl_belegt
+        if self.kurse_behalten:
+            self.belegte_kurse.extend(anderes.belegte_kurse)
+
+    @property
+    def notensumme(self) -> float:
+        """Korrekt gerundete Summe aller Noten."""
+        return math.fsum(self.notenteile)
+
+    def kopie(self) -> "KennzahlenAggregat":
+        """Unabhängige Kopie (Teilsummen und Kursliste werden flach kopiert)."""
+        return replace(self, notenteile=list(self.notenteile), belegte_kurse=list(self.belegte_kurse))
+
+    def durchschnitt(self, studiengang: Studiengang) -> Optional[float]:
+        """Entspricht Studiengang.berechneGesamtdurchschnitt."""
+        return studiengang.berechneDurchschnittAus(self.notensumme, self.notenanzahl)
+
+    def ects_prozent(self, studiengang: Studiengang) -> float:
+        """Entspricht Studiengang.berechneEctsProzent."""
+        return studiengang.berechneEctsProzentAus(self.ects_abgeschlossen)
+
+def aggregiere_zeilen(zeilen: Iterable[dict], aggregat: Optional[KennzahlenAggregat] = None) -> KennzahlenAggregat:
+    """
+    Konsumiert CSV-Rohzeilen genau einmal und aktualisiert alle Kennzahlen inkrementell.
+    - Keine Kurs-/Prüfungslisten; nur belegte Kurse werden (für die Tabelle) behalten
+    - Optional wird ein bestehendes Aggregat fortgeschrieben
+    """
+    ergebnis = aggregat if aggregat is not None else KennzahlenAggregat()
+    with messung.stufe("aggregation.aggregiere_zeilen") as s:
+        vorher = ergebnis.zeilen
+        for z in zeilen:
+            ergebnis.hinzufuegen(*zeile_mappen(z))
+        s.zeilen = ergebnis.zeilen - vorher
+    return ergebnis
+
+@dataclass
+class DatenSnapshot:
+    """Aufbereiteter Stand einer CSV-Datei: Kennzahlen-Aggregat, Semesterindex und Notenstatistik."""
+    aggregat: KennzahlenAggregat
+    semester: SemesterIndex = field(default_factory=lambda: SemesterIndex(zeilen_merken=False))
+    statistik: Notenstatistik = field(default_factory=Notenstatistik)
+
+def _snapshot_aus(gemappt: Iterable[Tuple[str, Kurs, Optional[Pruefungsleistung]]]) -> DatenSnapshot:
+    snapshot = DatenSnapshot(aggregat=KennzahlenAggregat())
+    with messung.stufe("aggregation.erzeuge_snapshot") as s:
+        for studiengang, kurs, pl in gemappt:
+            snapshot.aggregat.hinzufuegen(kurs, pl)
+            snapshot.semester.hinzufuegen(kurs, pl)
+            if pl is not None and pl.note is not None:
+                snapshot.statistik.hinzufuegen(studiengang, kurs.name, pl.note)
+        s.zeilen = snapshot.aggregat.zeilen
+    return snapshot
+
+def erzeuge_snapshot(zeilen: Iterable[dict]) -> DatenSnapshot:
+    """Mappt alle Zeilen in einem Durchlauf in Aggregat, Semesterindex und Notenstatistik (für den Zwischenspeicher)."""
+    return _snapshot_aus((z.get("studiengang", ""), *zeile_mappen(z)) for z in zeilen)
+
+def erzeuge_snapshot_dekodiert(repo: CsvRepository) -> DatenSnapshot:
+    """Wie erzeuge_snapshot über repo.datenzeilen_iterieren(), aber mit dem auf die Kopfzeile spezialisierten Dekodierer."""
+    return _snapshot_aus(Zeilendekodierer.fuer(repo).kurse(repo.rohzeilen_iterieren()))
+
+def _bereich_aggregieren(dateipfad: str, trennzeichen: str, kodierung: str, start: int, ende: int) -> KennzahlenAggregat:
+    """Worker (Prozesspool): aggregiert einen Byte-Bereich mit denselben Lese- und Mapping-Regeln."""
+    repo = CsvRepository(Path(dateipfad), trennzeichen=trennzeichen, kodierung=kodierung)
+    return aggregiere_zeilen(repo.bereich_zeilen_iterieren(start, ende))
+
+def aggregiere_parallel(repo: CsvRepository, worker: Optional[int] = None, bereiche_pro_worker: int = 4) -> KennzahlenAggregat:
+    """
+    Verteilt satzgrenzen-ausgerichtete Byte-Bereiche auf einen ProcessPoolExecutor und führt
+    die Teilaggregate in Dateireihenfolge zusammen (belegte Kurse in CSV-Reihenfolge).
+    - worker=None: Anzahl CPU-Kerne; worker<=1 oder nicht teilbare Datei: serieller Durchlauf
+    - Ergebnis identisch zum seriellen Modus (Notensumme exakt über Teilsummen zusammengeführt)
+    """
+    # Prozesspool erst bei Bedarf importieren (hält den Start von CLI/Dashboard schlank).
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+
+    anzahl_worker = worker or os.cpu_count() or 1
+    bereiche = repo.byte_bereiche(anzahl_worker * bereiche_pro_worker) if anzahl_worker > 1 else []
+    if len(bereiche) <= 1:
+        return aggregiere_zeilen(repo.datenzeilen_iterieren())
+
+    ergebnis = KennzahlenAggregat()
+    with ProcessPoolExecutor(max_workers=anzahl_worker) as pool:
+        teile = pool.map(
+            _bereich_aggregieren,
+            *zip(*[(str(repo.dateipfad), repo.trennzeichen, repo.kodierung, a, b) for a, b in bereiche])
+        )
+        for teil in teile:
+            ergebnis.zusammenfuehren(teil)
+    return ergebnis
+
+# Gruppenschlüssel: (Studiengang, Student-ID oder None).
+Gruppenschluessel = Tuple[str, Optional[str]]
+
+@dataclass
+class GruppenKennzahl:
+    """Eine Zeile der kompakten Ergebnistabelle je Studiengang (und ggf. Student)."""
+    studiengang: str
+    student: Optional[str]
+    durchschnitt: Optional[float]
+    ects_abgeschlossen: int
+    ects_prozent: float
+    anzahl_belegt: int
+    zeilen: int
+
+def aggregiere_gruppiert(
+    repo: CsvRepository,
+    student_spalte: Optional[str] = None,
+    gesamt: Optional[KennzahlenAggregat] = None,
+    je_studiengang: bool = False,
+) -> Dict[Gruppenschluessel, KennzahlenAggregat]:
+    """
+    Partitioniert die Datenzeilen von `repo` in einem Durchlauf per Hash-Index nach `studiengang`
+    (und optional einer Student-ID-Spalte) und aggregiert jede Gruppe laufend. Aufwand O(Zeilen).
+    - Gruppen erscheinen in der Reihenfolge ihres ersten Auftretens; Kurslisten in CSV-Reihenfolge
+    - Fehlt `student_spalte` in der Kopfzeile: CsvLesefehler (statt alles unter "" zu gruppieren)
+    - je_studiengang=True (mit student_spalte): zusätzlich Summen je Studiengang unter (name, None)
+    - gesamt: wird im selben Durchlauf über alle Zeilen fortgeschrieben
+    """
+    if student_spalte is not None and student_spalte not in repo.spaltenindex:
+        raise CsvLesefehler(f"Spalte '{student_spalte}' fehlt. Gefunden: {repo.kopfzeile}")
+    gruppen: Dict[Gruppenschluessel, KennzahlenAggregat] = {}
+
+    def gruppe(schluessel: Gruppenschluessel) -> KennzahlenAggregat:
+        aggregat = gruppen.get(schluessel)
+        if aggregat is None:
+            aggregat = gruppen[schluessel] = KennzahlenAggregat()
+        return aggregat
+
+    zusaetzlich_je_studiengang = je_studiengang and student_spalte is not None
+    for z in repo.datenzeilen_iterieren():
+        kurs, pl = zeile_mappen(z)
+        name = z.get("studiengang", "")
+        if gesamt is not None:
+            gesamt.hinzufuegen(kurs, pl)
+        if zusaetzlich_je_studiengang:
+            gruppe((name, None)).hinzufuegen(kurs, pl)
+        gruppe((name, z[student_spalte] if student_spalte else None)).hinzufuegen(kurs, pl)
+    return gruppen
+
+def gruppiert_auswerten(repo: CsvRepository, vorlage: Studiengang, student_spalte: Optional[str] = None) -> List[GruppenKennzahl]:
+    """
+    Berechnet die Studiengang-Kennzahlen je Gruppe. Regelzeit, Start und maximale ECTS
+    stammen aus `vorlage`; der Name wird je Gruppe durch den CSV-Wert ersetzt.
+    """
+    tabelle: List[GruppenKennzahl] = []
+    for (name, student), aggregat in aggregiere_gruppiert(repo, student_spalte).items():
+        studiengang = replace(vorlage, name=name)
+        tabelle.append(GruppenKennzahl(
+            studiengang=name,
+            student=student,
+            durchschnitt=aggregat.durchschnitt(studiengang),
+            ects_abgeschlossen=aggregat.ects_abgeschlossen,
+            ects_prozent=aggregat.ects_prozent(studiengang),
+            anzahl_belegt=aggregat.anzahl_belegt,
+            zeilen=aggregat.zeilen,
+        ))
+    return tabelle
+
+class InkrementelleAggregation:
+    """
+    Hält Byte-Offset, Prüfsumme des gelesenen Bereichs und laufendes Aggregat einer wachsenden CSV.
+    aktualisieren() mappt nur den neuen Anhang; wurde die Datei umgeschrieben (Prüfsumme/Größe
+    passt nicht) oder ist sie nicht byte-adressierbar, wird vollständig neu aufgebaut.
+    - Die Prüfsumme deckt den ganzen gelesenen Bereich ab (ein Hash-Durchlauf je Aktualisierung,
+      der gleich um den Anhang fortgeschrieben wird)
+    - stichprobe=n: nur Anfang/Ende je n Bytes prüfen (konstanter Aufwand, erkennt aber keine
+      Umschreibungen in der Mitte; nur für Dateien, die garantiert nur angehängt werden)
+    """
+
+    def __init__(self, repo: CsvRepository, stichprobe: Optional[int] = None) -> None:
+        self._repo = repo
+        self._stichprobe = stichprobe
+        self._offset: Optional[int] = None
+        self._pruefsumme: Optional[str] = None
+        self._aggregat = KennzahlenAggregat()
+        self.vollstaendige_neuaufbauten = 0
+
+    def _anhang_pruefen(self, groesse: int) -> Tuple[bool, Optional["hashlib._Hash"]]:
+        """(reiner Anhang?, Hash-Zustand über den bisher gelesenen Bereich zum Fortschreiben)."""
+        if self._offset is None or groesse < self._offset:
+            return False, None
+        if self._stichprobe is not None:
+            return self._repo.pruefsumme(self._offset, self._stichprobe) == self._pruefsumme, None
+        h = self._repo.praefix_hash(self._offset)
+        return (True, h) if h.hexdigest() == self._pruefsumme else (False, None)
+
+    def aktualisieren(self) -> KennzahlenAggregat:
+        """Liefert das aktuelle Aggregat (Kopie) inklusive einer ggf. noch unvollständigen letzten Zeile."""
+        repo = self._repo
+        if not repo.ist_byte_adressierbar():
+            self.vollstaendige_neuaufbauten += 1
+            return aggregiere_zeilen(repo.datenzeilen_iterieren())
+
+        anhang, basis = self._anhang_pruefen(repo.dateipfad.stat().st_size)
+        if not anhang:
+            # Umgeschrieben: neuer Repository-Zustand (Kopfzeile kann sich geändert haben).
+            repo = self._repo = CsvRepository(repo.dateipfad, trennzeichen=repo.trennzeichen, kodierung=repo.kodierung)
+            self._offset = repo.datenbeginn()
+            self._aggregat = KennzahlenAggregat()
+            self.vollstaendige_neuaufbauten += 1
+
+        assert self._offset is not None
+        start, ende = self._offset, repo.letzte_satzgrenze(self._offset)
+        aggregiere_zeilen(repo.bereich_zeilen_iterieren(start, ende), self._aggregat)
+        self._offset = ende
+        if self._stichprobe is not None:
+            self._pruefsumme = repo.pruefsumme(ende, self._stichprobe)
+        else:
+            self._pruefsumme = repo.praefix_hash(ende, basis, start).hexdigest()
+
+        # Unvollständige letzte Zeile zählt mit, wird aber nicht in den Zustand übernommen.
+        ergebnis = self._aggregat.kopie()
+        groesse = repo.dateipfad.stat().st_size
+        if groesse > ende:
+            aggregiere_zeilen(repo.bereich_zeilen_iterieren(ende, groesse), ergebnis)
+        return ergebnis
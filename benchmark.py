@@ -0,0 +1,211 @@
+# Benchmarks für die Pipeline (getrennt von den Korrektheits-Tests in tests/, dort auch die Dekodierer-Äquivalenz).
+# Misst je Stufe Laufzeit und Spitzen-Speicher auf synthetischen Dateien (datengenerator.py),
+# speichert Ergebnisse als JSON-Baseline und schlägt bei Regressionen über der Schwelle fehl.
+# Aufruf: python benchmark.py [--zeilen 10000 100000 ...] [--baseline-speichern | --vergleichen]
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+VERZEICHNIS = Path(__file__).resolve().parent
+BASELINE_STANDARD = VERZEICHNIS / "benchmark_baseline.json"
+
+Messung = Dict[str, float]
+
+def messen(funktion: Callable[[], object], zeilen: int, wiederholungen: int = 3) -> Messung:
+    """
+    Beste Laufzeit aus `wiederholungen` Läufen (ohne tracemalloc) plus Spitzen-Allokation
+    aus einem separaten Lauf mit tracemalloc (dessen Overhead verfälscht sonst die Zeit).
+    """
+    zeiten = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        zeiten.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        funktion()
+        _, spitze = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    zeit = min(zeiten)
+    return {"zeit_s": zeit, "spitze_bytes": float(spitze), "zeilen_pro_s": zeilen / zeit if zeit > 0 else 0.0}
+
+def stufen_messen(csv_datei: Path, zeilen: int, wiederholungen: int) -> Dict[str, Messung]:
+    """Misst jede Pipeline-Stufe einzeln; Eingaben der späteren Stufen werden vorab materialisiert."""
+    from csv_daten import CsvRepository
+    from klassen import Studiengang
+    from mapping import zeilen_zu_domaene
+
+    repo = CsvRepository(csv_datei)
+    ergebnisse: Dict[str, Messung] = {}
+
+    ergebnisse["datenzeilen_iterieren"] = messen(
+        lambda: sum(1 for _ in CsvRepository(csv_datei).datenzeilen_iterieren()), zeilen, wiederholungen)
+    ergebnisse["datenbloecke_iterieren"] = messen(
+        lambda: sum(len(b["status"]) for b in CsvRepository(csv_datei).datenbloecke_iterieren()), zeilen, wiederholungen)
+
+    with csv_datei.open("r", encoding=repo.kodierung, newline="") as f:
+        zellen = [z for rohzeile in csv.reader(f, delimiter=repo.trennzeichen) for z in rohzeile]
+    sauber = CsvRepository._sauber
+    ergebnisse["_sauber"] = messen(lambda zellen=zellen: [sauber(z) for z in zellen], zeilen, wiederholungen)
+    del zellen
+
+    from dekodierer import Zeilendekodierer
+    from mapping import zeile_mappen
+
+    ergebnisse["zeile_mappen"] = messen(
+        lambda: sum(1 for z in CsvRepository(csv_datei).datenzeilen_iterieren() if zeile_mappen(z)),
+        zeilen, wiederholungen)
+
+    def dekodieren() -> int:
+        r = CsvRepository(csv_datei)
+        return sum(1 for _ in Zeilendekodierer.fuer(r).kurse(r.rohzeilen_iterieren()))
+    ergebnisse["dekodierer"] = messen(dekodieren, zeilen, wiederholungen)
+
+    datenzeilen = list(repo.datenzeilen_iterieren())
+    ergebnisse["zeilen_zu_domaene"] = messen(lambda datenzeilen=datenzeilen: zeilen_zu_domaene(datenzeilen), zeilen, wiederholungen)
+    kurse, pruefungen = zeilen_zu_domaene(datenzeilen)
+    del datenzeilen
+
+    studiengang = Studiengang("Benchmark", 36, date(2023, 9, 30), 180)
+    ergebnisse["berechneGesamtdurchschnitt"] = messen(
+        lambda: studiengang.berechneGesamtdurchschnitt(pruefungen), zeilen, wiederholungen)
+    ergebnisse["berechneEctsProzent"] = messen(lambda: studiengang.berechneEctsProzent(kurse), zeilen, wiederholungen)
+    ergebnisse["berechneVerbleibendeTage"] = messen(studiengang.berechneVerbleibendeTage, zeilen, wiederholungen)
+    ergebnisse["getBelegteKurse"] = messen(lambda: studiengang.getBelegteKurse(kurse), zeilen, wiederholungen)
+    return ergebnisse
+
+def speicher_je_kurs(csv_datei: Path) -> Dict[str, float]:
+    """
+    Speicherbedarf je Kursdatensatz (tracemalloc, Bytes): bisheriges Modell (Dataclass mit __dict__,
+    eigener Namens-String je Zeile) gegenüber slotted Kurs mit geteiltem Namen aus dem String-Pool.
+    """
+    from dataclasses import dataclass
+    from klassen import KursStatus
+    from csv_daten import CsvRepository
+    from mapping import _als_int, _als_kursstatus, zeile_zu_kurs
+
+    @dataclass
+    class KursMitDict:
+        name: str
+        ects: Optional[int]
+        status: KursStatus
+        semester_nummer: Optional[int] = None
+
+    def alt(z: dict) -> KursMitDict:
+        # Kopie des Namens erzwingt wie früher einen eigenen String je Zeile.
+        return KursMitDict("".join(z["kurs_name"].strip()), _als_int(z["ects"]), _als_kursstatus(z["status"]),
+                           _als_int(z["semester_nummer"]))
+
+    datenzeilen = list(CsvRepository(csv_datei).datenzeilen_iterieren())
+    ergebnis: Dict[str, float] = {}
+    for name, fabrik in (("dataclass_mit_dict", alt), ("slots_mit_pool", zeile_zu_kurs)):
+        tracemalloc.start()
+        try:
+            vorher = tracemalloc.get_traced_memory()[0]
+            kurse = [fabrik(z) for z in datenzeilen]
+            ergebnis[f"{name}_bytes_je_kurs"] = (tracemalloc.get_traced_memory()[0] - vorher) / max(len(kurse), 1)
+        finally:
+            tracemalloc.stop()
+        del kurse
+    ergebnis["faktor"] = ergebnis["dataclass_mit_dict_bytes_je_kurs"] / max(ergebnis["slots_mit_pool_bytes_je_kurs"], 1.0)
+    return ergebnis
+
+def kaltstart(csv_datei: Path, wiederholungen: int = 10) -> Dict[str, float]:
+    """
+    Misst den Kaltstart des Headless-Exports (neuer Interpreter je Lauf, Ausgabe verworfen)
+    und prüft, dass dabei kein Streamlit-Modul geladen wird.
+    """
+    befehl = [sys.executable, str(VERZEICHNIS / "kennzahlen_export.py"), str(csv_datei)]
+    zeiten: List[float] = []
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        subprocess.run(befehl, check=True, stdout=subprocess.DEVNULL, cwd=VERZEICHNIS)
+        zeiten.append(time.perf_counter() - start)
+
+    pruefung = (
+        "import sys, kennzahlen_export; kennzahlen_export.main([sys.argv[1]]); "
+        "sys.stderr.write(str(any(m.split('.')[0] == 'streamlit' for m in sys.modules)))"
+    )
+    lauf = subprocess.run([sys.executable, "-c", pruefung, str(csv_datei)], check=True, cwd=VERZEICHNIS,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if lauf.stderr.strip() != "False":
+        raise RuntimeError("Headless-Export hat Streamlit importiert.")
+
+    return {"zeit_s": statistics.median(zeiten), "min_s": min(zeiten), "max_s": max(zeiten)}
+
+def regressionen(aktuell: dict, baseline: dict, schwelle: float, min_zeit: float) -> List[str]:
+    """
+    Vergleicht Zeit und Spitzen-Speicher je Größe/Stufe mit der Baseline.
+    Stufen unter `min_zeit` Sekunden werden bei der Zeit ignoriert (Messrauschen).
+    """
+    meldungen: List[str] = []
+    for gruppe, stufen in aktuell.items():
+        for stufe, werte in stufen.items():
+            alt = baseline.get(gruppe, {}).get(stufe)
+            if not alt:
+                continue
+            for metrik in ("zeit_s", "spitze_bytes"):
+                if metrik not in werte or metrik not in alt:
+                    continue
+                if metrik == "zeit_s" and alt[metrik] < min_zeit:
+                    continue
+                if werte[metrik] > alt[metrik] * (1.0 + schwelle):
+                    meldungen.append(f"{gruppe}/{stufe}: {metrik} {werte[metrik]:.4g} > Baseline {alt[metrik]:.4g} (+{schwelle:.0%})")
+    return meldungen
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Pipeline-Benchmarks ausführen.")
+    parser.add_argument("--zeilen", type=int, nargs="+", default=[10_000], help="Dateigrößen in Datenzeilen")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--wiederholungen", type=int, default=3)
+    parser.add_argument("--daten-verzeichnis", type=Path, default=Path(tempfile.gettempdir()) / "studium_benchmark")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_STANDARD)
+    parser.add_argument("--baseline-speichern", action="store_true", help="Ergebnisse als neue Baseline schreiben")
+    parser.add_argument("--vergleichen", action="store_true", help="Mit Baseline vergleichen, Exit-Code 1 bei Regression")
+    parser.add_argument("--schwelle", type=float, default=0.25, help="Erlaubte Verschlechterung (0.25 = 25 %%)")
+    parser.add_argument("--min-zeit", type=float, default=0.005, help="Zeitvergleich erst ab dieser Baseline-Dauer (s)")
+    parser.add_argument("--ohne-kaltstart", action="store_true")
+    args = parser.parse_args(argv)
+
+    from datengenerator import erzeuge_csv
+
+    args.daten_verzeichnis.mkdir(parents=True, exist_ok=True)
+    ergebnisse: dict = {}
+    for zeilen in args.zeilen:
+        datei = args.daten_verzeichnis / f"studium_{zeilen}_{args.seed}.csv"
+        if not datei.exists():
+            erzeuge_csv(datei, zeilen, seed=args.seed)
+        ergebnisse[f"zeilen_{zeilen}"] = stufen_messen(datei, zeilen, args.wiederholungen)
+        ergebnisse[f"speicher_{zeilen}"] = {"kurs": speicher_je_kurs(datei)}
+    if not args.ohne_kaltstart:
+        ergebnisse["kaltstart"] = {"kennzahlen_export": kaltstart(VERZEICHNIS / "studium.csv", 10)}
+
+    print(json.dumps(ergebnisse, indent=2))
+
+    if args.baseline_speichern:
+        args.baseline.write_text(json.dumps(ergebnisse, indent=2), encoding="utf-8")
+    if args.vergleichen:
+        if not args.baseline.exists():
+            print(f"Keine Baseline gefunden: {args.baseline}", file=sys.stderr)
+            return 2
+        meldungen = regressionen(ergebnisse, json.loads(args.baseline.read_text(encoding="utf-8")),
+                                 args.schwelle, args.min_zeit)
+        for meldung in meldungen:
+            print(f"REGRESSION {meldung}", file=sys.stderr)
+        return 1 if meldungen else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,26 @@
 # Orchestrierung: CSV lesen -> Domain mappen -> Studiengang instanziieren -> Kennzahlen berechnen.
+# Stellt die Pipeline als Funktion bereit (berechne_kennzahlen) plus eine memoisierte Variante
+# (lade_kennzahlen), die bei geänderter CSV automatisch neu rechnet.
 from __future__ import annotations
 
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from datetime import date
+from typing import TYPE_CHECKING, List, Optional, Tuple
+import logging
+import threading
 
+import messung
+from aggregation import DatenSnapshot, erzeuge_snapshot, erzeuge_snapshot_dekodiert
 from csv_daten import CsvRepository
-from mapping import zeilen_zu_domaene
-from klassen import Studiengang, KursStatus
+from klassen import Kurs, SemesterIndex, Studiengang
+from kursindex import KursIndex
+from mapping import Duplikatregel, zeilen_deduplizieren, zeilen_zu_tabelle
+from zwischenspeicher import SnapshotCache
+
+if TYPE_CHECKING:
+    import argparse  # nur für Typangaben; die CLIs importieren argparse selbst
 
 # Pfad zur Datenquelle (CSV).
 csv_datei_pfad = Path("studium.csv")
@@ -17,31 +31,229 @@ regelzeit_monate = 36
 # Studienende (hier fest gesetzt, entspricht Projektannahme/Anforderung)
 studienende = date(2026, 9, 30)
 maximale_ects = 180
-# Startdatum ~ Ende minus Regelzeit (einfacher Rücksprung um 36*~30 Tage)
-startdatum = date(studienende.year - 3, studienende.month, studienende.day)
-
-# CSV-Rohdaten iterieren (robuster Reader, toleriert verschiedene Exportformen).
-repo = CsvRepository(csv_datei_pfad)
-if hasattr(repo, "datenzeilen_iterieren"):
-    zeilen = repo.datenzeilen_iterieren()
-else:
-    # Abwärtskompatibilität, falls ältere Variante vorhanden wäre.
-    zeilen = repo.iter_rows()  # type: ignore[attr-defined]
-
-# Mapping in Domänenobjekte (keine Fachlogik; reine Konvertierung).
-kurse, pruefungsleistungen = zeilen_zu_domaene(zeilen)
-
-# Studiengang-Instanz als Aggregatwurzel.
-studiengang = Studiengang(
-    name=name_studiengang,
-    regelzeitMonate=regelzeit_monate,
-    startDatum=startdatum,
-    maximaleEcts=maximale_ects
-)
-
-# Kennzahlen (nur Methodenaufrufe auf der Domäne, keine Berechnungs-„Lecks“ in die Orchestrierung).
-durchschnitt = studiengang.berechneGesamtdurchschnitt(pruefungsleistungen)
-ects_prozent = studiengang.berechneEctsProzent(kurse)
-ects_abgeschlossen = sum((k.ects or 0) for k in kurse if k.status == KursStatus.ABGESCHLOSSEN)
-verbleibende_tage = studiengang.berechneVerbleibendeTage()
-belegte_kurse = studiengang.getBelegteKurse(kurse)
\ No newline at end of file
+
+@dataclass(frozen=True)
+class StudiengangParameter:
+    """Domänen-Parameter eines Studiengangs (hashbar, dient als Teil des Cache-Schlüssels)."""
+    name: str = name_studiengang
+    regelzeit_monate: int = regelzeit_monate
+    studienende: date = studienende
+    maximale_ects: int = maximale_ects
+
+    @property
+    def startdatum(self) -> date:
+        # Startdatum ~ Ende minus Regelzeit (einfacher Rücksprung um volle Jahre)
+        return date(self.studienende.year - self.regelzeit_monate // 12, self.studienende.month, self.studienende.day)
+
+    @classmethod
+    def aus_args(cls, args: "argparse.Namespace") -> "StudiengangParameter":
+        """
+        Parameter aus den gemeinsamen CLI-Optionen --name, --regelzeit-monate, --studienende, --maximale-ects.
+        Nur nicht angegebene Optionen (None) fallen auf den Standard zurück; eine explizite 0 bleibt 0.
+        """
+        standard = cls()
+        return cls(
+            name=standard.name if args.name is None else args.name,
+            regelzeit_monate=standard.regelzeit_monate if args.regelzeit_monate is None else args.regelzeit_monate,
+            studienende=standard.studienende if args.studienende is None else date.fromisoformat(args.studienende),
+            maximale_ects=standard.maximale_ects if args.maximale_ects is None else args.maximale_ects,
+        )
+
+    def studiengang(self) -> Studiengang:
+        """Studiengang-Instanz als Aggregatwurzel."""
+        return Studiengang(
+            name=self.name,
+            regelzeitMonate=self.regelzeit_monate,
+            startDatum=self.startdatum,
+            maximaleEcts=self.maximale_ects
+        )
+
+@dataclass
+class Kennzahlen:
+    """Ergebnis der Pipeline für eine CSV-Datei und einen Parametersatz."""
+    studiengang: Studiengang
+    durchschnitt: Optional[float]
+    ects_prozent: float
+    ects_abgeschlossen: int
+    verbleibende_tage: int
+    belegte_kurse: List[Kurs]
+    snapshot: DatenSnapshot
+    quelle: Optional[Path] = field(default=None, repr=False, compare=False)
+    duplikate: Optional[Duplikatregel] = field(default=None, repr=False, compare=False)
+    # Bei Bedarf gebaute Sichten; ein geteiltes Dict, damit auch die per replace() gelieferten Kopien
+    # des Memo-Speichers sie nur einmal je Ergebnis bauen.
+    _sichten: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def kursindex(self) -> KursIndex:
+        """Index über die belegten Kurse für die seitenweise Tabelle (einmal je Ergebnis gebaut)."""
+        index = self._sichten.get("kursindex")
+        if index is None:
+            index = self._sichten["kursindex"] = KursIndex(self.belegte_kurse)
+        return index
+
+    def semesterkurse(self, nummer: Optional[int]) -> List[Kurs]:
+        """
+        Alle Kurse eines Semesters (None = ohne Semesterangabe) in CSV-Reihenfolge.
+        - Beim ersten Aufruf wird die Quelle einmal in eine KursTabelle gelesen; der im selben Durchlauf
+          gebaute Semesterindex liefert danach die Zeilen je Semester in O(1)
+        - Der Snapshot selbst hält nur Summen je Semester (Zwischenspeicher bleibt klein)
+        """
+        paar = self._sichten.get("semester")
+        if paar is None:
+            if self.quelle is None:
+                raise ValueError("Kennzahlen ohne Quelle: Kurse je Semester nicht verfügbar")
+            index = SemesterIndex()
+            zeilen = CsvRepository(self.quelle).datenzeilen_iterieren()
+            if self.duplikate is not None:
+                zeilen = zeilen_deduplizieren(zeilen, self.duplikate)
+            paar = self._sichten["semester"] = (zeilen_zu_tabelle(zeilen, semesterindex=index), index)
+        tabelle, index = paar
+        return index.kurse(nummer, tabelle)
+
+def berechne_kennzahlen(
+    pfad: Path = csv_datei_pfad,
+    parameter: StudiengangParameter = StudiengangParameter(),
+    heute: Optional[date] = None,
+    cache: Optional[SnapshotCache] = None,
+    zwischenspeichern: bool = True,
+    duplikate: Optional[Duplikatregel] = None,
+) -> Kennzahlen:
+    """
+    Führt die Pipeline aus: CSV -> Snapshot (über den Platten-Zwischenspeicher) -> Kennzahlen.
+    Die Kennzahlen selbst sind nur Methodenaufrufe auf der Domäne.
+    zwischenspeichern=False liest die CSV direkt, ohne den Platten-Zwischenspeicher zu berühren.
+    duplikate: wiederholte Kurse vor dem Snapshot nach dieser Regel zusammenfassen (eigene Cache-Variante).
+    """
+    with messung.stufe("berechnung.berechne_kennzahlen"):
+        repo = CsvRepository(pfad)
+        repo.kopfzeile  # frühe Validierung (Datei vorhanden, Pflichtspalten) -> CsvLesefehler statt OSError
+
+        def aufbauen() -> DatenSnapshot:
+            # Ohne Deduplizierung direkt aus den Rohzeilen (spezialisierter Dekodierer), sonst über die Dicts.
+            if duplikate is None:
+                return erzeuge_snapshot_dekodiert(repo)
+            return erzeuge_snapshot(zeilen_deduplizieren(repo.datenzeilen_iterieren(), duplikate))
+
+        with messung.stufe("berechnung.snapshot") as s:
+            if zwischenspeichern:
+                variante = "" if duplikate is None else f"duplikate={duplikate.value}"
+                snapshot = (cache or SnapshotCache()).laden(pfad, aufbauen, variante)
+            else:
+                snapshot = aufbauen()
+            s.zeilen = snapshot.aggregat.zeilen
+        aggregat = snapshot.aggregat
+        studiengang = parameter.studiengang()
+        kennzahlen = Kennzahlen(
+            studiengang=studiengang,
+            durchschnitt=aggregat.durchschnitt(studiengang),
+            ects_prozent=aggregat.ects_prozent(studiengang),
+            ects_abgeschlossen=aggregat.ects_abgeschlossen,
+            verbleibende_tage=studiengang.berechneVerbleibendeTage(heute),
+            belegte_kurse=aggregat.belegte_kurse,
+            snapshot=snapshot,
+            quelle=pfad,
+            duplikate=duplikate,
+        )
+    if messung.aktiv:
+        messung.protokollieren(logging.DEBUG)
+    return kennzahlen
+
+# Fingerabdruck für den In-Memory-Speicher: (Größe, mtime in ns); None = Datei fehlt.
+Fingerabdruck = Optional[Tuple[int, int]]
+
+def fingerabdruck(pfad: Path) -> Fingerabdruck:
+    """(Größe, mtime in ns) der Datei oder None; billiger Änderungstest ohne Lesen des Inhalts."""
+    try:
+        stat = pfad.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+class KennzahlenSpeicher:
+    """
+    Prozessweiter Memo-Speicher für berechne_kennzahlen, geschlüsselt nach Pfad, Parametern und Duplikatregel.
+    Ein Eintrag gilt nur, solange der Fingerabdruck der CSV unverändert ist; ein optionaler
+    Beobachter-Thread verwirft Einträge schon beim Ändern der Datei.
+    - Das Datum ist nicht Teil des Schlüssels: verbleibende_tage wird beim Lesen neu berechnet
+    - Höchstens `max_eintraege` Einträge (LRU), damit Parameter-Kombinationen den Speicher nicht füllen
+    """
+
+    def __init__(self, max_eintraege: int = 32) -> None:
+        self._eintraege: "OrderedDict[Tuple[Path, StudiengangParameter, Optional[Duplikatregel]], Tuple[Fingerabdruck, Kennzahlen]]" = OrderedDict()
+        self._sperre = threading.Lock()
+        self._beobachter: Optional[threading.Thread] = None
+        self.max_eintraege = max_eintraege
+        self.treffer = 0
+        self.berechnungen = 0
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+    def holen(
+        self,
+        pfad: Path,
+        parameter: StudiengangParameter,
+        heute: Optional[date] = None,
+        duplikate: Optional[Duplikatregel] = None,
+    ) -> Kennzahlen:
+        schluessel = (pfad.resolve(), parameter, duplikate)
+        fp = fingerabdruck(pfad)
+        with self._sperre:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is not None and eintrag[0] == fp:
+                self._eintraege.move_to_end(schluessel)
+                self.treffer += 1
+                kennzahlen = eintrag[1]
+                return replace(kennzahlen, verbleibende_tage=kennzahlen.studiengang.berechneVerbleibendeTage(heute))
+        kennzahlen = berechne_kennzahlen(pfad, parameter, heute=heute, duplikate=duplikate)
+        if fingerabdruck(pfad) != fp:
+            # CSV während der Berechnung geändert: Ergebnis nicht über eine Invalidierung hinaus behalten.
+            return kennzahlen
+        with self._sperre:
+            self._eintraege[schluessel] = (fp, kennzahlen)
+            self._eintraege.move_to_end(schluessel)
+            while len(self._eintraege) > self.max_eintraege:
+                self._eintraege.popitem(last=False)
+            self.berechnungen += 1
+        return kennzahlen
+
+    def invalidieren(self, pfad: Optional[Path] = None) -> None:
+        """Verwirft alle Einträge (oder nur die einer Datei)."""
+        with self._sperre:
+            if pfad is None:
+                self._eintraege.clear()
+                return
+            ziel = pfad.resolve()
+            for schluessel in [s for s in self._eintraege if s[0] == ziel]:
+                del self._eintraege[schluessel]
+
+    def _veraltete_verwerfen(self) -> None:
+        with self._sperre:
+            veraltet = [s for s, (fp, _) in self._eintraege.items() if fingerabdruck(s[0]) != fp]
+            for schluessel in veraltet:
+                del self._eintraege[schluessel]
+
+    def starte_beobachter(self, intervall: float = 2.0) -> None:
+        """Startet (einmalig) einen Daemon-Thread, der die CSV-Dateien periodisch per stat prüft."""
+        with self._sperre:
+            if self._beobachter is not None:
+                return
+            stopp = threading.Event()
+
+            def schleife() -> None:
+                while not stopp.wait(intervall):
+                    self._veraltete_verwerfen()
+
+            self._beobachter = threading.Thread(target=schleife, name="kennzahlen-beobachter", daemon=True)
+            self._beobachter.start()
+
+# Gemeinsamer Speicher für alle Streamlit-Sessions im selben Serverprozess.
+speicher = KennzahlenSpeicher()
+
+def lade_kennzahlen(
+    pfad: Path = csv_datei_pfad,
+    parameter: StudiengangParameter = StudiengangParameter(),
+    duplikate: Optional[Duplikatregel] = None,
+) -> Kennzahlen:
+    """Memoisierte Pipeline: Cache-Treffer bei unveränderter CSV, sonst Neuberechnung."""
+    return speicher.holen(pfad, parameter, duplikate=duplikate)
@@ -0,0 +1,211 @@
+# Verantwortung: statische HTML-Berichte je Student im Stapel erzeugen (ohne Streamlit).
+# Je Student läuft dieselbe Pipeline wie im Dashboard (CsvRepository -> KennzahlenAggregat -> Studiengang)
+# in einem Prozesspool; Ausgaben werden atomar geschrieben, vorhandene Berichte beim Neustart übersprungen.
+# Aufruf: python berichte.py a.csv b.csv ... --ziel berichte/          (eine CSV je Student)
+#         python berichte.py kohorte.csv --student-spalte student_id   (eine CSV für alle)
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from aggregation import aggregiere_zeilen
+from berechnung import StudiengangParameter
+from csv_daten import CsvLesefehler, CsvRepository
+import vorlagen
+
+# Ein Auftrag: (Student-ID, Quelle); Quelle ist eine CSV-Datei oder die bereits gruppierten Zeilen.
+Auftrag = Tuple[str, Union[str, List[dict]]]
+
+_UNSICHER = re.compile(r"[^\w.-]")
+
+def dateiname(student: str) -> str:
+    """Dateisystemtauglicher, eindeutiger Berichtsname (ersetzte Zeichen -> Suffix aus CRC32 der ID)."""
+    sicher = _UNSICHER.sub("_", student) or "_"
+    if sicher != student:
+        sicher = f"{sicher}-{zlib.crc32(student.encode('utf-8')):08x}"
+    return f"{sicher}.html"
+
+def bericht_erzeugen(student: str, zeilen: List[dict], parameter: StudiengangParameter, heute: date) -> str:
+    """HTML-Bericht eines Studenten: Kennzahlen-Aggregat aus den Zeilen, Formeln aus Studiengang (wie im Dashboard)."""
+    aggregat = aggregiere_zeilen(zeilen)
+    studiengang = parameter.studiengang()
+    if zeilen and zeilen[0].get("studiengang"):
+        studiengang = replace(studiengang, name=zeilen[0]["studiengang"])
+    kacheln = vorlagen.kennzahl_kacheln(
+        aggregat.durchschnitt(studiengang),
+        aggregat.ects_prozent(studiengang),
+        aggregat.ects_abgeschlossen,
+        studiengang.maximaleEcts,
+        studiengang.berechneVerbleibendeTage(heute),
+    )
+    return vorlagen.bericht(f"{studiengang.name} – {student}", kacheln, vorlagen.kurstabelle(aggregat.belegte_kurse))
+
+def _schreiben(ziel: Path, inhalt: str) -> None:
+    """Schreibt atomar (temporäre Datei + os.replace), damit ein Abbruch keine halben Berichte hinterlässt."""
+    temporaer = ziel.with_name(f".{ziel.name}.{os.getpid()}.tmp")
+    temporaer.write_text(inhalt, encoding="utf-8")
+    os.replace(temporaer, ziel)
+
+def _stapel_verarbeiten(stapel: List[Auftrag], ziel: str, parameter: StudiengangParameter,
+                        heute: date) -> Tuple[int, int, List[str]]:
+    """Worker (Prozesspool): erzeugt die Berichte eines Stapels. Liefert (Berichte, Zeilen, Fehlermeldungen)."""
+    berichte = zeilen_gesamt = 0
+    fehler: List[str] = []
+    for student, quelle in stapel:
+        try:
+            zeilen = list(CsvRepository(Path(quelle)).datenzeilen_iterieren()) if isinstance(quelle, str) else quelle
+        except CsvLesefehler as e:
+            fehler.append(f"{student}: {e.nachricht}")
+            continue
+        _schreiben(Path(ziel) / dateiname(student), bericht_erzeugen(student, zeilen, parameter, heute))
+        berichte += 1
+        zeilen_gesamt += len(zeilen)
+    return berichte, zeilen_gesamt, fehler
+
+def auftraege_aus_dateien(dateien: List[Path]) -> Iterator[Auftrag]:
+    """Eine CSV je Student; die Student-ID ist der Dateiname ohne Endung."""
+    for datei in dateien:
+        yield datei.stem, str(datei)
+
+def auftraege_aus_kohorte(dateien: List[Path], student_spalte: str) -> Iterator[Auftrag]:
+    """
+    Gruppiert Kohorten-Exporte per Hash-Index nach Student (ein Durchlauf je Datei).
+    Die Zeilen aller Studenten liegen dabei einmal im Speicher des Hauptprozesses.
+    """
+    gruppen: Dict[str, List[dict]] = {}
+    for datei in dateien:
+        repo = CsvRepository(datei)
+        if student_spalte not in repo.spaltenindex:
+            raise CsvLesefehler(f"Spalte '{student_spalte}' fehlt in {datei}.")
+        for z in repo.datenzeilen_iterieren():
+            gruppen.setdefault(z[student_spalte], []).append(z)
+    for student, zeilen in gruppen.items():
+        yield student, zeilen
+
+class Fortschritt:
+    """Zählt erledigte Berichte/Zeilen und meldet den Durchsatz periodisch nach stderr."""
+
+    def __init__(self, intervall: float = 5.0) -> None:
+        self.start = time.perf_counter()
+        self.intervall = intervall
+        self._letzte_meldung = self.start
+        self.berichte = 0
+        self.zeilen = 0
+        self.uebersprungen = 0
+        self.fehler: List[str] = []
+
+    def erfassen(self, berichte: int, zeilen: int, fehler: List[str]) -> None:
+        self.berichte += berichte
+        self.zeilen += zeilen
+        self.fehler.extend(fehler)
+        jetzt = time.perf_counter()
+        if jetzt - self._letzte_meldung >= self.intervall:
+            self._letzte_meldung = jetzt
+            print(f"{self.berichte} Berichte, {self.berichte / (jetzt - self.start):.0f}/s", file=sys.stderr)
+
+    def zusammenfassung(self) -> dict:
+        zeit = time.perf_counter() - self.start
+        return {
+            "berichte": self.berichte,
+            "uebersprungen": self.uebersprungen,
+            "fehler": len(self.fehler),
+            "zeit_s": zeit,
+            "berichte_pro_s": self.berichte / zeit if zeit > 0 else 0.0,
+            "zeilen_pro_s": self.zeilen / zeit if zeit > 0 else 0.0,
+        }
+
+def _stapel(auftraege: Iterator[Auftrag], ziel: Path, groesse: int, fortschritt: Fortschritt) -> Iterator[List[Auftrag]]:
+    """Bündelt noch fehlende Aufträge; vorhandene Berichte (früherer Lauf) werden übersprungen."""
+    stapel: List[Auftrag] = []
+    for auftrag in auftraege:
+        if (ziel / dateiname(auftrag[0])).exists():
+            fortschritt.uebersprungen += 1
+            continue
+        stapel.append(auftrag)
+        if len(stapel) >= groesse:
+            yield stapel
+            stapel = []
+    if stapel:
+        yield stapel
+
+def berichte_erzeugen(
+    auftraege: Iterator[Auftrag],
+    ziel: Path,
+    parameter: StudiengangParameter = StudiengangParameter(),
+    heute: Optional[date] = None,
+    worker: Optional[int] = None,
+    stapelgroesse: int = 64,
+    fortschritt: Optional[Fortschritt] = None,
+) -> dict:
+    """
+    Erzeugt alle fehlenden Berichte in `ziel` und liefert die Zusammenfassung (Durchsatz, Fehler).
+    - worker=None: Anzahl CPU-Kerne; worker<=1: im eigenen Prozess
+    - Höchstens 4 Stapel je Worker sind gleichzeitig unterwegs (Aufträge werden nur nachgeladen)
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    ziel.mkdir(parents=True, exist_ok=True)
+    heute = heute or date.today()
+    fortschritt = fortschritt or Fortschritt()
+    anzahl_worker = worker or os.cpu_count() or 1
+    stapel = _stapel(auftraege, ziel, stapelgroesse, fortschritt)
+
+    if anzahl_worker <= 1:
+        for s in stapel:
+            fortschritt.erfassen(*_stapel_verarbeiten(s, str(ziel), parameter, heute))
+        return fortschritt.zusammenfassung()
+
+    with ProcessPoolExecutor(max_workers=anzahl_worker) as pool:
+        laufend = set()
+        for s in stapel:
+            if len(laufend) >= anzahl_worker * 4:
+                fertig, laufend = wait(laufend, return_when=FIRST_COMPLETED)
+                for f in fertig:
+                    fortschritt.erfassen(*f.result())
+            laufend.add(pool.submit(_stapel_verarbeiten, s, str(ziel), parameter, heute))
+        for f in wait(laufend).done:
+            fortschritt.erfassen(*f.result())
+    return fortschritt.zusammenfassung()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HTML-Berichte je Student im Stapel erzeugen.")
+    parser.add_argument("dateien", nargs="+", type=Path, help="CSV je Student oder Kohorten-CSV(s)")
+    parser.add_argument("--ziel", type=Path, default=Path("berichte"), help="Ausgabeverzeichnis")
+    parser.add_argument("--student-spalte", default=None, help="Kohorten-Modus: Spalte mit der Student-ID")
+    parser.add_argument("--worker", type=int, default=None, help="Prozesse (Standard: CPU-Kerne)")
+    parser.add_argument("--stapelgroesse", type=int, default=64, help="Studenten je Worker-Aufruf")
+    parser.add_argument("--name", default=None, help="Name des Studiengangs (falls nicht in der CSV)")
+    parser.add_argument("--regelzeit-monate", type=int, default=None, help="Regelstudienzeit in Monaten")
+    parser.add_argument("--studienende", default=None, help="Studienende als JJJJ-MM-TT")
+    parser.add_argument("--maximale-ects", type=int, default=None, help="ECTS für 100 %%")
+    args = parser.parse_args(argv)
+
+    parameter = StudiengangParameter.aus_args(args)
+    if args.student_spalte:
+        auftraege = auftraege_aus_kohorte(args.dateien, args.student_spalte)
+    else:
+        auftraege = auftraege_aus_dateien(args.dateien)
+
+    fortschritt = Fortschritt()
+    try:
+        zusammenfassung = berichte_erzeugen(auftraege, args.ziel, parameter, worker=args.worker,
+                                            stapelgroesse=args.stapelgroesse, fortschritt=fortschritt)
+    except CsvLesefehler as e:
+        print(e.nachricht, file=sys.stderr)
+        return 1
+    for meldung in fortschritt.fehler:
+        print(meldung, file=sys.stderr)
+    print(json.dumps(zusammenfassung, indent=2))
+    return 1 if fortschritt.fehler else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# Pytest-Konfiguration: Tests liegen in tests/; Phase_2_Testdateien sind Arbeitskopien (importieren u. a. Streamlit).
+collect_ignore = ["Phase_2_Testdateien"]
@@ -3,8 +3,23 @@
 
 from __future__ import annotations
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
 import csv
+import hashlib
+import io
+import mmap
+import time
+
+import messung
+
+# Prädikat je Spalte auf dem rohen (noch nicht bereinigten) Zellwert.
+Zellfilter = Mapping[str, Callable[[str], bool]]
+
+# Zeichen, die _sauber entfernen kann; enthält eine Zelle andere Zeichen, ist sie nach dem Bereinigen nicht leer.
+_LEER_ODER_QUOTE = " \t\r\n\v\f\"'"
+
+# Standardgröße eines Lese-Blocks im Bulk-Modus (Bytes, wird bis zur nächsten Satzgrenze erweitert).
+BLOCKGROESSE_STANDARD = 4 * 1024 * 1024
 
 class CsvLesefehler(Exception):
     """Fehler beim Lesen/Interpretieren der CSV-Datei mit verständlicher Meldung."""
@@ -13,7 +28,7 @@ class CsvLesefehler(Exception):
         self.nachricht = nachricht
 
 class CsvRepository:
-    """Kapselt den CSV-Zugriff und liefert jede Zeile als Dict[str, str] (roh/normalisiert)."""
+    """Kapselt den CSV-Zugriff und liefert Zeilen als Dict[str, str] oder spaltenweise Batches (roh/normalisiert)."""
 
     def __init__(self, dateipfad: Path, trennzeichen: str = ";", kodierung: str = "utf-8-sig") -> None:
         self._dateipfad = dateipfad
@@ -82,10 +97,26 @@ class CsvRepository:
     def _lade_kopfzeile_und_spaltenindex(self) -> None:
         """Lazy-Init: liest Header und baut Spaltenindex nur bei Bedarf."""
         if self._kopfzeile is None or self._spaltenindex is None:
-            kopfzeile = self._lese_und_pruefe_kopfzeile()
+            with messung.stufe("csv.kopfzeile"):
+                kopfzeile = self._lese_und_pruefe_kopfzeile()
             spaltenindex = {name: i for i, name in enumerate(kopfzeile)}
             self._kopfzeile, self._spaltenindex = kopfzeile, spaltenindex
 
+    @property
+    def dateipfad(self) -> Path:
+        """Pfad der CSV-Datei."""
+        return self._dateipfad
+
+    @property
+    def trennzeichen(self) -> str:
+        """Spaltentrennzeichen der CSV-Datei."""
+        return self._trennzeichen
+
+    @property
+    def kodierung(self) -> str:
+        """Textkodierung der CSV-Datei."""
+        return self._kodierung
+
     @property
     def kopfzeile(self) -> List[str]:
         """Gibt die normalisierte Kopfzeile zurück (lädt bei Bedarf)."""
@@ -100,13 +131,71 @@ class CsvRepository:
         assert self._spaltenindex is not None
         return self._spaltenindex
 
-    def datenzeilen_iterieren(self) -> Iterator[Dict[str, str]]:
+    def _zeile_normalisieren(self, rohzeile: List[str], breite: int) -> Optional[List[str]]:
+        """
+        Bringt eine csv.reader-Zeile in Header-Form (gemeinsam für alle Lesemodi).
+        - Fallback bei „alles in einem Feld“ (manuell splitten)
+        - Bereinigt jede Zelle genau einmal; None bei leerer/Whitespace-Zeile
+        - Passt Spaltenzahl an den Header an (auffüllen/abschneiden)
+        """
+        if len(rohzeile) == 1 and self._trennzeichen in str(rohzeile[0]):
+            rohzeile = str(rohzeile[0]).split(self._trennzeichen)
+
+        if messung.aktiv:
+            start = time.perf_counter()
+            bereinigt = [self._sauber(z) for z in rohzeile]
+            messung.zeit_addieren("csv._sauber", time.perf_counter() - start, 1)
+        else:
+            bereinigt = [self._sauber(z) for z in rohzeile]
+        if not any(bereinigt):
+            if messung.aktiv:
+                messung.zaehlen("csv.zeilen_leer_uebersprungen")
+            return None
+
+        if len(bereinigt) < breite:
+            bereinigt.extend([""] * (breite - len(bereinigt)))
+            if messung.aktiv:
+                messung.zaehlen("csv.zeilen_aufgefuellt")
+        elif len(bereinigt) > breite:
+            del bereinigt[breite:]
+            if messung.aktiv:
+                messung.zaehlen("csv.zeilen_abgeschnitten")
+        return bereinigt
+
+    def datenzeilen_iterieren(
+        self,
+        spalten: Optional[Sequence[str]] = None,
+        filter: Optional[Zellfilter] = None,
+    ) -> Iterator[Dict[str, str]]:
         """
         Iteriert über Datenzeilen als Dict[str, str].
         - Überspringt leere Zeilen.
         - Passt Spaltenzahl an den Header an (auffüllen/abschneiden).
         - Bereinigt Zellwerte (Trim/Quotes).
         - Hat Fallback bei „eine Feld“-Zeilen (manuell splitten).
+        - spalten: Projektion; nur diese Spalten werden bereinigt und ins Dict übernommen.
+        - filter: {spalte: prädikat(rohwert)}; Zeilen, bei denen ein Prädikat False liefert, werden
+          vor jeder Bereinigung verworfen (fehlende Zellen werden als "" geprüft).
+        """
+        if spalten is None and filter is None:
+            quelle = self._datenzeilen()
+        else:
+            quelle = self._datenzeilen_selektiv(spalten, filter)
+        if messung.aktiv:
+            return messung.generator_messen("csv.datenzeilen_iterieren", quelle)
+        return quelle
+
+    def _spalten_pruefen(self, namen: Sequence[str]) -> List[int]:
+        """Spaltennamen -> Indizes; unbekannte Namen führen zu CsvLesefehler."""
+        unbekannt = [n for n in namen if n not in self.spaltenindex]
+        if unbekannt:
+            raise CsvLesefehler(f"Unbekannte Spalten: {unbekannt}. Gefunden: {self.kopfzeile}")
+        return [self.spaltenindex[n] for n in namen]
+
+    def rohzeilen_iterieren(self) -> Iterator[List[str]]:
+        """
+        Unbereinigte csv.reader-Zeilen nach der Kopfzeile (kein Fallback-Split, keine Leerzeilen-Regel).
+        Für spezialisierte Dekodierer (dekodierer.py), die diese Regeln selbst anwenden.
         """
         self._lade_kopfzeile_und_spaltenindex()
         with self._dateipfad.open("r", encoding=self._kodierung, newline="") as f:
@@ -116,28 +205,330 @@ class CsvRepository:
                 quotechar='"',
                 skipinitialspace=False
             )
-            # Header überspringen
+            try:
+                next(reader)
+            except StopIteration:
+                return
+            yield from reader
+
+    def _datenzeilen_selektiv(self, spalten: Optional[Sequence[str]], filter: Optional[Zellfilter]) -> Iterator[Dict[str, str]]:
+        """Generator für Projektion/Filter: gleiche Zeilenregeln, aber nur benötigte Zellen werden bereinigt."""
+        namen = list(spalten) if spalten is not None else self.kopfzeile
+        indizes = self._spalten_pruefen(namen)
+        praedikate = list(zip(self._spalten_pruefen(list(filter)), filter.values())) if filter else []
+        sauber = self._sauber
+        with self._dateipfad.open("r", encoding=self._kodierung, newline="") as f:
+            reader = csv.reader(
+                f,
+                delimiter=self._trennzeichen,
+                quotechar='"',
+                skipinitialspace=False
+            )
             try:
                 next(reader)
             except StopIteration:
                 return
 
             for rohzeile in reader:
-                # Fallback bei „alles in einem Feld“
                 if len(rohzeile) == 1 and self._trennzeichen in str(rohzeile[0]):
                     rohzeile = str(rohzeile[0]).split(self._trennzeichen)
-
-                # vollständig leere/Whitespace-Zeilen ignorieren
-                if not rohzeile or all((z is None or self._sauber(z) == "") for z in rohzeile):
+                laenge = len(rohzeile)
+                if praedikate and not all(p(rohzeile[i] if i < laenge else "") for i, p in praedikate):
                     continue
+                # Leerzeilen-Regel wie _zeile_normalisieren (any() bricht bei der ersten gefüllten Zelle ab).
+                if not any(sauber(z) for z in rohzeile):
+                    continue
+                yield dict(zip(namen, [sauber(rohzeile[i]) if i < laenge else "" for i in indizes]))
 
-                zeile = rohzeile
+    def _datenzeilen(self) -> Iterator[Dict[str, str]]:
+        """Generator hinter datenzeilen_iterieren."""
+        kopfzeile = self.kopfzeile
+        breite = len(kopfzeile)
+        with self._dateipfad.open("r", encoding=self._kodierung, newline="") as f:
+            reader = csv.reader(
+                f,
+                delimiter=self._trennzeichen,
+                quotechar='"',
+                skipinitialspace=False
+            )
+            # Header überspringen
+            try:
+                next(reader)
+            except StopIteration:
+                return
+
+            for rohzeile in reader:
+                bereinigt = self._zeile_normalisieren(rohzeile, breite)
+                if bereinigt is not None:
+                    yield dict(zip(kopfzeile, bereinigt))
+
+    def _ist_ascii_kompatibel(self) -> bool:
+        """Bulk-Modus schneidet auf Byte-Ebene an Zeilenumbrüchen; das geht nur bei ASCII-kompatibler Kodierung."""
+        probe = f"\n{self._trennzeichen}\"x"
+        try:
+            return probe.encode("ascii").decode(self._kodierung) == probe
+        except (LookupError, UnicodeError):
+            return False
+
+    def _quotefeld_ende(self, daten: bytes, q: int, ende: int) -> int:
+        """Position hinter dem schließenden '"' eines bei q geöffneten Feldes ('""' = Quote im Feld); -1 wenn offen."""
+        i = q + 1
+        while True:
+            c = daten.find(b'"', i, ende)
+            if c == -1:
+                return -1
+            if c + 1 < ende and daten[c + 1] == 0x22:
+                i = c + 2
+                continue
+            return c + 1
+
+    def _ist_feldanfang(self, daten: bytes, q: int, satzanfang: int) -> bool:
+        """Wie csv.reader: '"' öffnet ein gequotetes Feld nur am Feldanfang; sonst ist es ein normales Zeichen (O"Brien)."""
+        return q == satzanfang or daten[q - 1] in (ord(self._trennzeichen), 0x0A, 0x0D)
+
+    def _naechste_satzgrenze(self, daten: bytes, start: int, ab: int) -> int:
+        """
+        Erste Satzgrenze (Position hinter einem Zeilenumbruch außerhalb gequoteter Felder) ab Position ab.
+        Der Quote-Zustand wird ab der Satzgrenze start verfolgt; -1, wenn keine mehr folgt.
+        """
+        ende = len(daten)
+        pos = start
+        while True:
+            nl = daten.find(b"\n", max(pos, ab))
+            q = daten.find(b'"', pos, ende if nl == -1 else nl)
+            if q == -1:
+                return -1 if nl == -1 else nl + 1
+            if self._ist_feldanfang(daten, q, start):
+                pos = self._quotefeld_ende(daten, q, ende)
+                if pos == -1:
+                    return -1
+            else:
+                pos = q + 1
+
+    def _letzte_satzgrenze(self, daten: bytes, start: int, ende: int) -> int:
+        """Letzte Satzgrenze in daten[start:ende] (Quote-Zustand ab der Satzgrenze start); -1 wenn keine."""
+        pos, letzte = start, -1
+        while True:
+            q = daten.find(b'"', pos, ende)
+            nl = daten.rfind(b"\n", pos, ende if q == -1 else q)
+            if nl != -1:
+                letzte = nl + 1
+            if q == -1:
+                return letzte
+            if self._ist_feldanfang(daten, q, start):
+                pos = self._quotefeld_ende(daten, q, ende)
+                if pos == -1:
+                    return letzte
+            else:
+                pos = q + 1
+
+    def _bytebloecke(self, daten: bytes, start: int, ende: int, blockgroesse: int) -> Iterator[bytes]:
+        """Zerlegt daten[start:ende] in Blöcke von mindestens blockgroesse Bytes, die an einer Satzgrenze enden."""
+        while start < ende:
+            schnitt = self._naechste_satzgrenze(daten, start, start + blockgroesse) if start + blockgroesse < ende else -1
+            if schnitt == -1 or schnitt > ende:
+                schnitt = ende
+            yield daten[start:schnitt]
+            start = schnitt
+
+    def _datenbeginn(self, daten: bytes) -> int:
+        """Byte-Offset direkt nach der Kopfzeile (BOM wird übersprungen)."""
+        start = 3 if daten[:3] == b"\xef\xbb\xbf" else 0
+        grenze = self._naechste_satzgrenze(daten, start, start)
+        return len(daten) if grenze == -1 else grenze
+
+    def datenbloecke_iterieren(self, blockgroesse: int = BLOCKGROESSE_STANDARD) -> Iterator[Dict[str, List[str]]]:
+        """
+        Bulk-Modus: liest die Datei per mmap in großen Blöcken und liefert spaltenorientierte
+        Batches (Spaltenname -> Liste der bereinigten Zellwerte).
+        - Gleiche Regeln wie datenzeilen_iterieren (Aliasse, Pflichtspalten, Fallback, Auffüllen)
+        - Blöcke enden immer an einer Satzgrenze (Quote-Zustand wie csv.reader, auch bei Zeilenumbrüchen in Quotes)
+        - Bereinigt wird je Spalte statt je Zeile (siehe _spalten_dekodieren)
+        - Nicht ASCII-kompatible Kodierungen fallen auf den zeilenweisen Reader zurück
+        """
+        kopfzeile = self.kopfzeile
+        breite = len(kopfzeile)
+
+        if not self._ist_ascii_kompatibel():
+            yield from self._bloecke_aus_zeilen(blockgroesse // 64 or 1)
+            return
+
+        for rohzeilen in self._rohbloecke(None, None, blockgroesse):
+            spalten = self._spalten_dekodieren(rohzeilen, breite)
+            if spalten[0]:
+                yield dict(zip(kopfzeile, spalten))
+
+    def _spalten_dekodieren(self, rohzeilen: Iterator[List[str]], breite: int) -> List[List[str]]:
+        """
+        Spaltenweise Variante von _zeile_normalisieren für einen Block (gleiches Ergebnis, gleiche Zähler).
+        - Je Zeile nur Form: Fallback-Split, Auffüllen/Abschneiden (Überhang wird vorher auf Inhalt geprüft)
+        - Je Spalte str.strip über map (C-Schleife); _sauber nur für Zellen, die danach mit einem Quote beginnen
+        - Leerzeilen werden erst danach entfernt (Kandidaten: erste Spalte leer)
+        """
+        trennzeichen = self._trennzeichen
+        sauber = self._sauber
+        zeilen: List[List[str]] = []
+        aufgefuellt: List[int] = []
+        abgeschnitten: List[int] = []
+        ueberhang_belegt = set()
+        for r in rohzeilen:
+            if len(r) != breite:
+                if len(r) == 1 and trennzeichen in r[0]:
+                    r = r[0].split(trennzeichen)
+                if len(r) < breite:
+                    r.extend([""] * (breite - len(r)))
+                    aufgefuellt.append(len(zeilen))
+                elif len(r) > breite:
+                    if any(sauber(z) for z in r[breite:]):
+                        ueberhang_belegt.add(len(zeilen))
+                    del r[breite:]
+                    abgeschnitten.append(len(zeilen))
+            zeilen.append(r)
+
+        start = time.perf_counter() if messung.aktiv else 0.0
+        spalten: List[List[str]] = []
+        for roh in (zip(*zeilen) if zeilen else [()] * breite):
+            spalte = list(map(str.strip, roh))
+            if '"' in "".join(spalte) or "'" in "".join(spalte):
+                spalte = [sauber(w) if w[:1] in ('"', "'") else w for w in spalte]
+            spalten.append(spalte)
+        del zeilen
 
-                # Länge an Header angleichen
-                if len(zeile) < len(self.kopfzeile):
-                    zeile = zeile + [""] * (len(self.kopfzeile) - len(zeile))
-                if len(zeile) > len(self.kopfzeile):
-                    zeile = zeile[:len(self.kopfzeile)]
+        leer = {i for i, w in enumerate(spalten[0]) if not w
+                and i not in ueberhang_belegt and not any(spalte[i] for spalte in spalten)}
+        if leer:
+            behalten = [i for i in range(len(spalten[0])) if i not in leer]
+            spalten = [[spalte[i] for i in behalten] for spalte in spalten]
+        if messung.aktiv:
+            messung.zeit_addieren("csv._sauber", time.perf_counter() - start, len(spalten[0]))
+            messung.zaehlen("csv.zeilen_leer_uebersprungen", len(leer))
+            messung.zaehlen("csv.zeilen_aufgefuellt", sum(1 for i in aufgefuellt if i not in leer))
+            messung.zaehlen("csv.zeilen_abgeschnitten", sum(1 for i in abgeschnitten if i not in leer))
+        return spalten
+
+    def _rohbloecke(self, start: Optional[int], ende: Optional[int], blockgroesse: int) -> Iterator[Iterator[List[str]]]:
+        """
+        Liest den Byte-Bereich [start, ende) per mmap (None = gesamter Datenteil nach der Kopfzeile)
+        und liefert je Block einen csv.reader über dessen Zeilen. start muss auf einer Satzgrenze liegen.
+        """
+        with self._dateipfad.open("rb") as f:
+            if self._dateipfad.stat().st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as daten:
+                beginn = self._datenbeginn(daten) if start is None else start
+                schluss = len(daten) if ende is None else min(ende, len(daten))
+                for block in self._bytebloecke(daten, beginn, schluss, blockgroesse):
+                    yield csv.reader(
+                        io.StringIO(block.decode(self._kodierung), newline=""),
+                        delimiter=self._trennzeichen,
+                        quotechar='"',
+                        skipinitialspace=False
+                    )
+
+    def _zeilenbloecke(self, start: Optional[int], ende: Optional[int], blockgroesse: int) -> Iterator[List[List[str]]]:
+        """Wie _rohbloecke, aber je Block die normalisierten Zeilen (zeilenweise Regeln)."""
+        breite = len(self.kopfzeile)
+        for reader in self._rohbloecke(start, ende, blockgroesse):
+            zeilen = [z for z in (self._zeile_normalisieren(r, breite) for r in reader) if z is not None]
+            if zeilen:
+                yield zeilen
+
+    def byte_bereiche(self, anzahl: int) -> List[Tuple[int, int]]:
+        """
+        Teilt den Datenteil in höchstens `anzahl` etwa gleich große Byte-Bereiche, die an
+        Satzgrenzen beginnen und enden (für parallele Verarbeitung).
+        Leere Liste, wenn die Kodierung kein Schneiden auf Byte-Ebene erlaubt oder keine Daten vorliegen.
+        """
+        self._lade_kopfzeile_und_spaltenindex()
+        if not self._ist_ascii_kompatibel() or self._dateipfad.stat().st_size == 0:
+            return []
+        with self._dateipfad.open("rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as daten:
+                beginn, ende = self._datenbeginn(daten), len(daten)
+                schnitte = [beginn]
+                schritt = (ende - beginn) / max(anzahl, 1)
+                for k in range(1, max(anzahl, 1)):
+                    ziel = beginn + int(k * schritt)
+                    if ziel <= schnitte[-1]:
+                        continue
+                    grenze = self._naechste_satzgrenze(daten, schnitte[-1], ziel)
+                    if grenze == -1 or grenze >= ende:
+                        break
+                    schnitte.append(grenze)
+                schnitte.append(ende)
+        return [(a, b) for a, b in zip(schnitte, schnitte[1:]) if b > a]
+
+    def bereich_zeilen_iterieren(self, start: int, ende: int, blockgroesse: int = BLOCKGROESSE_STANDARD) -> Iterator[Dict[str, str]]:
+        """Wie datenzeilen_iterieren, aber nur für einen Byte-Bereich aus byte_bereiche()."""
+        kopfzeile = self.kopfzeile
+        for zeilen in self._zeilenbloecke(start, ende, blockgroesse):
+            for bereinigt in zeilen:
+                yield dict(zip(kopfzeile, bereinigt))
+
+    def ist_byte_adressierbar(self) -> bool:
+        """True, wenn Byte-Offsets (byte_bereiche, inkrementelles Lesen) für diese Kodierung nutzbar sind."""
+        return self._ist_ascii_kompatibel()
+
+    def datenbeginn(self) -> int:
+        """Byte-Offset des ersten Datensatzes direkt nach der Kopfzeile."""
+        with self._dateipfad.open("rb") as f:
+            if self._dateipfad.stat().st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as daten:
+                return self._datenbeginn(daten)
+
+    def letzte_satzgrenze(self, ab: int) -> int:
+        """
+        Byte-Offset hinter dem letzten vollständig geschriebenen Datensatz (abschließender Zeilenumbruch),
+        gezählt ab der Satzgrenze `ab`. Eine noch unvollständige letzte Zeile bleibt außen vor.
+        """
+        with self._dateipfad.open("rb") as f:
+            if self._dateipfad.stat().st_size <= ab:
+                return ab
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as daten:
+                grenze = self._letzte_satzgrenze(daten, ab, len(daten))
+        return ab if grenze == -1 else grenze
+
+    def praefix_hash(self, ende: int, basis: Optional["hashlib._Hash"] = None, ab: int = 0) -> "hashlib._Hash":
+        """
+        BLAKE2b-Zustand über die Bytes [0, ende) der Datei.
+        - basis: Zustand über [0, ab); er wird kopiert und nur um [ab, ende) fortgeschrieben
+        """
+        h = hashlib.blake2b(digest_size=20) if basis is None else basis.copy()
+        with self._dateipfad.open("rb") as f:
+            f.seek(ab if basis is not None else 0)
+            rest = ende - f.tell()
+            while rest > 0:
+                block = f.read(min(rest, 1024 * 1024))
+                if not block:
+                    break
+                h.update(block)
+                rest -= len(block)
+        return h
+
+    def pruefsumme(self, ende: int, stichprobe: Optional[int] = None) -> str:
+        """
+        Prüfsumme über die ersten `ende` Bytes, um reine Anhänge von Umschreibungen zu unterscheiden.
+        Standard: gesamter Bereich. Nur auf ausdrücklichen Wunsch (stichprobe=n) werden Anfang und Ende
+        je n Bytes gehasht; Umschreibungen in der Mitte bleiben dann unerkannt.
+        """
+        if stichprobe is None or ende <= 2 * stichprobe:
+            return self.praefix_hash(ende).hexdigest()
+        h = hashlib.blake2b(str(ende).encode("ascii"), digest_size=20)
+        with self._dateipfad.open("rb") as f:
+            h.update(f.read(stichprobe))
+            f.seek(ende - stichprobe)
+            h.update(f.read(stichprobe))
+        return h.hexdigest()
 
-                bereinigt = [self._sauber(z) for z in zeile]
-                yield {self.kopfzeile[i]: bereinigt[i] for i in range(len(self.kopfzeile))}
\ No newline at end of file
+    def _bloecke_aus_zeilen(self, zeilen_pro_block: int) -> Iterator[Dict[str, List[str]]]:
+        """Fallback für datenbloecke_iterieren: sammelt datenzeilen_iterieren zu Spalten-Batches."""
+        kopfzeile = self.kopfzeile
+        puffer: List[List[str]] = []
+        for zeile in self.datenzeilen_iterieren():
+            puffer.append([zeile[name] for name in kopfzeile])
+            if len(puffer) >= zeilen_pro_block:
+                yield {name: list(spalte) for name, spalte in zip(kopfzeile, zip(*puffer))}
+                puffer = []
+        if puffer:
+            yield {name: list(spalte) for name, spalte in zip(kopfzeile, zip(*puffer))}
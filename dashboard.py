@@ -1,104 +1,244 @@
-# Streamlit-UI: zeigt die in berechnung.py vorbereiteten Kennzahlen in 2x2-Kacheln + Tabelle.
+# Streamlit-UI: zeigt die über berechnung.lade_kennzahlen gelieferten Kennzahlen in 2x2-Kacheln + Tabelle.
 import streamlit as st
-import berechnung  # lädt Top-Level-Variablen (bereits berechnet)
+import berechnung  # Pipeline als Funktion (memoisiert, invalidiert bei CSV-Änderung)
+import kursindex
+import messung
+import vorlagen  # Kachel-Markup/-Stil, geteilt mit berichte.py
+from vorlagen import FARBE_BLAU, FARBE_LILA
 
 st.set_page_config(page_title="Studium-Dashboard", layout="wide")
 
-# CI-Farben für Kacheln.
-FARBE_LILA = "#8e44ad"
-FARBE_BLAU = "#2E86C1"
-FARBE_ROT = "#c0392b"
-
-# Grundlegendes Styling (Abstände/Kachel-Visuals).
+# Grundlegendes Styling (Abstände) + Kachel-Visuals aus den Vorlagen.
 st.markdown(f"""
 <style>
 .block-container {{
   padding-top: 2.5rem;
   padding-bottom: 2rem;
 }}
-.kachel {{
-  padding: 24px;
-  border-radius: 12px;
-  color: white;
-  text-align: center;
-  height: 180px;
-  display: flex;
-  flex-direction: column;
-  justify-content: center;
-}}
-.k_title {{ font-size: 18px; margin-bottom: 8px; font-weight: 600; }}
-.k_value {{ font-size: 36px; font-weight: 800; }}
-.table_header {{
-  font-size: 18px;
-  font-weight: 600;
-  margin-bottom: 8px;
-}}
+{vorlagen.KACHEL_STIL}
 </style>
 """, unsafe_allow_html=True)
 
 # Kopfbereich
 st.markdown("<h2 style='text-align:center; margin: 0 0 16px 0;'>Studium-Dashboard</h2>", unsafe_allow_html=True)
 
-# Kennzahlen aus Orchestrierung importiert (keine Berechnung in der UI).
-durchschnitt = berechnung.durchschnitt          # Optional[float]
-ects_prozent = berechnung.ects_prozent          # float
-verbleibende_tage = berechnung.verbleibende_tage  # int
-belegte_kurse = berechnung.belegte_kurse        # List[Kurs]
-ects_abgeschlossen = getattr(berechnung, "ects_abgeschlossen", None)  # optional
+# Kennzahlen aus der Orchestrierung (keine Berechnung in der UI); Reruns sind Cache-Treffer.
+berechnung.speicher.starte_beobachter()
+kennzahlen = berechnung.lade_kennzahlen()
+durchschnitt = kennzahlen.durchschnitt              # Optional[float]
+ects_prozent = kennzahlen.ects_prozent              # float
+verbleibende_tage = kennzahlen.verbleibende_tage    # int
+belegte_kurse = kennzahlen.belegte_kurse            # List[Kurs]
+ects_abgeschlossen = kennzahlen.ects_abgeschlossen  # int
+maximale_ects = kennzahlen.studiengang.maximaleEcts
 
 # 2x2-Layout
 oben_links, oben_rechts = st.columns(2)
 unten_links, unten_rechts = st.columns(2)
 
-# Kachel: Gesamtnotendurchschnitt (Formatierung bei None -> "-").
-durchschnitt_text = "-" if durchschnitt is None else f"{durchschnitt:.2f}"
+# Kacheln: Durchschnitt (None -> "-"), ECTS in % + Absolutwert (z. B. 150/180), verbleibende Tage.
+kacheln = vorlagen.kennzahl_kacheln(durchschnitt, ects_prozent, ects_abgeschlossen, maximale_ects, verbleibende_tage)
 with oben_links:
-    st.markdown(
-        f"""
-        <div class="kachel" style="background:{FARBE_LILA};">
-          <div class="k_title">Gesamtnotendurchschnitt</div>
-          <div class="k_value">{durchschnitt_text}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-# Kachel: ECTS-Fortschritt in % + Absolutwert (z. B. 150/180).
-ects_abs_text = f"{ects_abgeschlossen}/180" if ects_abgeschlossen is not None else ""
+    st.markdown(kacheln["durchschnitt"], unsafe_allow_html=True)
 with oben_rechts:
-    st.markdown(
-        f"""
-        <div class="kachel" style="background:{FARBE_BLAU};">
-          <div class="k_title">ECTS-Fortschritt</div>
-          <div class="k_value">{ects_prozent:.2f}%</div>
-          <div style="margin-top:4px; font-size:16px; font-weight:600;">{ects_abs_text}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(kacheln["ects"], unsafe_allow_html=True)
 
 # Tabelle: Aktuell belegte Kurse (neutrale Darstellung, keine Kachel).
 with unten_links:
-    tabellen_headline = "Aktuell belegte Kurse"  # Überschrift der ersten Spalte
     if belegte_kurse:
-        rows = []
-        for k in belegte_kurse:
-            rows.append({
-                tabellen_headline: k.name,
-                "ECTS": k.ects if k.ects is not None else "",
-            })
-        st.table(rows)
+        # Suche/Sortierung/Blättern laufen auf dem vorab gebauten Index; an den Browser geht nur die Seite.
+        index = kennzahlen.kursindex()
+        suche_spalte, sort_spalte, richtung_spalte = st.columns([3, 2, 1])
+        with suche_spalte:
+            suche = st.text_input("Suche", key="kurse_suche", placeholder="Kursname …")
+        with sort_spalte:
+            sortierung = st.selectbox("Sortieren nach", list(kursindex.SPALTEN), key="kurse_sortierung")
+        with richtung_spalte:
+            absteigend = st.toggle("absteigend", key="kurse_absteigend")
+        groesse = 10
+        seite_gewuenscht = st.session_state.get("kurse_seite", 1) - 1
+        seite = index.seite(suche, sortierung, absteigend, seite_gewuenscht, groesse)
+        st.session_state["kurse_seite"] = seite.seite + 1  # nach neuer Suche auf gültige Seite begrenzt
+        rows = vorlagen.kurszeilen(seite.kurse)  # gleiche Spalten wie die Tabelle in berichte.py
+        if rows:
+            st.table(rows)
+        else:
+            st.caption("Keine Kurse zur Suche gefunden.")
+        if seite.seiten > 1:
+            st.number_input(f"Seite (von {seite.seiten}, {seite.treffer} Kurse)", min_value=1,
+                            max_value=seite.seiten, key="kurse_seite")
     else:
-        st.info("Derzeit sind keine Kurse mit Status 'BELEGT' vorhanden.")
+        st.info(vorlagen.KEINE_BELEGTEN_KURSE)
 
 # Kachel: Verbleibende Tage bis Studienende.
 with unten_rechts:
-    st.markdown(
-        f"""
-        <div class="kachel" style="background:{FARBE_ROT};">
-          <div class="k_title">Verbleibende Tage bis Studienende</div>
-          <div class="k_value">{verbleibende_tage}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
\ No newline at end of file
+    st.markdown(kacheln["tage"], unsafe_allow_html=True)
+
+# Semesterverlauf: liest den beim Mapping aufgebauten Semesterindex (keine Neuberechnung in der UI).
+verlauf = kennzahlen.snapshot.semester.verlauf()
+if verlauf:
+    st.markdown("<div class='table_header'>Semesterverlauf</div>", unsafe_allow_html=True)
+    verlauf_links, verlauf_rechts = st.columns(2)
+    with verlauf_links:
+        st.line_chart(
+            {
+                "Semester": [v.nummer for v in verlauf],
+                "Ø Semester": [v.durchschnitt for v in verlauf],
+                "Ø kumuliert": [v.kumulierter_durchschnitt for v in verlauf],
+            },
+            x="Semester",
+            y=["Ø Semester", "Ø kumuliert"],
+        )
+    with verlauf_rechts:
+        st.bar_chart(
+            {
+                "Semester": [v.nummer for v in verlauf],
+                "ECTS kumuliert": [v.kumulierte_ects for v in verlauf],
+            },
+            x="Semester",
+            y="ECTS kumuliert",
+            color=FARBE_BLAU,
+        )
+    # Kurse eines Semesters: Zeilen über den Semesterindex der (einmal je Ergebnis gelesenen) KursTabelle.
+    semester_auswahl = st.selectbox("Kurse im Semester", [None] + [v.nummer for v in verlauf],
+                                    format_func=lambda n: "–" if n is None else f"Semester {n}")
+    if semester_auswahl is not None:
+        st.dataframe(
+            [{"Kurs": k.name, "ECTS": k.ects, "Status": k.status.value} for k in kennzahlen.semesterkurse(semester_auswahl)],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+# Notenverteilung: Histogramme/Perzentile aus der beim Mapping geführten Notenstatistik.
+statistik = kennzahlen.snapshot.statistik
+if statistik.gesamt.anzahl:
+    st.markdown("<div class='table_header'>Notenverteilung</div>", unsafe_allow_html=True)
+    auswahl_links, auswahl_rechts = st.columns(2)
+    with auswahl_links:
+        studiengaenge = sorted(statistik.je_studiengang)
+        sg_auswahl = st.selectbox("Studiengang", ["Alle"] + studiengaenge)
+    kurs_zeilen = statistik.kurse(None if sg_auswahl == "Alle" else sg_auswahl)
+    with auswahl_rechts:
+        kurs_auswahl = st.selectbox(
+            "Kurs",
+            [None] + [(z.studiengang, z.kurs_name) for z in kurs_zeilen],
+            format_func=lambda s: "Alle" if s is None else (s[1] if sg_auswahl != "Alle" else f"{s[1]} ({s[0]})"),
+        )
+    if kurs_auswahl is not None:
+        histogramm = statistik.je_kurs[kurs_auswahl]
+    elif sg_auswahl != "Alle":
+        histogramm = statistik.je_studiengang[sg_auswahl]
+    else:
+        histogramm = statistik.gesamt
+
+    verteilung_links, verteilung_rechts = st.columns(2)
+    with verteilung_links:
+        klassen = histogramm.klassen()
+        st.bar_chart(
+            {"Note": [f"{note:.1f}" for note, _ in klassen], "Anzahl": [n for _, n in klassen]},
+            x="Note",
+            y="Anzahl",
+            color=FARBE_LILA,
+        )
+    with verteilung_rechts:
+        perzentile = histogramm.perzentile((10, 25, 50, 75, 90))
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Median", f"{perzentile[50]:.1f}")
+        m2.metric("Ø", f"{histogramm.mittelwert():.2f}")
+        m3.metric("Noten", f"{histogramm.anzahl}")
+        st.caption(" · ".join(f"P{p}: {w:.1f}" for p, w in perzentile.items()))
+        st.dataframe(
+            [{"Kurs": z.kurs_name, "Anzahl": z.anzahl, "Ø": z.mittelwert, "Median": z.median, "P10": z.p10, "P90": z.p90}
+             for z in kurs_zeilen],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+# Optionale Diagnose: Messwerte je Pipeline-Stufe (nur wenn die Instrumentierung eingeschaltet ist).
+# messung ist prozessweit (globaler Schalter in heißen Schleifen, tracemalloc): der Schalter wirkt daher
+# bewusst serverweit für alle Sessions und ist als Admin-Funktion gedacht, nicht als Einstellung je Nutzer.
+with st.expander("Diagnose (serverweit)", expanded=False):
+    st.caption(
+        "Gilt für alle Sessions dieses Servers: misst jede Berechnung mit (inkl. tracemalloc, "
+        "spürbar langsamer), bis es hier wieder ausgeschaltet wird."
+    )
+    messung_an = st.checkbox("Instrumentierung serverweit aktivieren (rechnet einmal neu)", value=messung.aktiv)
+    if messung_an and not messung.aktiv:
+        messung.aktivieren(speicher=True)
+        messung.zuruecksetzen()
+        berechnung.speicher.invalidieren()
+        st.rerun()
+    elif not messung_an and messung.aktiv:
+        messung.deaktivieren()
+    diagnose = messung.bericht()
+    if diagnose["stufen"]:
+        st.dataframe(
+            [{"Stufe": name, **werte} for name, werte in diagnose["stufen"].items()],
+            use_container_width=True,
+        )
+        if diagnose["zaehler"]:
+            st.json(diagnose["zaehler"])
+    else:
+        st.caption("Keine Messwerte vorhanden.")
+
+# Notenprognose: Annahme für die belegten Kurse (einheitlich oder je Semester), Monte-Carlo über die
+# Unsicherheit (prognose.py). Bewusst keine Regler je Kurs: bei Kohortendaten wären das Hunderte.
+if belegte_kurse:
+    import prognose
+
+    # Ergebnis je Eingabe zwischengespeichert: Reruns (andere Widgets, Seitenwechsel) ziehen nicht neu.
+    # Schlüssel: Datenstand (Quelle + Fingerabdruck + Notensummen) und die Annahmen; Kennzahlen selbst ungehasht.
+    @st.cache_data(max_entries=64, show_spinner=False)
+    def _prognose(stand: tuple, streuung: float, annahmen: tuple, _kennzahlen: berechnung.Kennzahlen) -> prognose.Prognose:
+        verteilung = {schluessel: prognose.verteilung_um(erwartung, streuung) for schluessel, erwartung in annahmen}
+        if "alle" in verteilung:
+            einheitlich = verteilung["alle"]
+            zuordnung = lambda k: einheitlich
+        else:
+            zuordnung = lambda k: verteilung[k.semester_nummer]
+        aggregat = _kennzahlen.snapshot.aggregat
+        return prognose.prognostizieren(
+            _kennzahlen.studiengang, aggregat.notensumme, aggregat.notenanzahl, _kennzahlen.belegte_kurse,
+            zuordnung, seed=0,
+        )
+
+    with st.expander("Notenprognose", expanded=False):
+        streuung = st.slider("Unsicherheit (Notenpunkte)", 0.0, 1.0, 0.3, 0.05)
+        annahme = st.radio("Annahme", ["Einheitlich", "Je Semester"], horizontal=True, key="prognose_annahme")
+        if annahme == "Einheitlich":
+            erwartung = st.slider("Erwartete Note der belegten Kurse", 1.0, 4.0, 2.0, 0.1, key="prognose_alle")
+            annahmen = (("alle", erwartung),)
+        else:
+            semester = sorted({k.semester_nummer for k in belegte_kurse}, key=lambda n: (n is None, n or 0))
+            spalten = st.columns(min(len(semester), 3))
+            je_semester = []
+            for i, nummer in enumerate(semester):
+                with spalten[i % len(spalten)]:
+                    titel = f"Semester {nummer}" if nummer is not None else "Ohne Semester"
+                    erwartung = st.slider(titel, 1.0, 4.0, 2.0, 0.1, key=f"prognose_semester_{nummer}")
+                je_semester.append((nummer, erwartung))
+            annahmen = tuple(je_semester)
+        aggregat = kennzahlen.snapshot.aggregat
+        stand = (str(kennzahlen.quelle), berechnung.fingerabdruck(kennzahlen.quelle), kennzahlen.duplikate,
+                 aggregat.notensumme, aggregat.notenanzahl, len(belegte_kurse))
+        ergebnis = _prognose(stand, streuung, annahmen, kennzahlen)
+        if ergebnis.mittelwert is None:
+            st.caption("Keine Noten für eine Prognose vorhanden.")
+        else:
+            p = ergebnis.perzentile
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Günstig (5. Perzentil)", f"{p[5]:.2f}")
+            m2.metric("Median", f"{p[50]:.2f}")
+            m3.metric("Ungünstig (95. Perzentil)", f"{p[95]:.2f}")
+            # Histogramm in 0.05er-Klassen über die prognostizierten Durchschnitte.
+            klassen = {}
+            for wert in ergebnis.werte:
+                klasse = round(round(float(wert) / 0.05) * 0.05, 2)
+                klassen[klasse] = klassen.get(klasse, 0) + 1
+            st.bar_chart(
+                {"Gesamtnote": sorted(klassen), "Szenarien": [klassen[k] for k in sorted(klassen)]},
+                x="Gesamtnote",
+                y="Szenarien",
+                color=FARBE_LILA,
+            )
+            st.caption(f"{ergebnis.szenarien:,} Szenarien; Kurse gehen ungewichtet wie im Gesamtdurchschnitt ein.")
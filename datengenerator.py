@@ -0,0 +1,59 @@
+# Erzeugt deterministische, studium.csv-artige Testdateien beliebiger Größe (für Benchmarks).
+# Enthält die Export-Eigenheiten, die CsvRepository abfangen muss: komplett gequotete Zeilen,
+# fehlende Zellen, deutsches Dezimalkomma und Alias-Spaltennamen.
+from __future__ import annotations
+
+import random
+from pathlib import Path
+from typing import List
+
+STUDIENGAENGE = ["Softwareentwickler", "Wirtschaftsinformatik", "Data Science", "Cyber Security", "Informatik"]
+NOTEN = ["1.0", "1.3", "1.7", "2.0", "2.3", "2.7", "3.0", "3.3", "3.7", "4.0", "5.0"]
+
+# Kopfzeilen-Varianten (Original + Aliasse aus CsvRepository).
+KOPFZEILEN = [
+    ["studiengang", "semester_nummer", "kurs_name", "ects", "status", "note"],
+    ["Studiengang", "Semester", "Modul", "ECTS", "Status", "Note"],
+    ["studiengang", "semester", "modul_name", "ects", "status", "note"],
+]
+
+def _kursnamen(anzahl: int, zufall: random.Random) -> List[str]:
+    staemme = ["Grundlagen", "Projekt", "Seminar", "Einfuehrung in", "Vertiefung", "Praxis"]
+    themen = ["Datenbanken", "Java", "Python", "IT-Sicherheit", "Web", "Cloud", "DevOps", "Statistik", "UX"]
+    return [f"{zufall.choice(staemme)} {zufall.choice(themen)} {i}" for i in range(anzahl)]
+
+def erzeuge_csv(pfad: Path, zeilen: int, seed: int = 0, trennzeichen: str = ";") -> Path:
+    """
+    Schreibt eine CSV mit `zeilen` Datenzeilen nach `pfad` (gleicher seed -> identische Datei).
+    Mischung je Zeile: ~30 % komplett gequotet, ~5 % fehlende Zellen, ~20 % Dezimalkomma,
+    ~15 % Status BELEGT ohne Note; die Kopfzeile nutzt je nach seed eine Alias-Variante.
+    """
+    zufall = random.Random(seed)
+    kopfzeile = KOPFZEILEN[seed % len(KOPFZEILEN)]
+    kurse = _kursnamen(400, zufall)
+    with pfad.open("w", encoding="utf-8", newline="") as f:
+        f.write('"' + trennzeichen.join(kopfzeile) + '"\n')
+        puffer: List[str] = []
+        for _ in range(zeilen):
+            belegt = zufall.random() < 0.15
+            note = "" if belegt or zufall.random() < 0.05 else zufall.choice(NOTEN)
+            if note and zufall.random() < 0.2:
+                note = note.replace(".", ",")
+            zellen = [
+                zufall.choice(STUDIENGAENGE),
+                str(zufall.randint(1, 7)),
+                zufall.choice(kurse),
+                "10" if zufall.random() < 0.05 else "5",
+                "BELEGT" if belegt else "ABGESCHLOSSEN",
+                note,
+            ]
+            if zufall.random() < 0.05:
+                zellen = zellen[:zufall.randint(3, 5)]  # fehlende Zellen am Zeilenende
+            zeile = trennzeichen.join(zellen)
+            puffer.append(f'"{zeile}"' if zufall.random() < 0.3 else zeile)
+            if len(puffer) >= 10000:
+                f.write("\n".join(puffer) + "\n")
+                puffer = []
+        if puffer:
+            f.write("\n".join(puffer) + "\n")
+    return pfad
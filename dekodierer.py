@@ -0,0 +1,158 @@
+# Verantwortung: spezialisierte Zeilenumwandlung je Datei (rohe csv.reader-Zeile -> typisierte Werte / Kurs).
+# Der Spaltenindex steht nach dem Lesen der Kopfzeile fest; daraus werden Closures mit festen Indizes,
+# vorkompilierten Mustern und einer Status-Tabelle gebaut. Alles, was nicht auf einen Schnellpfad passt,
+# läuft über die Referenz (CsvRepository._sauber, mapping._als_*), daher identische Ergebnisse.
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import re
+import time
+
+from csv_daten import _LEER_ODER_QUOTE, CsvRepository
+import messung
+from klassen import Kurs, KursStatus, Pruefungsleistung
+from mapping import _als_float, _als_int, _als_kursstatus, internieren
+
+# (studiengang, semester_nummer, kurs_name, ects, status, note)
+Zeilenwerte = Tuple[str, Optional[int], str, Optional[int], KursStatus, Optional[float]]
+
+# Unverpackte Dezimalzahl mit Punkt oder deutschem Komma (nur ASCII-Ziffern).
+_DEZIMAL = re.compile(r"[0-9]+(?:[.,][0-9]+)?")
+
+_RAND = frozenset(_LEER_ODER_QUOTE)
+
+def _zellreiniger() -> Callable[[str], str]:
+    """_sauber nur für Zellen, die am Rand Whitespace oder Quotes haben; sonst ist die Zelle schon sauber."""
+    sauber = CsvRepository._sauber
+    rand = _RAND
+
+    def rein(w: str) -> str:
+        if w and (w[0] in rand or w[-1] in rand or w[0].isspace() or w[-1].isspace()):
+            return sauber(w)
+        return w
+
+    return rein
+
+def _ganzzahl(rein: Callable[[str], str]) -> Callable[[str], Optional[int]]:
+    def umwandeln(w: str) -> Optional[int]:
+        if w.isascii() and w.isdigit():
+            return int(w)
+        return _als_int(rein(w))
+    return umwandeln
+
+def _dezimal(rein: Callable[[str], str]) -> Callable[[str], Optional[float]]:
+    passt = _DEZIMAL.fullmatch
+
+    def umwandeln(w: str) -> Optional[float]:
+        if passt(w):
+            return float(w.replace(",", "."))
+        return _als_float(rein(w))
+    return umwandeln
+
+def _status(rein: Callable[[str], str]) -> Callable[[str], KursStatus]:
+    tabelle: Dict[str, KursStatus] = {s.value: s for s in KursStatus}
+
+    def umwandeln(w: str) -> KursStatus:
+        treffer = tabelle.get(w)
+        return treffer if treffer is not None else _als_kursstatus(rein(w))
+    return umwandeln
+
+class Zeilendekodierer:
+    """
+    Auf einen Spaltenindex spezialisierte Umwandlung roher CSV-Zeilen.
+    Gleiche Zeilenregeln wie CsvRepository.datenzeilen_iterieren + mapping.zeile_mappen:
+    Fallback-Split bei „alles in einem Feld“, Leerzeilen werden übersprungen, fehlende Zellen = "".
+    Bei aktiver Messung dieselben Stufen und Zähler wie der Referenzweg (csv.datenzeilen_iterieren,
+    csv._sauber, mapping.zeile_mappen, csv.zeilen_*); die Zellbereinigung zählt dabei zu mapping.zeile_mappen.
+    """
+
+    def __init__(self, spaltenindex: Dict[str, int], trennzeichen: str = ";") -> None:
+        self.werte, self._normalisieren_gemessen, self._umwandeln = self._bauen(spaltenindex, trennzeichen)
+
+    @classmethod
+    def fuer(cls, repo: CsvRepository) -> "Zeilendekodierer":
+        """Dekodierer für die Kopfzeile einer Datei."""
+        return cls(repo.spaltenindex, repo.trennzeichen)
+
+    @staticmethod
+    def _bauen(spaltenindex: Dict[str, int], trennzeichen: str) -> Tuple[
+        Callable[[List[str]], Optional[Zeilenwerte]],
+        Callable[[List[str]], Optional[List[str]]],
+        Callable[[List[str]], Zeilenwerte],
+    ]:
+        i_sg, i_sem, i_name, i_ects, i_status, i_note = (
+            spaltenindex[n] for n in ("studiengang", "semester_nummer", "kurs_name", "ects", "status", "note")
+        )
+        breite = max(spaltenindex.values()) + 1
+        sauber = CsvRepository._sauber
+        rein = _zellreiniger()
+        ganzzahl, dezimal, status = _ganzzahl(rein), _dezimal(rein), _status(rein)
+
+        def umwandeln(r: List[str]) -> Zeilenwerte:
+            return (
+                rein(r[i_sg]),
+                ganzzahl(r[i_sem]),
+                internieren(rein(r[i_name])),
+                ganzzahl(r[i_ects]),
+                status(r[i_status]),
+                dezimal(r[i_note]),
+            )
+
+        def werte(r: List[str]) -> Optional[Zeilenwerte]:
+            if len(r) == 1 and trennzeichen in r[0]:
+                r = r[0].split(trennzeichen)
+            if not (r and rein(r[0])):
+                # Seltener Fall: erste Zelle leer -> vollständige Leerzeilen-Regel wie im Repository.
+                if not any(sauber(z) for z in r):
+                    return None
+            if len(r) < breite:
+                r = r + [""] * (breite - len(r))
+            return umwandeln(r)
+
+        def normalisieren_gemessen(r: List[str]) -> Optional[List[str]]:
+            # Zeilenregeln von werte() mit Zeit (csv._sauber) und Zählern wie CsvRepository._zeile_normalisieren.
+            start = time.perf_counter()
+            if len(r) == 1 and trennzeichen in r[0]:
+                r = r[0].split(trennzeichen)
+            leer = not (r and rein(r[0])) and not any(sauber(z) for z in r)
+            messung.zeit_addieren("csv._sauber", time.perf_counter() - start, 1)
+            if leer:
+                messung.zaehlen("csv.zeilen_leer_uebersprungen")
+                return None
+            if len(r) < breite:
+                r = r + [""] * (breite - len(r))
+                messung.zaehlen("csv.zeilen_aufgefuellt")
+            elif len(r) > breite:
+                messung.zaehlen("csv.zeilen_abgeschnitten")
+            return r
+
+        return werte, normalisieren_gemessen, umwandeln
+
+    def zeilen(self, rohzeilen: Iterable[List[str]]) -> Iterator[Zeilenwerte]:
+        """Typisierte Werte je nicht-leerer Zeile."""
+        if messung.aktiv:
+            yield from self._zeilen_gemessen(rohzeilen)
+            return
+        werte = self.werte
+        for r in rohzeilen:
+            w = werte(r)
+            if w is not None:
+                yield w
+
+    def _zeilen_gemessen(self, rohzeilen: Iterable[List[str]]) -> Iterator[Zeilenwerte]:
+        # Gleiche Schachtelung wie die Referenz: csv._sauber liegt in csv.datenzeilen_iterieren, das Mapping danach.
+        normalisieren, umwandeln = self._normalisieren_gemessen, self._umwandeln
+        normalisiert = (z for z in map(normalisieren, rohzeilen) if z is not None)
+        for z in messung.generator_messen("csv.datenzeilen_iterieren", normalisiert):
+            start = time.perf_counter()
+            w = umwandeln(z)
+            messung.zeit_addieren("mapping.zeile_mappen", time.perf_counter() - start, 1)
+            yield w
+
+    def kurse(self, rohzeilen: Iterable[List[str]]) -> Iterator[Tuple[str, Kurs, Optional[Pruefungsleistung]]]:
+        """(Studiengang, Kurs, Prüfungsleistung oder None) je Zeile – wie zeile_mappen über datenzeilen_iterieren."""
+        for sg, sem, name, ects, status, note in self.zeilen(rohzeilen):
+            yield (
+                sg,
+                Kurs(name=name, ects=ects, status=status, semester_nummer=sem),
+                None if note is None else Pruefungsleistung(pruefungsForm=None, note=note),
+            )
@@ -0,0 +1,376 @@
+# Verantwortung: Kennzahlen als JSON über HTTP bereitstellen (stdlib asyncio, ein Prozess, eine Event-Loop).
+# Die CSV wird im Executor geladen; gleichzeitige identische Anfragen teilen sich eine Berechnung,
+# fertige Antworten liegen in einem TTL/LRU-Cache, der bei geänderter CSV verworfen wird.
+# Aufruf: python kennzahlen_dienst.py [studium.csv] [--port 8080] [--student-spalte student_id]
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from aggregation import Gruppenschluessel, KennzahlenAggregat, aggregiere_gruppiert
+from berechnung import Fingerabdruck, StudiengangParameter, csv_datei_pfad, fingerabdruck
+from csv_daten import CsvLesefehler, CsvRepository
+
+logger = logging.getLogger("studium.dienst")
+
+# Endpunkt -> ausgelieferte Felder (None = alle Kennzahlen).
+ENDPUNKTE: Dict[str, Optional[Tuple[str, ...]]] = {
+    "/kennzahlen": None,
+    "/durchschnitt": ("durchschnitt",),
+    "/ects": ("ects_prozent", "ects_abgeschlossen", "maximale_ects"),
+    "/verbleibende-tage": ("verbleibende_tage",),
+    "/belegte-kurse": ("belegte_kurse",),
+}
+
+STATUSTEXTE = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               500: "Internal Server Error", 503: "Service Unavailable"}
+
+def _fehlerkoerper(nachricht: str) -> bytes:
+    return json.dumps({"fehler": nachricht}, ensure_ascii=False).encode("utf-8")
+
+class DienstFehler(Exception):
+    """Fachlicher Fehler einer Anfrage mit HTTP-Status (wird nicht zwischengespeichert)."""
+    def __init__(self, status: int, nachricht: str):
+        super().__init__(nachricht)
+        self.status = status
+        self.nachricht = nachricht
+
+@dataclass
+class Datenstand:
+    """Einmal gelesene CSV: Gesamtaggregat plus Aggregate je Studiengang bzw. (Studiengang, Student)."""
+    fingerabdruck: Fingerabdruck
+    gesamt: KennzahlenAggregat = field(default_factory=KennzahlenAggregat)
+    gruppen: Dict[Gruppenschluessel, KennzahlenAggregat] = field(default_factory=dict)
+
+def datenstand_laden(pfad: Path, student_spalte: Optional[str] = None) -> Datenstand:
+    """
+    Liest die CSV in einem Durchlauf und aggregiert gleichzeitig gesamt, je Studiengang
+    (Schlüssel (name, None)) und optional je Student (Schlüssel (name, id)); Kurslisten in CSV-Reihenfolge.
+    Läuft synchron (gedacht für den Executor).
+    """
+    stand = Datenstand(fingerabdruck=fingerabdruck(pfad))
+    stand.gruppen = aggregiere_gruppiert(CsvRepository(pfad), student_spalte, gesamt=stand.gesamt, je_studiengang=True)
+    return stand
+
+class ErgebnisCache:
+    """LRU-Cache fertiger Antwortkörper mit Ablaufzeit je Eintrag (nur aus der Event-Loop benutzt)."""
+
+    def __init__(self, max_eintraege: int = 1024, ttl: float = 30.0) -> None:
+        self._eintraege: "OrderedDict[tuple, Tuple[float, bytes]]" = OrderedDict()
+        self.max_eintraege = max_eintraege
+        self.ttl = ttl
+
+    def __len__(self) -> int:
+        return len(self._eintraege)
+
+    def holen(self, schluessel: tuple) -> Optional[bytes]:
+        eintrag = self._eintraege.get(schluessel)
+        if eintrag is None:
+            return None
+        if eintrag[0] < time.monotonic():
+            del self._eintraege[schluessel]
+            return None
+        self._eintraege.move_to_end(schluessel)
+        return eintrag[1]
+
+    def ablegen(self, schluessel: tuple, koerper: bytes) -> None:
+        self._eintraege[schluessel] = (time.monotonic() + self.ttl, koerper)
+        self._eintraege.move_to_end(schluessel)
+        while len(self._eintraege) > self.max_eintraege:
+            self._eintraege.popitem(last=False)
+
+    def leeren(self) -> None:
+        self._eintraege.clear()
+
+class KennzahlenDienst:
+    """
+    HTTP/1.1-Dienst (Keep-Alive, nur GET) für die Studiengang-Kennzahlen einer CSV-Datei.
+    - GET /kennzahlen | /durchschnitt | /ects | /verbleibende-tage | /belegte-kurse
+      Query: studiengang=<name> und optional student=<id> (benötigt student_spalte); ohne Query: gesamt
+    - GET /studiengaenge, GET /status (Cache-/Koaleszenz-Zähler)
+    Gleichzeitige identische Anfragen warten auf dieselbe Berechnung; das Laden der CSV läuft
+    im Default-Executor, damit die Event-Loop weiter Anfragen annimmt.
+    """
+
+    def __init__(
+        self,
+        pfad: Path = csv_datei_pfad,
+        parameter: StudiengangParameter = StudiengangParameter(),
+        student_spalte: Optional[str] = None,
+        cache: Optional[ErgebnisCache] = None,
+        pruefintervall: float = 1.0,
+    ) -> None:
+        self.pfad = pfad
+        self.parameter = parameter
+        self.student_spalte = student_spalte
+        self.cache = cache or ErgebnisCache()
+        self.pruefintervall = pruefintervall
+        self._stand: Optional[Datenstand] = None
+        self._laden: Optional[asyncio.Future] = None
+        self._laufend: Dict[tuple, asyncio.Future] = {}
+        self._beobachter: Optional[asyncio.Task] = None
+        self.anfragen = 0
+        self.treffer = 0
+        self.zusammengefasst = 0
+        self.berechnungen = 0
+        self.ladevorgaenge = 0
+
+    # --- Datenstand / Invalidierung -------------------------------------------------------------
+
+    def _veraltet(self) -> bool:
+        return self._stand is None or self._stand.fingerabdruck != fingerabdruck(self.pfad)
+
+    def invalidieren(self) -> None:
+        """Verwirft Datenstand und alle zwischengespeicherten Antworten."""
+        self._stand = None
+        self.cache.leeren()
+
+    async def _datenstand(self) -> Datenstand:
+        """Aktueller Datenstand; ein gleichzeitig laufender Ladevorgang wird mitbenutzt."""
+        if not self._veraltet():
+            return self._stand
+        if self._laden is None:
+            loop = asyncio.get_running_loop()
+            self._laden = loop.run_in_executor(None, datenstand_laden, self.pfad, self.student_spalte)
+            self.ladevorgaenge += 1
+        laden = self._laden
+        try:
+            stand = await asyncio.shield(laden)
+        finally:
+            if self._laden is laden and laden.done():
+                self._laden = None
+        if self._stand is not stand:
+            self._stand = stand
+            self.cache.leeren()
+        return stand
+
+    async def _beobachten(self) -> None:
+        while True:
+            await asyncio.sleep(self.pruefintervall)
+            if self._stand is not None and self._veraltet():
+                logger.info("CSV geändert, Cache verworfen: %s", self.pfad)
+                self.invalidieren()
+
+    # --- Kennzahlen -----------------------------------------------------------------------------
+
+    def _kennzahlen(self, stand: Datenstand, studiengang: Optional[str], student: Optional[str], heute: date) -> dict:
+        if student is not None and self.student_spalte is None:
+            raise DienstFehler(400, "Abfrage je Student erfordert eine Student-Spalte (--student-spalte).")
+        if studiengang is None and student is not None:
+            raise DienstFehler(400, "Parameter 'student' nur zusammen mit 'studiengang'.")
+        if studiengang is None:
+            aggregat, sg = stand.gesamt, self.parameter.studiengang()
+        else:
+            aggregat = stand.gruppen.get((studiengang, student))
+            if aggregat is None:
+                raise DienstFehler(404, f"Keine Daten für Studiengang '{studiengang}'"
+                                        + (f" und Student '{student}'." if student is not None else "."))
+            sg = replace(self.parameter.studiengang(), name=studiengang)
+        return {
+            "studiengang": sg.name,
+            "student": student,
+            "durchschnitt": aggregat.durchschnitt(sg),
+            "ects_prozent": aggregat.ects_prozent(sg),
+            "ects_abgeschlossen": aggregat.ects_abgeschlossen,
+            "maximale_ects": sg.maximaleEcts,
+            "verbleibende_tage": sg.berechneVerbleibendeTage(heute),
+            "belegte_kurse": [
+                {"name": k.name, "ects": k.ects, "semester_nummer": k.semester_nummer} for k in aggregat.belegte_kurse
+            ],
+        }
+
+    async def _berechnen(self, schluessel: tuple) -> bytes:
+        endpunkt, studiengang, student, heute = schluessel
+        stand = await self._datenstand()
+        werte = self._kennzahlen(stand, studiengang, student, heute)
+        felder = ENDPUNKTE[endpunkt]
+        if felder is not None:
+            werte = {"studiengang": werte["studiengang"], "student": student, **{f: werte[f] for f in felder}}
+        self.berechnungen += 1
+        return json.dumps(werte, ensure_ascii=False).encode("utf-8")
+
+    async def ergebnis(self, endpunkt: str, studiengang: Optional[str] = None, student: Optional[str] = None) -> bytes:
+        """JSON-Antwortkörper für einen Endpunkt (Cache -> laufende Berechnung -> neue Berechnung)."""
+        schluessel = (endpunkt, studiengang, student, date.today())
+        koerper = self.cache.holen(schluessel)
+        if koerper is not None:
+            self.treffer += 1
+            return koerper
+        laufend = self._laufend.get(schluessel)
+        if laufend is not None:
+            self.zusammengefasst += 1
+            return await asyncio.shield(laufend)
+
+        zukunft = asyncio.get_running_loop().create_future()
+        self._laufend[schluessel] = zukunft
+        try:
+            koerper = await self._berechnen(schluessel)
+        except asyncio.CancelledError:
+            zukunft.cancel()
+            raise
+        except Exception as e:
+            zukunft.set_exception(e)
+            zukunft.exception()  # als abgerufen markieren, falls niemand mitwartet
+            raise
+        else:
+            # Während des Ladens geänderte CSV: Antwort ausliefern, aber nicht über die Invalidierung hinaus behalten.
+            if not self._veraltet():
+                self.cache.ablegen(schluessel, koerper)
+            zukunft.set_result(koerper)
+        finally:
+            del self._laufend[schluessel]
+        return koerper
+
+    def status(self) -> dict:
+        return {
+            "datei": str(self.pfad),
+            "anfragen": self.anfragen,
+            "treffer": self.treffer,
+            "zusammengefasst": self.zusammengefasst,
+            "berechnungen": self.berechnungen,
+            "ladevorgaenge": self.ladevorgaenge,
+            "cache_eintraege": len(self.cache),
+        }
+
+    # --- HTTP -----------------------------------------------------------------------------------
+
+    async def _beantworten(self, anfragezeile: bytes) -> Tuple[int, bytes]:
+        teile = anfragezeile.decode("latin-1").split()
+        if len(teile) != 3:
+            raise DienstFehler(400, "Ungültige Anfragezeile.")
+        methode, ziel, _ = teile
+        if methode != "GET":
+            raise DienstFehler(405, "Nur GET wird unterstützt.")
+        url = urlsplit(ziel)
+        try:
+            query = {k: v[0] for k, v in parse_qs(url.query, errors="strict").items()}
+        except UnicodeDecodeError:
+            raise DienstFehler(400, "Query-Parameter sind kein gültiges UTF-8.") from None
+        if url.path == "/status":
+            return 200, json.dumps(self.status()).encode("utf-8")
+        if url.path == "/studiengaenge":
+            stand = await self._datenstand()
+            namen = [name for name, student in stand.gruppen if student is None]
+            return 200, json.dumps(namen, ensure_ascii=False).encode("utf-8")
+        if url.path not in ENDPUNKTE:
+            raise DienstFehler(404, f"Unbekannter Endpunkt '{url.path}'.")
+        return 200, await self.ergebnis(url.path, query.get("studiengang"), query.get("student"))
+
+    @staticmethod
+    def _antwort(writer: asyncio.StreamWriter, status: int, koerper: bytes, offen: bool) -> None:
+        writer.write(
+            f"HTTP/1.1 {status} {STATUSTEXTE.get(status, '')}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(koerper)}\r\n"
+            f"Connection: {'keep-alive' if offen else 'close'}\r\n\r\n".encode("latin-1") + koerper
+        )
+
+    async def _verbindung(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                anfragezeile = await reader.readline()
+                if not anfragezeile.strip():
+                    break
+                kopf: Dict[str, str] = {}
+                while True:
+                    zeile = await reader.readline()
+                    if zeile in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, wert = zeile.decode("latin-1").partition(":")
+                    kopf[name.strip().lower()] = wert.strip()
+                self.anfragen += 1
+                laenge = kopf.get("content-length") or "0"
+                if not (laenge.isascii() and laenge.isdigit()):
+                    # Ohne gültige Länge ist das Ende der Anfrage unbekannt: antworten und schließen.
+                    self._antwort(writer, 400, _fehlerkoerper("Ungültige Content-Length."), offen=False)
+                    await writer.drain()
+                    break
+                await reader.readexactly(int(laenge))
+
+                try:
+                    status, koerper = await self._beantworten(anfragezeile)
+                except DienstFehler as e:
+                    status, koerper = e.status, _fehlerkoerper(e.nachricht)
+                except CsvLesefehler as e:
+                    status, koerper = 503, _fehlerkoerper(e.nachricht)
+                except Exception:
+                    logger.exception("Unerwarteter Fehler bei %r", anfragezeile)
+                    status, koerper = 500, _fehlerkoerper("Interner Fehler.")
+
+                offen = anfragezeile.rstrip().endswith(b"HTTP/1.1") and kopf.get("connection", "").lower() != "close"
+                self._antwort(writer, status, koerper, offen)
+                await writer.drain()
+                if not offen:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client weg oder Anfrage abgebrochen: Verbindung einfach schließen
+        except ValueError:
+            # StreamReader.readline: Zeile länger als das Puffer-Limit
+            logger.info("Anfrage mit überlanger Zeile verworfen")
+        finally:
+            writer.close()
+
+    async def starten(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.AbstractServer:
+        """Startet Server und Datei-Beobachter; port=0 wählt einen freien Port."""
+        server = await asyncio.start_server(self._verbindung, host, port, backlog=4096)
+        if self._beobachter is None:
+            self._beobachter = asyncio.get_running_loop().create_task(self._beobachten())
+        return server
+
+    async def stoppen(self, server: asyncio.AbstractServer) -> None:
+        server.close()
+        await server.wait_closed()
+        if self._beobachter is not None:
+            self._beobachter.cancel()
+            self._beobachter = None
+
+def _argumente(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Studium-Kennzahlen als HTTP/JSON-Dienst bereitstellen.")
+    parser.add_argument("datei", nargs="?", default=str(csv_datei_pfad), help="CSV-Datei (Standard: studium.csv)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--student-spalte", default=None, help="Spalte mit Student-ID für Abfragen je Student")
+    parser.add_argument("--ttl", type=float, default=30.0, help="Lebensdauer zwischengespeicherter Antworten (s)")
+    parser.add_argument("--max-eintraege", type=int, default=1024, help="Maximale Anzahl Cache-Einträge")
+    parser.add_argument("--pruefintervall", type=float, default=1.0, help="Abstand der Dateiprüfung (s)")
+    parser.add_argument("--name", default=None, help="Name des Studiengangs (Gesamtsicht)")
+    parser.add_argument("--regelzeit-monate", type=int, default=None, help="Regelstudienzeit in Monaten")
+    parser.add_argument("--studienende", default=None, help="Studienende als JJJJ-MM-TT")
+    parser.add_argument("--maximale-ects", type=int, default=None, help="ECTS für 100 %%")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _argumente(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    parameter = StudiengangParameter.aus_args(args)
+    dienst = KennzahlenDienst(
+        Path(args.datei), parameter, student_spalte=args.student_spalte,
+        cache=ErgebnisCache(args.max_eintraege, args.ttl), pruefintervall=args.pruefintervall,
+    )
+
+    async def laufen() -> None:
+        server = await dienst.starten(args.host, args.port)
+        for socket in server.sockets:
+            logger.info("Kennzahlen-Dienst läuft auf %s", socket.getsockname())
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(laufen())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+# Headless-Einstieg: Kennzahlen ohne Streamlit als JSON oder CSV ausgeben (z. B. für Cronjobs/Monitoring).
+# Aufruf: python kennzahlen_export.py studium.csv [weitere.csv ...] [--format json|csv]
+# Importiert nur die Pipeline-Module und diese erst in main(), damit der Kaltstart schnell bleibt.
+from __future__ import annotations
+
+import argparse
+import sys
+from typing import List, Optional
+
+def _argumente(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Studium-Kennzahlen als JSON oder CSV ausgeben.")
+    parser.add_argument("dateien", nargs="+", help="Eine oder mehrere CSV-Dateien")
+    parser.add_argument("--format", choices=["json", "csv"], default="json", help="Ausgabeformat (Standard: json)")
+    parser.add_argument("--name", default=None, help="Name des Studiengangs")
+    parser.add_argument("--regelzeit-monate", type=int, default=None, help="Regelstudienzeit in Monaten")
+    parser.add_argument("--studienende", default=None, help="Studienende als JJJJ-MM-TT")
+    parser.add_argument("--maximale-ects", type=int, default=None, help="ECTS für 100 %%")
+    parser.add_argument("--ohne-cache", action="store_true", help="Platten-Zwischenspeicher nicht verwenden")
+    parser.add_argument("--duplikate", choices=["letzte_zeile", "beste_note", "abgeschlossen"], default=None,
+                        help="Wiederholte Kurse zusammenfassen (Standard: alle Zeilen zählen)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Berechnet die Kennzahlen je Datei und schreibt sie nach stdout; Fehler je Datei nach stderr."""
+    args = _argumente(argv)
+
+    from pathlib import Path
+
+    from berechnung import StudiengangParameter, berechne_kennzahlen
+    from csv_daten import CsvLesefehler
+    from mapping import Duplikatregel
+
+    parameter = StudiengangParameter.aus_args(args)
+
+    ergebnisse = []
+    fehler = 0
+    for datei in args.dateien:
+        try:
+            k = berechne_kennzahlen(Path(datei), parameter, zwischenspeichern=not args.ohne_cache,
+                                    duplikate=Duplikatregel(args.duplikate) if args.duplikate else None)
+        except CsvLesefehler as e:
+            print(f"{datei}: {e.nachricht}", file=sys.stderr)
+            fehler += 1
+            continue
+        ergebnisse.append({
+            "datei": datei,
+            "studiengang": k.studiengang.name,
+            "durchschnitt": k.durchschnitt,
+            "ects_prozent": k.ects_prozent,
+            "ects_abgeschlossen": k.ects_abgeschlossen,
+            "maximale_ects": k.studiengang.maximaleEcts,
+            "verbleibende_tage": k.verbleibende_tage,
+            "belegte_kurse": [{"name": kurs.name, "ects": kurs.ects} for kurs in k.belegte_kurse],
+        })
+
+    if args.format == "json":
+        import json
+        json.dump(ergebnisse, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        import csv
+        writer = csv.writer(sys.stdout, delimiter=";", lineterminator="\n")
+        writer.writerow(["datei", "studiengang", "durchschnitt", "ects_prozent", "ects_abgeschlossen",
+                         "maximale_ects", "verbleibende_tage", "belegte_kurse"])
+        for e in ergebnisse:
+            writer.writerow([
+                e["datei"], e["studiengang"], "" if e["durchschnitt"] is None else e["durchschnitt"],
+                e["ects_prozent"], e["ects_abgeschlossen"], e["maximale_ects"], e["verbleibende_tage"],
+                "|".join(kurs["name"] for kurs in e["belegte_kurse"]),
+            ])
+    return 1 if fehler else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,44 @@
 # Domänenmodell nach UML: Studiengang, Semester, KursStatus, Kurs, Pruefungsleistung.
+# Ergänzend: KursTabelle (spaltenorientiert) und SemesterIndex (Verlauf je Semester).
 from __future__ import annotations
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from enum import Enum
-from typing import List, Optional
+import math
+from typing import Dict, Iterable, List, Optional, Sequence, Sized, Tuple, Union
+
+import messung
+
+# NumPy ist optional und wird erst bei Bedarf geladen (None = nicht installiert).
+_np = None
+_np_geprueft = False
+
+def _numpy():
+    global _np, _np_geprueft
+    if not _np_geprueft:
+        _np_geprueft = True
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+# Addiert x exakt zu nicht überlappenden Teilsummen (Shewchuk, wie math.fsum intern); math.fsum(teile)
+# ist danach die korrekt gerundete exakte Summe, unabhängig von der Reihenfolge. Für alle laufenden Notensummen.
+def _teilsumme_addieren(teile: List[float], x: float) -> None:
+    i = 0
+    for y in teile:
+        if abs(x) < abs(y):
+            x, y = y, x
+        hoch = x + y
+        tief = y - (hoch - x)
+        if tief:
+            teile[i] = tief
+            i += 1
+        x = hoch
+    teile[i:] = [x]
 
 # Aggregatwurzel: berechnet Kennzahlen und liefert Sichten (belegte Kurse).
 @dataclass
@@ -14,19 +49,41 @@ class Studiengang:
     maximaleEcts: int
 
     # Durchschnittsnote der vorhandenen Prüfungsleistungen (None bei keiner Note).
-    def berechneGesamtdurchschnitt(self, pruefungsleistungen: List["Pruefungsleistung"]) -> Optional[float]:
-        noten = [pl.note for pl in pruefungsleistungen if pl.note is not None]
-        if not noten:
+    # Akzeptiert beliebige Iterables (auch Generatoren) und eine KursTabelle (Noten-Spalte, vektorisiert).
+    def berechneGesamtdurchschnitt(self, pruefungsleistungen: Union[Iterable["Pruefungsleistung"], "KursTabelle"]) -> Optional[float]:
+        with messung.stufe("klassen.berechneGesamtdurchschnitt") as s:
+            if messung.aktiv and isinstance(pruefungsleistungen, Sized):
+                s.zeilen = len(pruefungsleistungen)
+            if isinstance(pruefungsleistungen, KursTabelle):
+                summe, anzahl = pruefungsleistungen.notensumme_und_anzahl()
+            else:
+                noten = [pl.note for pl in pruefungsleistungen if pl.note is not None]
+                summe, anzahl = math.fsum(noten), len(noten)
+        return self.berechneDurchschnittAus(summe, anzahl)
+
+    # Gemeinsame Formel für Listen, Tabellen und Streaming-Aggregate.
+    def berechneDurchschnittAus(self, summe: float, anzahl: int) -> Optional[float]:
+        if not anzahl:
             return None
-        return round(sum(noten) / len(noten), 2)
+        return round(summe / anzahl, 2)
 
     # ECTS-Fortschritt als Prozentwert (0..100), auf 2 Nachkommastellen gerundet.
-    def berechneEctsProzent(self, kurse: List["Kurs"]) -> float:
-        ects_abgeschlossen = sum(
-            (k.ects or 0)
-            for k in kurse
-            if k.status == KursStatus.ABGESCHLOSSEN and k.ects is not None
-        )
+    def berechneEctsProzent(self, kurse: Union[Iterable["Kurs"], "KursTabelle"]) -> float:
+        with messung.stufe("klassen.berechneEctsProzent") as s:
+            if messung.aktiv and isinstance(kurse, Sized):
+                s.zeilen = len(kurse)
+            if isinstance(kurse, KursTabelle):
+                ects_abgeschlossen = kurse.ects_abgeschlossen()
+            else:
+                ects_abgeschlossen = sum(
+                    (k.ects or 0)
+                    for k in kurse
+                    if k.status == KursStatus.ABGESCHLOSSEN and k.ects is not None
+                )
+        return self.berechneEctsProzentAus(ects_abgeschlossen)
+
+    # Gemeinsame Formel für bereits summierte abgeschlossene ECTS.
+    def berechneEctsProzentAus(self, ects_abgeschlossen: int) -> float:
         if self.maximaleEcts <= 0:
             return 0.0
         return round((ects_abgeschlossen / self.maximaleEcts) * 100.0, 2)
@@ -38,13 +95,145 @@ class Studiengang:
         return (ende - today).days
 
     # Liefert Kurse mit Status BELEGT (für die Tabelle).
-    def getBelegteKurse(self, kurse: List["Kurs"]) -> List["Kurs"]:
-        return [k for k in kurse if k.status == KursStatus.BELEGT]
+    def getBelegteKurse(self, kurse: Union[Iterable["Kurs"], "KursTabelle"]) -> List["Kurs"]:
+        with messung.stufe("klassen.getBelegteKurse") as s:
+            if messung.aktiv and isinstance(kurse, Sized):
+                s.zeilen = len(kurse)
+            if isinstance(kurse, KursTabelle):
+                return [kurse.kurs(i) for i in kurse.indizes_mit_status(KursStatus.BELEGT)]
+            return [k for k in kurse if k.status == KursStatus.BELEGT]
 
-# Schlanker Strukturbau-Stein (für Erweiterbarkeit).
+# Semester mit laufenden Summen (Kurse, Noten, abgeschlossene ECTS). Die Kurse selbst werden nicht
+# gehalten: der Index liegt im Snapshot-Cache und soll nicht mit der Zeilenzahl wachsen.
+# Die Notensumme wird exakt als Teilsummen geführt (wie KennzahlenAggregat).
 @dataclass
 class Semester:
     nummer: int
+    anzahl_kurse: int = 0
+    notenteile: List[float] = field(default_factory=list)
+    notenanzahl: int = 0
+    ects_abgeschlossen: int = 0
+
+    # Korrekt gerundete Summe aller Noten des Semesters.
+    @property
+    def notensumme(self) -> float:
+        return math.fsum(self.notenteile)
+
+    # Nimmt einen Kurs (plus Prüfungsleistung derselben Zeile) auf; O(1).
+    def hinzufuegen(self, kurs: "Kurs", pruefungsleistung: Optional["Pruefungsleistung"] = None) -> None:
+        self.anzahl_kurse += 1
+        if pruefungsleistung is not None and pruefungsleistung.note is not None:
+            _teilsumme_addieren(self.notenteile, pruefungsleistung.note)
+            self.notenanzahl += 1
+        if kurs.status == KursStatus.ABGESCHLOSSEN and kurs.ects is not None:
+            self.ects_abgeschlossen += kurs.ects
+
+    # Durchschnittsnote dieses Semesters (None bei keiner Note).
+    def durchschnitt(self) -> Optional[float]:
+        if not self.notenanzahl:
+            return None
+        return round(self.notensumme / self.notenanzahl, 2)
+
+# Eine Zeile des Semesterverlaufs: Werte des Semesters plus kumuliert bis einschließlich dieses Semesters.
+@dataclass
+class SemesterKennzahl:
+    nummer: int
+    anzahl_kurse: int
+    durchschnitt: Optional[float]
+    ects_abgeschlossen: int
+    kumulierter_durchschnitt: Optional[float]
+    kumulierte_ects: int
+
+# Index Semesternummer -> Semester; wird beim Mapping befüllt und inkrementell fortgeschrieben.
+# Kurse ohne Semesterangabe landen in ohne_semester (nummer=0) und zählen nicht zum Verlauf.
+# Zusätzlich je Semester die Zeilennummern der Kurse (Zeile i = i-ter hinzugefügter Kurs, also der Index in
+# die im selben Durchlauf gebaute Kursliste/KursTabelle). Diese Zuordnung wächst mit der Zeilenzahl und wird
+# deshalb nicht mit gepickelt: ein Index aus dem Snapshot-Cache hält nur die Summen (zeilen_verfuegbar False).
+# zeilen_merken=False spart sie ganz (Snapshot ohne Kursliste, in die die Zeilennummern zeigen könnten).
+class SemesterIndex:
+    def __init__(self, zeilen_merken: bool = True) -> None:
+        self._semester: Dict[int, Semester] = {}
+        self.ohne_semester = Semester(nummer=0)
+        self._verlauf: Optional[List[SemesterKennzahl]] = None
+        self._anzahl_zeilen = 0
+        # Semesternummer (None = ohne Semesterangabe) -> Zeilennummern
+        self._zeilen: Optional[Dict[Optional[int], array]] = {} if zeilen_merken else None
+
+    def hinzufuegen(self, kurs: "Kurs", pruefungsleistung: Optional["Pruefungsleistung"] = None) -> None:
+        nummer = kurs.semester_nummer
+        if nummer is None:
+            ziel = self.ohne_semester
+        else:
+            ziel = self._semester.get(nummer)
+            if ziel is None:
+                ziel = self._semester[nummer] = Semester(nummer=nummer)
+        ziel.hinzufuegen(kurs, pruefungsleistung)
+        if self._zeilen is not None:
+            zeilen = self._zeilen.get(nummer)
+            if zeilen is None:
+                zeilen = self._zeilen[nummer] = array("q")
+            zeilen.append(self._anzahl_zeilen)
+        self._anzahl_zeilen += 1
+        self._verlauf = None  # Verlauf beim nächsten Zugriff neu aufbauen (O(Anzahl Semester))
+
+    # Pickle (Snapshot-Cache) ohne Zeilenzuordnung und ohne abgeleiteten Verlauf.
+    def __getstate__(self) -> dict:
+        zustand = self.__dict__.copy()
+        zustand["_zeilen"] = None
+        zustand["_verlauf"] = None
+        return zustand
+
+    def __len__(self) -> int:
+        return len(self._semester)
+
+    # O(1)-Zugriff auf ein Semester (None, wenn es nicht vorkommt).
+    def semester(self, nummer: int) -> Optional[Semester]:
+        return self._semester.get(nummer)
+
+    # True, wenn die Zeilennummern gemerkt wurden (nicht bei zeilen_merken=False oder aus dem Pickle).
+    @property
+    def zeilen_verfuegbar(self) -> bool:
+        return self._zeilen is not None
+
+    # O(1)-Zugriff auf die Zeilennummern eines Semesters (None = ohne Semesterangabe), aufsteigend.
+    def zeilen(self, nummer: Optional[int]) -> Sequence[int]:
+        if self._zeilen is None:
+            raise LookupError("Zeilenzuordnung nicht verfügbar (zeilen_merken=False oder aus dem Zwischenspeicher)")
+        return self._zeilen.get(nummer, ())
+
+    # Kurse eines Semesters aus der im selben Durchlauf gebauten Kursliste bzw. KursTabelle.
+    def kurse(self, nummer: Optional[int], quelle: Union[Sequence["Kurs"], "KursTabelle"]) -> List["Kurs"]:
+        zeilen = self.zeilen(nummer)
+        if isinstance(quelle, KursTabelle):
+            return [quelle.kurs(i) for i in zeilen]
+        return [quelle[i] for i in zeilen]
+
+    def nummern(self) -> List[int]:
+        return sorted(self._semester)
+
+    # Vorberechneter Verlauf je Semester (aufsteigend) inkl. kumulierter Note und ECTS.
+    def verlauf(self) -> List[SemesterKennzahl]:
+        if self._verlauf is None:
+            verlauf: List[SemesterKennzahl] = []
+            teile: List[float] = []
+            anzahl, ects = 0, 0
+            for nummer in self.nummern():
+                s = self._semester[nummer]
+                for teil in s.notenteile:
+                    _teilsumme_addieren(teile, teil)
+                summe = math.fsum(teile)
+                anzahl += s.notenanzahl
+                ects += s.ects_abgeschlossen
+                verlauf.append(SemesterKennzahl(
+                    nummer=nummer,
+                    anzahl_kurse=s.anzahl_kurse,
+                    durchschnitt=s.durchschnitt(),
+                    ects_abgeschlossen=s.ects_abgeschlossen,
+                    kumulierter_durchschnitt=round(summe / anzahl, 2) if anzahl else None,
+                    kumulierte_ects=ects,
+                ))
+            self._verlauf = verlauf
+        return self._verlauf
 
 # Status der Kurse in der CSV/Domain.
 class KursStatus(Enum):
@@ -52,7 +241,8 @@ class KursStatus(Enum):
     ABGESCHLOSSEN = "ABGESCHLOSSEN"
 
 # Kurs entkoppelt vom Studiengang (Relation über Aggregat).
-@dataclass
+# slots=True: kein __dict__ je Instanz (Millionen Zeilen pro Kohorte).
+@dataclass(slots=True)
 class Kurs:
     name: str
     ects: Optional[int]
@@ -60,7 +250,95 @@ class Kurs:
     semester_nummer: Optional[int] = None  # Rohe Zuordnung aus CSV
 
 # Prüfungsleistung für Noten und ggf. Prüfungsform (hier optional).
-@dataclass
+@dataclass(slots=True)
 class Pruefungsleistung:
     pruefungsForm: Optional[str]
-    note: Optional[float]
\ No newline at end of file
+    note: Optional[float]
+
+# Unveränderliche (hashbare) Varianten mit gleichem Konstruktor, z. B. als Dict-Schlüssel oder geteilte Werte.
+@dataclass(frozen=True, slots=True)
+class UnveraenderlicherKurs:
+    name: str
+    ects: Optional[int]
+    status: KursStatus
+    semester_nummer: Optional[int] = None
+
+@dataclass(frozen=True, slots=True)
+class UnveraenderlichePruefungsleistung:
+    pruefungsForm: Optional[str]
+    note: Optional[float]
+
+# Spaltenorientierte Kurstabelle: parallele, typisierte Arrays statt eines Objekts pro Zeile.
+# Fehlende Ganzzahlen (ECTS/Semester) stehen als KEIN_WERT, fehlende Noten als NaN im Array.
+class KursTabelle:
+    KEIN_WERT = -(2 ** 63)
+    _STATUS_CODES = {KursStatus.BELEGT: 0, KursStatus.ABGESCHLOSSEN: 1}
+    _STATUS_AUS_CODE = {0: KursStatus.BELEGT, 1: KursStatus.ABGESCHLOSSEN}
+
+    def __init__(self) -> None:
+        self.namen: List[str] = []
+        self.ects = array("q")
+        self.status = array("b")
+        self.semester = array("q")
+        self.noten = array("d")
+        # Laufende exakte Notensumme (Teilsummen wie Semester.notenteile) und Anzahl vorhandener Noten.
+        self._notenteile: List[float] = []
+        self._notenanzahl = 0
+
+    def __len__(self) -> int:
+        return len(self.namen)
+
+    # Hängt eine Zeile an (Kurs plus optionale Note derselben CSV-Zeile).
+    def anhaengen(self, kurs: "Kurs", note: Optional[float] = None) -> None:
+        self.namen.append(kurs.name)
+        self.ects.append(self.KEIN_WERT if kurs.ects is None else kurs.ects)
+        self.status.append(self._STATUS_CODES[kurs.status])
+        self.semester.append(self.KEIN_WERT if kurs.semester_nummer is None else kurs.semester_nummer)
+        if note is None:
+            self.noten.append(float("nan"))
+        else:
+            self.noten.append(note)
+            _teilsumme_addieren(self._notenteile, note)
+            self._notenanzahl += 1
+
+    # Baut die Tabelle aus bestehenden Kurs-Objekten (Noten optional, zeilenparallel).
+    @classmethod
+    def aus_kursen(cls, kurse: List["Kurs"], noten: Optional[List[Optional[float]]] = None) -> "KursTabelle":
+        tabelle = cls()
+        for i, k in enumerate(kurse):
+            tabelle.anhaengen(k, None if noten is None else noten[i])
+        return tabelle
+
+    # Materialisiert Zeile i wieder als Kurs (nur für kleine Ergebnismengen gedacht).
+    def kurs(self, i: int) -> "Kurs":
+        ects = self.ects[i]
+        semester = self.semester[i]
+        return Kurs(
+            name=self.namen[i],
+            ects=None if ects == self.KEIN_WERT else ects,
+            status=self._STATUS_AUS_CODE[self.status[i]],
+            semester_nummer=None if semester == self.KEIN_WERT else semester,
+        )
+
+    # Summe (exakt, wie KennzahlenAggregat) und Anzahl der vorhandenen Noten; beim Anhängen mitgeführt, O(1).
+    def notensumme_und_anzahl(self) -> Tuple[float, int]:
+        return math.fsum(self._notenteile), self._notenanzahl
+
+    # Summe der ECTS aller abgeschlossenen Kurse mit ECTS-Angabe.
+    def ects_abgeschlossen(self) -> int:
+        code = self._STATUS_CODES[KursStatus.ABGESCHLOSSEN]
+        np = _numpy()
+        if np is not None and len(self.ects):
+            ects = np.frombuffer(self.ects, dtype=np.int64)
+            status = np.frombuffer(self.status, dtype=np.int8)
+            return int(ects[(status == code) & (ects != self.KEIN_WERT)].sum())
+        kein = self.KEIN_WERT
+        return sum(e for e, s in zip(self.ects, self.status) if s == code and e != kein)
+
+    # Zeilenindizes mit dem gewünschten Status (Reihenfolge wie in der CSV).
+    def indizes_mit_status(self, status: KursStatus) -> List[int]:
+        code = self._STATUS_CODES[status]
+        np = _numpy()
+        if np is not None and len(self.status):
+            return np.flatnonzero(np.frombuffer(self.status, dtype=np.int8) == code).tolist()
+        return [i for i, s in enumerate(self.status) if s == code]
@@ -0,0 +1,102 @@
+# Verantwortung: vorab gebauter In-Memory-Index über eine Kursliste für seitenweise Tabellen
+# (Sortierreihenfolge je Spalte, Token-Index auf Kurs.name für die Suche). Keine IO/GUI hier.
+from __future__ import annotations
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import re
+
+from klassen import Kurs
+
+# Sortierbare Spalten: Anzeigename -> Kurs-Attribut.
+SPALTEN = {"Kurs": "name", "ECTS": "ects", "Semester": "semester_nummer"}
+
+_TOKEN = re.compile(r"\w+")
+
+def tokens(text: str) -> List[str]:
+    """Suchbegriffe eines Textes (Wortzeichen, ohne Groß-/Kleinschreibung)."""
+    return _TOKEN.findall(text.casefold())
+
+@dataclass
+class Seite:
+    """Eine Tabellenseite: sichtbare Kurse plus Trefferzahl für die Seitennavigation."""
+    kurse: List[Kurs]
+    treffer: int
+    seite: int
+    seiten: int
+
+class KursIndex:
+    """
+    Einmal gebaut (O(n log n)), danach je Abfrage nur Arbeit proportional zu Treffern bzw. Seitengröße.
+    - je Spalte und Richtung: Reihenfolge (Positionen) und Rang je Position; leere Werte stehen
+      in beiden Richtungen hinten (in CSV-Reihenfolge), gefilterte Seiten sortieren nach demselben Rang
+    - Token-Index: Token -> Positionen; die Suche matcht jedes Suchwort als Präfix eines Tokens
+      (sortierte Tokenliste + bisect) und schneidet die Treffer aller Suchwörter
+    """
+
+    def __init__(self, kurse: Sequence[Kurs]) -> None:
+        self._kurse = list(kurse)
+        # (Attribut, absteigend) -> Positionen in Sortierreihenfolge bzw. Rang je Position
+        self._reihenfolge: Dict[Tuple[str, bool], List[int]] = {}
+        self._rang: Dict[Tuple[str, bool], List[int]] = {}
+        for attribut in SPALTEN.values():
+            def sortierwert(i: int, attribut: str = attribut):
+                wert = getattr(self._kurse[i], attribut)
+                if wert is None:
+                    return (1, "")
+                return (0, wert.casefold() if isinstance(wert, str) else wert)
+            reihenfolge = sorted(range(len(self._kurse)), key=sortierwert)
+            leer_ab = sum(1 for k in self._kurse if getattr(k, attribut) is not None)
+            for absteigend, positionen in ((False, reihenfolge), (True, reihenfolge[:leer_ab][::-1] + reihenfolge[leer_ab:])):
+                rang = [0] * len(positionen)
+                for r, i in enumerate(positionen):
+                    rang[i] = r
+                self._reihenfolge[attribut, absteigend] = positionen
+                self._rang[attribut, absteigend] = rang
+
+        postings: Dict[str, List[int]] = {}
+        for i, kurs in enumerate(self._kurse):
+            for token in set(tokens(kurs.name)):
+                postings.setdefault(token, []).append(i)
+        self._postings = postings
+        self._tokens = sorted(postings)
+
+    def __len__(self) -> int:
+        return len(self._kurse)
+
+    def _praefix_treffer(self, praefix: str) -> Set[int]:
+        treffer: Set[int] = set()
+        i = bisect_left(self._tokens, praefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(praefix):
+            treffer.update(self._postings[self._tokens[i]])
+            i += 1
+        return treffer
+
+    def suchen(self, anfrage: str) -> Optional[Set[int]]:
+        """Positionen aller Kurse, deren Name zu jedem Suchwort ein Token mit diesem Präfix hat; None = kein Filter."""
+        woerter = tokens(anfrage)
+        if not woerter:
+            return None
+        treffer: Optional[Set[int]] = None
+        for wort in sorted(woerter, key=len, reverse=True):  # lange Präfixe zuerst: kleinste Mengen
+            teil = self._praefix_treffer(wort)
+            treffer = teil if treffer is None else treffer & teil
+            if not treffer:
+                return set()
+        return treffer
+
+    def seite(self, anfrage: str = "", spalte: str = "Kurs", absteigend: bool = False,
+              seite: int = 0, groesse: int = 25) -> Seite:
+        """Liefert eine sortierte Seite der (gefilterten) Kurse; `seite` wird auf den gültigen Bereich begrenzt."""
+        attribut = SPALTEN[spalte]
+        treffer = self.suchen(anfrage)
+        anzahl = len(self._kurse) if treffer is None else len(treffer)
+        seiten = max(1, -(-anzahl // groesse))
+        seite = min(max(seite, 0), seiten - 1)
+        start = seite * groesse
+
+        if treffer is None:
+            positionen = self._reihenfolge[attribut, bool(absteigend)][start:start + groesse]
+        else:
+            positionen = sorted(treffer, key=self._rang[attribut, bool(absteigend)].__getitem__)[start:start + groesse]
+        return Seite(kurse=[self._kurse[i] for i in positionen], treffer=anzahl, seite=seite, seiten=seiten)
@@ -0,0 +1,126 @@
+# Lasttest für kennzahlen_dienst.py: viele gleichzeitige Keep-Alive-Verbindungen gegen eine lokale Instanz.
+# Misst Durchsatz und Latenz-Perzentile und gibt zum Schluss die Zähler des Dienstes (/status) aus.
+# Aufruf: python lasttest.py [--verbindungen 1000] [--anfragen 20] [--starten studium.csv] [--url http://127.0.0.1:8080]
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+VERZEICHNIS = Path(__file__).resolve().parent
+
+# Standard-Mix: alle Kennzahlen-Endpunkte der Gesamtsicht.
+PFADE_STANDARD = ["/kennzahlen", "/durchschnitt", "/ects", "/verbleibende-tage", "/belegte-kurse"]
+
+async def _anfrage(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str, pfad: str) -> Tuple[int, bytes]:
+    writer.write(f"GET {pfad} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    statuszeile = await reader.readline()
+    laenge = 0
+    while True:
+        zeile = await reader.readline()
+        if zeile in (b"\r\n", b""):
+            break
+        name, _, wert = zeile.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            laenge = int(wert)
+    return int(statuszeile.split()[1]), await reader.readexactly(laenge)
+
+async def _client(host: str, port: int, pfade: List[str], anfragen: int, versatz: int,
+                  latenzen: List[float], fehler: Dict[str, int]) -> None:
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        fehler[type(e).__name__] = fehler.get(type(e).__name__, 0) + 1
+        return
+    try:
+        for i in range(anfragen):
+            start = time.perf_counter()
+            status, _ = await _anfrage(reader, writer, host, pfade[(versatz + i) % len(pfade)])
+            latenzen.append(time.perf_counter() - start)
+            if status != 200:
+                fehler[str(status)] = fehler.get(str(status), 0) + 1
+    except (ConnectionError, asyncio.IncompleteReadError) as e:
+        fehler[type(e).__name__] = fehler.get(type(e).__name__, 0) + 1
+    finally:
+        writer.close()
+
+async def _status(host: str, port: int) -> dict:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, koerper = await _anfrage(reader, writer, host, "/status")
+        return json.loads(koerper)
+    finally:
+        writer.close()
+
+async def lastlauf(host: str, port: int, verbindungen: int, anfragen: int, pfade: List[str]) -> dict:
+    """Startet alle Verbindungen gleichzeitig; jede schickt `anfragen` Anfragen nacheinander."""
+    latenzen: List[float] = []
+    fehler: Dict[str, int] = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, pfade, anfragen, v, latenzen, fehler) for v in range(verbindungen)))
+    dauer = time.perf_counter() - start
+    latenzen.sort()
+    quantile = statistics.quantiles(latenzen, n=100) if len(latenzen) > 1 else latenzen * 99
+    return {
+        "verbindungen": verbindungen,
+        "anfragen": len(latenzen),
+        "fehler": fehler,
+        "dauer_s": dauer,
+        "anfragen_pro_s": len(latenzen) / dauer if dauer > 0 else 0.0,
+        "latenz_ms": {
+            "p50": quantile[49] * 1000 if quantile else None,
+            "p99": quantile[98] * 1000 if quantile else None,
+            "max": latenzen[-1] * 1000 if latenzen else None,
+        },
+        "dienst": await _status(host, port),
+    }
+
+def _instanz_starten(datei: str, port: int) -> subprocess.Popen:
+    """
+    Startet kennzahlen_dienst.py als Kindprozess und wartet, bis der Port antwortet.
+    Der CSV-Pfad wird vorher aufgelöst, weil der Kindprozess im Modulverzeichnis läuft.
+    """
+    csv_pfad = str(Path(datei).resolve())
+    prozess = subprocess.Popen([sys.executable, str(VERZEICHNIS / "kennzahlen_dienst.py"), csv_pfad, "--port", str(port)],
+                               cwd=VERZEICHNIS, stderr=subprocess.DEVNULL)
+    ende = time.monotonic() + 10.0
+    while time.monotonic() < ende:
+        try:
+            asyncio.run(_status("127.0.0.1", port))
+            return prozess
+        except OSError:
+            time.sleep(0.05)
+    prozess.kill()
+    raise RuntimeError("Kennzahlen-Dienst ist nicht gestartet.")
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Lasttest gegen den Kennzahlen-Dienst.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Basis-URL der laufenden Instanz")
+    parser.add_argument("--starten", metavar="CSV", default=None, help="Lokale Instanz mit dieser CSV starten")
+    parser.add_argument("--verbindungen", type=int, default=1000)
+    parser.add_argument("--anfragen", type=int, default=20, help="Anfragen je Verbindung")
+    parser.add_argument("--pfad", action="append", default=None, help="Pfad inkl. Query (mehrfach möglich)")
+    args = parser.parse_args(argv)
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or "127.0.0.1", url.port or 80
+    prozess = _instanz_starten(args.starten, port) if args.starten else None
+    try:
+        ergebnis = asyncio.run(lastlauf(host, port, args.verbindungen, args.anfragen, args.pfad or PFADE_STANDARD))
+    finally:
+        if prozess is not None:
+            prozess.terminate()
+            prozess.wait()
+    print(json.dumps(ergebnis, indent=2, ensure_ascii=False))
+    return 1 if ergebnis["fehler"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,37 @@
 # Verantwortung: Roh-Dicts (CSV) in Domänenobjekte transformieren. Keine IO/GUI hier.
 from __future__ import annotations
-from typing import Iterable, List, Optional, Tuple
+from enum import Enum
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import time
 
-from klassen import Kurs, KursStatus, Pruefungsleistung
+import messung
+from klassen import (
+    Kurs,
+    KursStatus,
+    KursTabelle,
+    Pruefungsleistung,
+    SemesterIndex,
+    UnveraenderlichePruefungsleistung,
+    UnveraenderlicherKurs,
+)
+
+# Rückgabetypen der Mapper: fest=True liefert die unveränderlichen Varianten.
+KursArt = Union[Kurs, UnveraenderlicherKurs]
+PruefungsleistungArt = Union[Pruefungsleistung, UnveraenderlichePruefungsleistung]
+
+# Gemeinsamer String-Pool: wiederkehrende Kurs-/Studiengangsnamen werden nur einmal gehalten.
+# Begrenzt, damit Dateien mit lauter unterschiedlichen Werten den Pool nicht unbegrenzt wachsen lassen.
+_STRING_POOL: Dict[str, str] = {}
+STRING_POOL_MAX = 100_000
+
+def internieren(wert: str) -> str:
+    """Liefert die geteilte Instanz eines Strings aus dem Pool (neue Werte nur bis STRING_POOL_MAX)."""
+    geteilt = _STRING_POOL.get(wert)
+    if geteilt is not None:
+        return geteilt
+    if len(_STRING_POOL) < STRING_POOL_MAX:
+        _STRING_POOL[wert] = wert
+    return wert
 
 def _als_int(wert: str) -> Optional[int]:
     """Konvertiert String nach int; leere/ungültige Werte -> None."""
@@ -12,6 +41,8 @@ def _als_int(wert: str) -> Optional[int]:
     try:
         return int(w)
     except ValueError:
+        if messung.aktiv:
+            messung.zaehlen("mapping.ungueltige_ganzzahlen")
         return None
 
 def _als_float(wert: str) -> Optional[float]:
@@ -22,6 +53,8 @@ def _als_float(wert: str) -> Optional[float]:
     try:
         return float(w)
     except ValueError:
+        if messung.aktiv:
+            messung.zaehlen("mapping.ungueltige_noten")
         return None
 
 def _als_kursstatus(wert: str) -> KursStatus:
@@ -31,47 +64,155 @@ def _als_kursstatus(wert: str) -> KursStatus:
         return KursStatus.ABGESCHLOSSEN
     return KursStatus.BELEGT  # Fallback
 
-def zeile_zu_kurs(zeile: dict) -> Kurs:
+def status_ist(status: KursStatus) -> Callable[[str], bool]:
+    """
+    Prädikat für CsvRepository.datenzeilen_iterieren(filter=...): prüft einen rohen Status-Zellwert
+    mit denselben Regeln wie _als_kursstatus (inkl. Quotes/Whitespace).
+    """
+    from csv_daten import CsvRepository  # nur die Zellbereinigung (_sauber), kein IO
+
+    sauber = CsvRepository._sauber
+    schnell = {s.value: s for s in KursStatus}
+
+    def praedikat(rohwert: str) -> bool:
+        treffer = schnell.get(rohwert)  # häufigster Fall: unverpackter Statuswert
+        return (treffer if treffer is not None else _als_kursstatus(sauber(rohwert))) == status
+
+    return praedikat
+
+def zeile_zu_kurs(zeile: dict, fest: bool = False) -> KursArt:
     """
     Baut Kurs aus CSV-Zeile. Erwartete Keys: studiengang, semester_nummer, kurs_name, ects, status, note.
     Hinweis: Studiengang wird im Kurs nicht gespeichert (Domänenwurzel ist Studiengang).
+    Der Kursname wird über den String-Pool geteilt; fest=True liefert UnveraenderlicherKurs.
     """
-    name = (zeile.get("kurs_name") or "").strip()
+    name = internieren((zeile.get("kurs_name") or "").strip())
     ects = _als_int(zeile.get("ects", ""))
     status = _als_kursstatus(zeile.get("status", ""))
     semester_nummer = _als_int(zeile.get("semester_nummer", ""))
 
-    return Kurs(
+    return (UnveraenderlicherKurs if fest else Kurs)(
         name=name,
         ects=ects,
         status=status,
         semester_nummer=semester_nummer
     )
 
-def zeile_zu_pruefungsleistung(zeile: dict) -> Optional[Pruefungsleistung]:
+def zeile_zu_pruefungsleistung(zeile: dict, fest: bool = False) -> Optional[PruefungsleistungArt]:
     """
     Baut Prüfungsleistung nur, wenn eine Note vorliegt.
     Prüfungsform ist nicht in der CSV -> bleibt None.
+    fest=True liefert UnveraenderlichePruefungsleistung.
     """
     note = _als_float(zeile.get("note", ""))
     if note is None:
         return None
-    return Pruefungsleistung(
+    return (UnveraenderlichePruefungsleistung if fest else Pruefungsleistung)(
         pruefungsForm=None,
         note=note
     )
 
-def zeilen_zu_domaene(zeilen: Iterable[dict]) -> Tuple[List[Kurs], List[Pruefungsleistung]]:
+def zeile_mappen(zeile: dict, fest: bool = False) -> Tuple[KursArt, Optional[PruefungsleistungArt]]:
+    """Kurs und (optionale) Prüfungsleistung einer Zeile; gemessen, wenn die Instrumentierung aktiv ist."""
+    if messung.aktiv:
+        start = time.perf_counter()
+        ergebnis = zeile_zu_kurs(zeile, fest), zeile_zu_pruefungsleistung(zeile, fest)
+        messung.zeit_addieren("mapping.zeile_mappen", time.perf_counter() - start, 1)
+        return ergebnis
+    return zeile_zu_kurs(zeile, fest), zeile_zu_pruefungsleistung(zeile, fest)
+
+class Duplikatregel(Enum):
+    """Welcher Versuch eines mehrfach vorkommenden Kurses (Wiederholung) zählt."""
+    LETZTE_ZEILE = "letzte_zeile"    # spätere Zeile ersetzt frühere
+    BESTE_NOTE = "beste_note"        # kleinste Note gewinnt; Zeilen ohne Note verlieren gegen benotete
+    ABGESCHLOSSEN = "abgeschlossen"  # ABGESCHLOSSEN schlägt BELEGT
+
+# Schlüssel für die Duplikaterkennung (bereinigte Zellwerte).
+DUPLIKAT_SCHLUESSEL = ("studiengang", "kurs_name")
+
+def _ersetzt(regel: Duplikatregel, neu: dict, alt: dict) -> bool:
+    """True, wenn die spätere Zeile `neu` die bisher gewählte Zeile `alt` ersetzt (Gleichstand: spätere gewinnt)."""
+    if regel is Duplikatregel.LETZTE_ZEILE:
+        return True
+    if regel is Duplikatregel.BESTE_NOTE:
+        note_neu, note_alt = _als_float(neu.get("note", "")), _als_float(alt.get("note", ""))
+        if note_neu is None:
+            return note_alt is None
+        return note_alt is None or note_neu <= note_alt
+    abgeschlossen_alt = _als_kursstatus(alt.get("status", "")) == KursStatus.ABGESCHLOSSEN
+    return not abgeschlossen_alt or _als_kursstatus(neu.get("status", "")) == KursStatus.ABGESCHLOSSEN
+
+def zeilen_deduplizieren(
+    zeilen: Iterable[dict],
+    regel: Duplikatregel = Duplikatregel.LETZTE_ZEILE,
+    schluessel: Sequence[str] = DUPLIKAT_SCHLUESSEL,
+) -> Iterator[dict]:
+    """
+    Reduziert Rohzeilen auf eine Zeile je Schlüssel (Standard: Studiengang + Kursname) nach `regel`.
+    - Ein Durchlauf über einen Hash-Index (Schlüssel -> gewählte Zeile): O(Zeilen), Speicher O(Schlüssel)
+    - Ausgabe in der Reihenfolge des ersten Auftretens, sobald die Eingabe erschöpft ist
+    - Zeilen ohne Kursnamen werden nie zusammengefasst
+    Als Generator vor jede Stufe schaltbar, die Rohzeilen liest (Aggregat, Snapshot, Statistik, ...). Die Eingabe
+    wird dabei gestreamt, die Ausgabe aber nicht: jede gewählte Zeile kann bis zur letzten Eingabezeile noch
+    ersetzt werden, daher kommt die erste Zeile erst nach dem vollständigen Durchlauf (blockierende Stufe).
+    """
+    index: Dict[tuple, dict] = {}
+    duplikate = 0
+    for z in zeilen:
+        name = (z.get("kurs_name") or "").strip()
+        if not name:
+            index[(None, len(index))] = z
+            continue
+        k = tuple(name if s == "kurs_name" else (z.get(s) or "").strip() for s in schluessel)
+        alt = index.get(k)
+        if alt is None:
+            index[k] = z
+            continue
+        duplikate += 1
+        if _ersetzt(regel, z, alt):
+            index[k] = z
+    if messung.aktiv and duplikate:
+        messung.zaehlen("mapping.duplikate", duplikate)
+    yield from index.values()
+
+def zeilen_zu_domaene(
+    zeilen: Iterable[dict],
+    fest: bool = False,
+    semesterindex: Optional[SemesterIndex] = None,
+    duplikate: Optional[Duplikatregel] = None,
+) -> Tuple[List[KursArt], List[PruefungsleistungArt]]:
     """
     Transformiert CSV-Rohzeilen in Domänenlisten.
     - Kurse: aus allen Zeilen
     - Prüfungsleistungen: nur Zeilen mit Note
+    - fest=True: unveränderliche Varianten (UnveraenderlicherKurs/-Pruefungsleistung)
+    - semesterindex: wird im selben Durchlauf fortgeschrieben; seine Zeilennummern zeigen in die Kursliste
+    - duplikate: Wiederholungen vorher per zeilen_deduplizieren zusammenfassen (optional)
     """
-    kurse: List[Kurs] = []
-    pruefungen: List[Pruefungsleistung] = []
+    if duplikate is not None:
+        zeilen = zeilen_deduplizieren(zeilen, duplikate)
+    kurse: List[KursArt] = []
+    pruefungen: List[PruefungsleistungArt] = []
     for z in zeilen:
-        kurse.append(zeile_zu_kurs(z))
-        pl = zeile_zu_pruefungsleistung(z)
+        kurs, pl = zeile_mappen(z, fest)
+        kurse.append(kurs)
         if pl is not None:
             pruefungen.append(pl)
-    return kurse, pruefungen
\ No newline at end of file
+        if semesterindex is not None:
+            semesterindex.hinzufuegen(kurs, pl)
+    return kurse, pruefungen
+
+def zeilen_zu_tabelle(zeilen: Iterable[dict], semesterindex: Optional[SemesterIndex] = None) -> KursTabelle:
+    """
+    Transformiert CSV-Rohzeilen in eine spaltenorientierte KursTabelle.
+    - Eine Tabellenzeile je CSV-Zeile (Kurs + Note derselben Zeile)
+    - Gleiche Konvertierungsregeln wie zeilen_zu_domaene
+    - semesterindex: wird im selben Durchlauf fortgeschrieben; seine Zeilennummern zeigen in die Tabelle
+    """
+    tabelle = KursTabelle()
+    for z in zeilen:
+        kurs, pl = zeile_mappen(z)
+        tabelle.anhaengen(kurs, None if pl is None else pl.note)
+        if semesterindex is not None:
+            semesterindex.hinzufuegen(kurs, pl)
+    return tabelle
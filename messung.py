@@ -0,0 +1,156 @@
+# Leichtgewichtige Instrumentierung der Pipeline-Stufen (Zeit, Zeilen/s, Spitzen-Allokation, Zähler).
+# Standardmäßig aus: Aufrufer prüfen `messung.aktiv` bzw. erhalten einen leeren Kontext,
+# sodass deaktiviert praktisch keine Kosten entstehen. Keine Fachlogik hier.
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, TypeVar
+import json
+import logging
+import time
+import tracemalloc
+
+T = TypeVar("T")
+
+logger = logging.getLogger("studium.messung")
+
+# Globaler Schalter; wird in heißen Schleifen direkt abgefragt.
+aktiv = False
+_speicher_messen = False
+
+@dataclass
+class Stufenmessung:
+    """Aufsummierte Messwerte einer Stufe."""
+    zeit_s: float = 0.0
+    aufrufe: int = 0
+    zeilen: int = 0
+    spitze_bytes: int = 0
+
+    @property
+    def zeilen_pro_s(self) -> Optional[float]:
+        return self.zeilen / self.zeit_s if self.zeilen and self.zeit_s > 0 else None
+
+_stufen: Dict[str, Stufenmessung] = {}
+_zaehler: Dict[str, int] = {}
+# Offene Stufen mit Speichermessung: bisherige Spitze je Ebene (tracemalloc kennt nur eine globale Spitze).
+_spitzen: List[int] = []
+
+def aktivieren(speicher: bool = False) -> None:
+    """Schaltet die Messung ein; speicher=True misst zusätzlich Spitzen-Allokationen (tracemalloc, teurer)."""
+    global aktiv, _speicher_messen
+    aktiv = True
+    _speicher_messen = speicher
+    if speicher and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+def deaktivieren() -> None:
+    global aktiv, _speicher_messen
+    aktiv = False
+    if _speicher_messen and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _speicher_messen = False
+
+def zuruecksetzen() -> None:
+    """Verwirft alle bisher gesammelten Werte."""
+    _stufen.clear()
+    _zaehler.clear()
+    _spitzen.clear()
+
+def zeit_addieren(name: str, sekunden: float, zeilen: int = 0) -> None:
+    """Addiert eine gemessene Dauer (und optional verarbeitete Zeilen) zu einer Stufe."""
+    s = _stufen.get(name)
+    if s is None:
+        s = _stufen[name] = Stufenmessung()
+    s.zeit_s += sekunden
+    s.aufrufe += 1
+    s.zeilen += zeilen
+
+def zaehlen(name: str, anzahl: int = 1) -> None:
+    """Erhöht einen Zähler (z. B. übersprungene oder aufgefüllte Zeilen)."""
+    _zaehler[name] = _zaehler.get(name, 0) + anzahl
+
+class _Stufe:
+    """
+    Gemessene Stufe; Stufen dürfen geschachtelt werden.
+    - Speicherspitze: beim Betreten einer inneren Stufe wird die bisherige Spitze der äußeren gesichert,
+      beim Verlassen die der inneren in die äußere übernommen (kein Überschreiben durch reset_peak)
+    """
+    __slots__ = ("name", "zeilen", "_start", "_speicher")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.zeilen = 0
+
+    def __enter__(self) -> "_Stufe":
+        self._speicher = _speicher_messen
+        if self._speicher:
+            if _spitzen:
+                _spitzen[-1] = max(_spitzen[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            _spitzen.append(0)
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        zeit_addieren(self.name, time.perf_counter() - self._start, self.zeilen)
+        if self._speicher and _spitzen:
+            spitze = max(_spitzen.pop(), tracemalloc.get_traced_memory()[1])
+            if _spitzen:
+                _spitzen[-1] = max(_spitzen[-1], spitze)
+            s = _stufen[self.name]
+            s.spitze_bytes = max(s.spitze_bytes, spitze)
+
+class _LeereStufe:
+    """Geteilter No-op-Kontext für den deaktivierten Zustand."""
+    __slots__ = ("zeilen",)
+
+    def __enter__(self) -> "_LeereStufe":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        pass
+
+_LEER = _LeereStufe()
+
+def stufe(name: str):
+    """Kontextmanager für eine Stufe (deaktiviert: geteilter No-op-Kontext). `.zeilen` darf gesetzt werden."""
+    if not aktiv:
+        return _LEER
+    return _Stufe(name)
+
+def generator_messen(name: str, quelle: Iterator[T]) -> Iterator[T]:
+    """Misst nur die Zeit innerhalb der Quelle (ohne die Verarbeitung beim Aufrufer) und zählt Elemente."""
+    zeit = 0.0
+    anzahl = 0
+    uhr = time.perf_counter
+    try:
+        while True:
+            start = uhr()
+            try:
+                element = next(quelle)
+            except StopIteration:
+                zeit += uhr() - start
+                return
+            zeit += uhr() - start
+            anzahl += 1
+            yield element
+    finally:
+        zeit_addieren(name, zeit, anzahl)
+
+def bericht() -> Dict[str, dict]:
+    """Strukturierte Sicht auf alle Messwerte: {"stufen": {...}, "zaehler": {...}}."""
+    return {
+        "stufen": {
+            name: {**asdict(s), "zeilen_pro_s": s.zeilen_pro_s}
+            for name, s in sorted(_stufen.items())
+        },
+        "zaehler": dict(sorted(_zaehler.items())),
+    }
+
+def protokollieren(level: int = logging.INFO) -> None:
+    """Schreibt den Bericht als eine JSON-Zeile je Stufe/Zähler in das Logging."""
+    daten = bericht()
+    for name, werte in daten["stufen"].items():
+        logger.log(level, json.dumps({"stufe": name, **werte}, ensure_ascii=False))
+    if daten["zaehler"]:
+        logger.log(level, json.dumps({"zaehler": daten["zaehler"]}, ensure_ascii=False))
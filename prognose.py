@@ -0,0 +1,148 @@
+# Verantwortung: Was-wäre-wenn-Prognose der Gesamtnote für die belegten Kurse (Monte Carlo, gebündelt).
+# Rechnet vektorisiert mit NumPy, wenn installiert, sonst mit der stdlib; keine IO/GUI hier.
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import math
+import random
+import statistics
+
+import messung
+from klassen import Kurs, Studiengang, _numpy
+
+# Bestehensnoten der deutschen Notenskala (Grundlage für Standardverteilungen).
+NOTENSTUFEN = (1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0)
+
+# Je Kurs: feste hypothetische Note oder diskrete Verteilung [(note, gewicht), ...].
+Notenverteilung = Union[float, Sequence[Tuple[float, float]]]
+
+# Zuordnung Kurs -> Annahme: Kursname -> Verteilung oder Funktion (z. B. je Semester); None = bleibt unbenotet.
+Zuordnung = Union[Mapping[str, Notenverteilung], Callable[[Kurs], Optional[Notenverteilung]]]
+
+PERZENTILE = (5, 25, 50, 75, 95)
+
+# stdlib-Pfad: bis zu so vielen Kursen je Annahme wird exakt je Kurs gezogen, darüber die Gruppensumme
+# über die Normalapproximation (Summe unabhängiger gleich verteilter Noten), eine Ziehung je Szenario.
+EXAKT_BIS = 8
+
+def verteilung_um(erwartung: float, streuung: float) -> List[Tuple[float, float]]:
+    """
+    Diskrete Verteilung über NOTENSTUFEN, glockenförmig um `erwartung` (Streuung in Notenpunkten).
+    streuung <= 0 ergibt die nächstgelegene Notenstufe mit Gewicht 1.
+    """
+    if streuung <= 0:
+        return [(min(NOTENSTUFEN, key=lambda n: abs(n - erwartung)), 1.0)]
+    return [(n, math.exp(-0.5 * ((n - erwartung) / streuung) ** 2)) for n in NOTENSTUFEN]
+
+@dataclass
+class Prognose:
+    """Verteilung der prognostizierten Gesamtnote über alle Szenarien."""
+    szenarien: int
+    mittelwert: Optional[float]
+    perzentile: Dict[int, float] = field(default_factory=dict)
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    werte: Sequence[float] = field(default_factory=list, repr=False)
+
+def _ziehen_numpy(np, gruppen: List[Tuple[Notenverteilung, int]], szenarien: int, seed: Optional[int]):
+    rng = np.random.default_rng(seed)
+    summe = np.zeros(szenarien)
+    for v, anzahl in gruppen:
+        if isinstance(v, (int, float)):
+            summe += float(v) * anzahl
+            continue
+        noten = np.array([n for n, _ in v], dtype=np.float64)
+        gewichte = np.array([g for _, g in v], dtype=np.float64)
+        if anzahl == 1:
+            summe += rng.choice(noten, size=szenarien, p=gewichte / gewichte.sum())
+        else:
+            # Gleich verteilte Kurse gemeinsam: Häufigkeit je Notenstufe statt einer Ziehung je Kurs.
+            summe += rng.multinomial(anzahl, gewichte / gewichte.sum(), size=szenarien) @ noten
+    return summe
+
+def _ziehen_stdlib(gruppen: List[Tuple[Notenverteilung, int]], szenarien: int, seed: Optional[int]) -> List[float]:
+    zufall = random.Random(seed)
+    konstant = 0.0
+    spalten = []
+    for v, anzahl in gruppen:
+        if isinstance(v, (int, float)):
+            konstant += float(v) * anzahl
+            continue
+        noten, gewichte = [n for n, _ in v], [g for _, g in v]
+        if anzahl <= EXAKT_BIS:
+            for _ in range(anzahl):
+                spalten.append(zufall.choices(noten, weights=gewichte, k=szenarien))
+            continue
+        # Große Gruppe: Summe ~ N(anzahl * mu, anzahl * var), begrenzt auf den möglichen Bereich.
+        gesamt = math.fsum(gewichte)
+        mu = math.fsum(n * g for n, g in zip(noten, gewichte)) / gesamt
+        sigma = math.sqrt(anzahl * math.fsum((n - mu) ** 2 * g for n, g in zip(noten, gewichte)) / gesamt)
+        unten, oben = anzahl * min(noten), anzahl * max(noten)
+        normal = zufall.gauss
+        spalten.append([min(oben, max(unten, normal(anzahl * mu, sigma))) for _ in range(szenarien)])
+    if not spalten:
+        return [konstant] * szenarien
+    return [konstant + sum(werte) for werte in zip(*spalten)]
+
+def _gruppieren(belegte_kurse: Sequence[Kurs], verteilungen: Zuordnung) -> List[Tuple[Notenverteilung, int]]:
+    """Fasst Kurse mit gleicher Annahme zusammen (Reihenfolge des ersten Auftretens)."""
+    zuordnen = verteilungen if callable(verteilungen) else (lambda k: verteilungen.get(k.name))
+    gruppen: Dict[object, Tuple[Notenverteilung, int]] = {}
+    for k in belegte_kurse:
+        v = zuordnen(k)
+        if v is None:
+            continue
+        schluessel = float(v) if isinstance(v, (int, float)) else tuple((float(n), float(g)) for n, g in v)
+        _, anzahl = gruppen.get(schluessel, (v, 0))
+        gruppen[schluessel] = (v, anzahl + 1)
+    return list(gruppen.values())
+
+def prognostizieren(
+    studiengang: Studiengang,
+    notensumme: float,
+    notenanzahl: int,
+    belegte_kurse: Sequence[Kurs],
+    verteilungen: Zuordnung,
+    szenarien: int = 20_000,
+    seed: Optional[int] = None,
+) -> Prognose:
+    """
+    Simuliert `szenarien` Ausgänge der belegten Kurse und liefert die Verteilung der Gesamtnote
+    (ungewichteter Mittelwert wie Studiengang.berechneGesamtdurchschnitt).
+    - notensumme/notenanzahl: bisherige Noten (z. B. aus KennzahlenAggregat)
+    - verteilungen: Kursname -> feste Note oder [(note, gewicht), ...] bzw. Funktion Kurs -> Annahme;
+      Kurse ohne Annahme bleiben unbenotet
+    - Kurse mit gleicher Annahme (z. B. eine einheitliche Note für alle) werden gemeinsam gezogen,
+      der Aufwand hängt dann von der Anzahl verschiedener Annahmen ab, nicht von der Kursanzahl:
+      NumPy zieht exakt multinomial, die stdlib ab EXAKT_BIS Kursen über die Normalapproximation
+    """
+    offene = _gruppieren(belegte_kurse, verteilungen)
+    anzahl = notenanzahl + sum(n for _, n in offene)
+    if anzahl == 0:
+        return Prognose(szenarien=szenarien, mittelwert=None)
+
+    np = _numpy()
+    with messung.stufe("prognose.prognostizieren") as s:
+        s.zeilen = szenarien
+        if np is not None:
+            werte = (notensumme + _ziehen_numpy(np, offene, szenarien, seed)) / anzahl
+            perzentile = {p: float(w) for p, w in zip(PERZENTILE, np.percentile(werte, PERZENTILE))}
+            mittelwert, minimum, maximum = float(werte.mean()), float(werte.min()), float(werte.max())
+        else:
+            werte = [(notensumme + summe) / anzahl for summe in _ziehen_stdlib(offene, szenarien, seed)]
+            if len(werte) > 1:
+                schnitte = statistics.quantiles(werte, n=100, method="inclusive")
+                perzentile = {p: schnitte[p - 1] for p in PERZENTILE}
+            else:
+                perzentile = {p: werte[0] for p in PERZENTILE}
+            mittelwert, minimum, maximum = statistics.fmean(werte), min(werte), max(werte)
+
+    runden = lambda w: round(w, 2)  # gleiche Rundung wie die Kachel (berechneDurchschnittAus)
+    return Prognose(
+        szenarien=szenarien,
+        mittelwert=runden(mittelwert),
+        perzentile={p: runden(w) for p, w in perzentile.items()},
+        minimum=runden(minimum),
+        maximum=runden(maximum),
+        werte=werte,
+    )
@@ -0,0 +1,142 @@
+# Verantwortung: CSV-Daten in SQLite (Datei oder :memory:) ablegen und Kennzahlen per SQL-Aggregat liefern.
+# Gleiche Lese-Oberfläche wie CsvRepository (kopfzeile, spaltenindex, datenzeilen_iterieren); nur stdlib.
+from __future__ import annotations
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+import sqlite3
+
+from aggregation import KennzahlenAggregat
+from csv_daten import CsvLesefehler, CsvRepository
+from klassen import Kurs, KursStatus
+from mapping import zeile_mappen
+
+class SqliteRepository:
+    """
+    Hält bereinigte CSV-Zeilen (Rohtext je Spalte) plus typisierte Fachspalten in einer indizierten Tabelle.
+    Typisierung beim Import über dieselben Mapping-Regeln wie im CSV-Pfad.
+    """
+
+    def __init__(self, datenbank: Union[str, Path] = ":memory:") -> None:
+        self._verbindung = sqlite3.connect(str(datenbank))
+        self._kopfzeile: Optional[List[str]] = None
+        self._verbindung.execute("CREATE TABLE IF NOT EXISTS kopfzeile (position INTEGER PRIMARY KEY, name TEXT NOT NULL)")
+
+    @classmethod
+    def aus_csv(cls, csv_repo: CsvRepository, datenbank: Union[str, Path] = ":memory:") -> "SqliteRepository":
+        """Legt ein Repository an und importiert die CSV vollständig."""
+        repo = cls(datenbank)
+        repo.importieren(csv_repo)
+        return repo
+
+    def schliessen(self) -> None:
+        self._verbindung.close()
+
+    def _tabelle_anlegen(self, kopfzeile: List[str]) -> None:
+        rohspalten = ", ".join(f"roh_{i} TEXT" for i in range(len(kopfzeile)))
+        with self._verbindung:
+            self._verbindung.execute("DROP TABLE IF EXISTS zeilen")
+            self._verbindung.execute("DELETE FROM kopfzeile")
+            self._verbindung.executemany("INSERT INTO kopfzeile VALUES (?, ?)", list(enumerate(kopfzeile)))
+            self._verbindung.execute(
+                "CREATE TABLE zeilen ("
+                "id INTEGER PRIMARY KEY, studiengang TEXT, semester_nummer INTEGER, kurs_name TEXT, "
+                f"ects INTEGER, status TEXT NOT NULL, note REAL, {rohspalten})"
+            )
+
+    def _indizes_anlegen(self) -> None:
+        with self._verbindung:
+            self._verbindung.execute("CREATE INDEX idx_zeilen_studiengang ON zeilen (studiengang)")
+            self._verbindung.execute("CREATE INDEX idx_zeilen_status ON zeilen (status, studiengang)")
+            self._verbindung.execute("CREATE INDEX idx_zeilen_semester ON zeilen (semester_nummer)")
+
+    def importieren(self, csv_repo: CsvRepository, batchgroesse: int = 10_000) -> int:
+        """
+        Ersetzt den Tabelleninhalt durch die Zeilen der CSV (executemany, eine Transaktion je Batch).
+        Indizes werden erst nach dem Befüllen angelegt. Liefert die Anzahl importierter Zeilen.
+        """
+        kopfzeile = csv_repo.kopfzeile
+        self._tabelle_anlegen(kopfzeile)
+        self._kopfzeile = None
+        platzhalter = ", ".join("?" * (6 + len(kopfzeile)))
+        sql = f"INSERT INTO zeilen VALUES (NULL, {platzhalter})"
+
+        anzahl = 0
+        batch: List[tuple] = []
+        for z in csv_repo.datenzeilen_iterieren():
+            kurs, pl = zeile_mappen(z)
+            batch.append((
+                z.get("studiengang", ""), kurs.semester_nummer, kurs.name, kurs.ects, kurs.status.value,
+                None if pl is None else pl.note, *(z[name] for name in kopfzeile),
+            ))
+            if len(batch) >= batchgroesse:
+                with self._verbindung:
+                    self._verbindung.executemany(sql, batch)
+                anzahl += len(batch)
+                batch = []
+        if batch:
+            with self._verbindung:
+                self._verbindung.executemany(sql, batch)
+            anzahl += len(batch)
+        self._indizes_anlegen()
+        return anzahl
+
+    @property
+    def kopfzeile(self) -> List[str]:
+        """Normalisierte Kopfzeile der importierten CSV."""
+        if self._kopfzeile is None:
+            kopfzeile = [name for (name,) in self._verbindung.execute("SELECT name FROM kopfzeile ORDER BY position")]
+            if not kopfzeile:
+                raise CsvLesefehler("SQLite-Datenbank enthält keine importierten Daten.")
+            self._kopfzeile = kopfzeile
+        return self._kopfzeile
+
+    @property
+    def spaltenindex(self) -> Dict[str, int]:
+        """Spaltenname -> Index (wie CsvRepository.spaltenindex)."""
+        return {name: i for i, name in enumerate(self.kopfzeile)}
+
+    def datenzeilen_iterieren(self) -> Iterator[Dict[str, str]]:
+        """Liefert die gespeicherten Zeilen als Dict[str, str] in Importreihenfolge."""
+        kopfzeile = self.kopfzeile
+        spalten = ", ".join(f"roh_{i}" for i in range(len(kopfzeile)))
+        for werte in self._verbindung.execute(f"SELECT {spalten} FROM zeilen ORDER BY id"):
+            yield dict(zip(kopfzeile, werte))
+
+    @staticmethod
+    def _filter(studiengang: Optional[str]) -> tuple:
+        return ("", ()) if studiengang is None else (" AND studiengang = ?", (studiengang,))
+
+    def studiengaenge(self) -> List[str]:
+        """Alle vorkommenden Studiengänge (über den Index)."""
+        return [name for (name,) in self._verbindung.execute("SELECT DISTINCT studiengang FROM zeilen ORDER BY studiengang")]
+
+    def belegte_kurse(self, studiengang: Optional[str] = None) -> List[Kurs]:
+        """Kurse mit Status BELEGT (wie Studiengang.getBelegteKurse), in CSV-Reihenfolge."""
+        bedingung, parameter = self._filter(studiengang)
+        zeilen = self._verbindung.execute(
+            f"SELECT kurs_name, ects, semester_nummer FROM zeilen WHERE status = ?{bedingung} ORDER BY id",
+            (KursStatus.BELEGT.value, *parameter),
+        )
+        return [Kurs(name=n, ects=e, status=KursStatus.BELEGT, semester_nummer=s) for n, e, s in zeilen]
+
+    def aggregat(self, studiengang: Optional[str] = None) -> KennzahlenAggregat:
+        """
+        Kennzahlen-Aggregat per SQL (SUM/COUNT statt Python-Schleifen); die Formeln für
+        Durchschnitt und ECTS-Prozent liefert wie gewohnt Studiengang über das Aggregat.
+        """
+        bedingung, parameter = self._filter(studiengang)
+        zeilen, notensumme, notenanzahl, ects = self._verbindung.execute(
+            "SELECT COUNT(*), COALESCE(SUM(note), 0.0), COUNT(note), "
+            "COALESCE(SUM(CASE WHEN status = ? THEN ects END), 0) "
+            f"FROM zeilen WHERE 1 = 1{bedingung}",
+            (KursStatus.ABGESCHLOSSEN.value, *parameter),
+        ).fetchone()
+        belegte_kurse = self.belegte_kurse(studiengang)
+        return KennzahlenAggregat(
+            notenteile=[float(notensumme)],
+            notenanzahl=notenanzahl,
+            ects_abgeschlossen=ects,
+            belegte_kurse=belegte_kurse,
+            zeilen=zeilen,
+            anzahl_belegt=len(belegte_kurse),
+        )
@@ -0,0 +1,146 @@
+# Verantwortung: Notenverteilungen (Histogramm, Median, Perzentile) gesamt, je Studiengang und je Kurs.
+# Feste 0,1er-Klassen über die deutsche Notenskala 1,0–5,0: Speicher hängt nur von der Anzahl
+# Studiengänge/Kurse ab, nicht von der Zeilenzahl; Teilergebnisse lassen sich zusammenführen.
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import math
+
+from klassen import _teilsumme_addieren
+
+NOTE_MIN = 1.0
+NOTE_MAX = 5.0
+KLASSENBREITE = 0.1
+ANZAHL_KLASSEN = round((NOTE_MAX - NOTE_MIN) / KLASSENBREITE) + 1  # 41 Klassen: 1.0, 1.1, …, 5.0
+
+def _klassenmitte(index: int) -> float:
+    return round(NOTE_MIN + index * KLASSENBREITE, 1)
+
+class Notenhistogramm:
+    """
+    Zählt Noten in festen 0,1er-Klassen (Noten der Skala fallen exakt auf eine Klasse, andere
+    werden auf die nächste Klasse gerundet). Werte außerhalb 1,0–5,0 zählen nur in `ausserhalb`.
+    Quantile sind daher exakt bis auf die Klassenbreite; Summe (als Teilsummen wie KennzahlenAggregat),
+    Minimum und Maximum werden exakt geführt.
+    """
+    __slots__ = ("zaehler", "anzahl", "notenteile", "minimum", "maximum", "ausserhalb")
+
+    def __init__(self) -> None:
+        self.zaehler = array("q", bytes(8 * ANZAHL_KLASSEN))
+        self.anzahl = 0
+        self.notenteile: List[float] = []
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.ausserhalb = 0
+
+    def hinzufuegen(self, note: float) -> None:
+        if not NOTE_MIN <= note <= NOTE_MAX:
+            self.ausserhalb += 1
+            return
+        self.zaehler[round((note - NOTE_MIN) / KLASSENBREITE)] += 1
+        self.anzahl += 1
+        _teilsumme_addieren(self.notenteile, note)
+        if self.minimum is None or note < self.minimum:
+            self.minimum = note
+        if self.maximum is None or note > self.maximum:
+            self.maximum = note
+
+    def zusammenfuehren(self, anderes: "Notenhistogramm") -> None:
+        """Addiert ein Teilergebnis (z. B. aus einer anderen Datei); Reihenfolge egal."""
+        zaehler = self.zaehler
+        for i, n in enumerate(anderes.zaehler):
+            if n:
+                zaehler[i] += n
+        self.anzahl += anderes.anzahl
+        for teil in anderes.notenteile:
+            _teilsumme_addieren(self.notenteile, teil)
+        self.ausserhalb += anderes.ausserhalb
+        if anderes.minimum is not None and (self.minimum is None or anderes.minimum < self.minimum):
+            self.minimum = anderes.minimum
+        if anderes.maximum is not None and (self.maximum is None or anderes.maximum > self.maximum):
+            self.maximum = anderes.maximum
+
+    @property
+    def summe(self) -> float:
+        """Korrekt gerundete Summe aller Noten im Bereich 1,0–5,0."""
+        return math.fsum(self.notenteile)
+
+    def mittelwert(self) -> Optional[float]:
+        return round(self.summe / self.anzahl, 2) if self.anzahl else None
+
+    def quantil(self, q: float) -> Optional[float]:
+        """Kleinste Klasse, bis zu der mindestens der Anteil q (0..1) aller Noten liegt (Nearest-Rank)."""
+        if not self.anzahl:
+            return None
+        rang = max(1, math.ceil(q * self.anzahl))
+        kumuliert = 0
+        for i, n in enumerate(self.zaehler):
+            kumuliert += n
+            if kumuliert >= rang:
+                return _klassenmitte(i)
+        return _klassenmitte(ANZAHL_KLASSEN - 1)
+
+    def median(self) -> Optional[float]:
+        return self.quantil(0.5)
+
+    def perzentile(self, prozente: Sequence[int] = (10, 25, 50, 75, 90)) -> Dict[int, Optional[float]]:
+        return {p: self.quantil(p / 100.0) for p in prozente}
+
+    def klassen(self) -> List[Tuple[float, int]]:
+        """Belegte Klassen als (Note, Anzahl), aufsteigend."""
+        return [(_klassenmitte(i), n) for i, n in enumerate(self.zaehler) if n]
+
+@dataclass
+class VerteilungsZeile:
+    """Eine Zeile der Übersichtstabelle (je Studiengang oder Kurs)."""
+    studiengang: str
+    kurs_name: Optional[str]
+    anzahl: int
+    mittelwert: Optional[float]
+    median: Optional[float]
+    p10: Optional[float]
+    p90: Optional[float]
+    minimum: Optional[float]
+    maximum: Optional[float]
+
+def _zeile(studiengang: str, kurs_name: Optional[str], h: Notenhistogramm) -> VerteilungsZeile:
+    return VerteilungsZeile(studiengang, kurs_name, h.anzahl, h.mittelwert(), h.median(),
+                            h.quantil(0.1), h.quantil(0.9), h.minimum, h.maximum)
+
+@dataclass
+class Notenstatistik:
+    """Histogramme gesamt, je Studiengang und je (Studiengang, Kursname); zusammenführbar."""
+    gesamt: Notenhistogramm = field(default_factory=Notenhistogramm)
+    je_studiengang: Dict[str, Notenhistogramm] = field(default_factory=dict)
+    je_kurs: Dict[Tuple[str, str], Notenhistogramm] = field(default_factory=dict)
+
+    def hinzufuegen(self, studiengang: str, kurs_name: str, note: float) -> None:
+        self.gesamt.hinzufuegen(note)
+        h = self.je_studiengang.get(studiengang)
+        if h is None:
+            h = self.je_studiengang[studiengang] = Notenhistogramm()
+        h.hinzufuegen(note)
+        schluessel = (studiengang, kurs_name)
+        h = self.je_kurs.get(schluessel)
+        if h is None:
+            h = self.je_kurs[schluessel] = Notenhistogramm()
+        h.hinzufuegen(note)
+
+    def zusammenfuehren(self, andere: "Notenstatistik") -> None:
+        """Führt die Statistik einer weiteren Datei/eines weiteren Bereichs hinzu."""
+        self.gesamt.zusammenfuehren(andere.gesamt)
+        for ziel, quelle in ((self.je_studiengang, andere.je_studiengang), (self.je_kurs, andere.je_kurs)):
+            for schluessel, h in quelle.items():
+                vorhanden = ziel.get(schluessel)
+                if vorhanden is None:
+                    vorhanden = ziel[schluessel] = Notenhistogramm()
+                vorhanden.zusammenfuehren(h)
+
+    def studiengaenge(self) -> List[VerteilungsZeile]:
+        return [_zeile(sg, None, h) for sg, h in sorted(self.je_studiengang.items())]
+
+    def kurse(self, studiengang: Optional[str] = None) -> List[VerteilungsZeile]:
+        """Übersicht je Kurs (optional nur eines Studiengangs), sortiert nach Studiengang und Kursname."""
+        return [_zeile(sg, kurs, h) for (sg, kurs), h in sorted(self.je_kurs.items())
+                if studiengang is None or sg == studiengang]
@@ -0,0 +1,12 @@
+# Fixtures für die Tests; die Testdaten selbst liegen in testdaten.py.
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from testdaten import RANDFAELLE, csv_schreiben
+
+@pytest.fixture
+def randfaelle_csv(tmp_path: Path) -> Path:
+    """Alle Randfälle, 40-mal wiederholt (damit kleine Blöcke/Bereiche mitten in Randfälle fallen)."""
+    return csv_schreiben(tmp_path / "randfaelle.csv", RANDFAELLE * 40)
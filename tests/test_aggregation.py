@@ -0,0 +1,114 @@
+# Aggregation: parallele Byte-Bereiche müssen exakt das serielle Ergebnis liefern.
+from __future__ import annotations
+import math
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from aggregation import (
+    InkrementelleAggregation, KennzahlenAggregat, _teilsumme_addieren, aggregiere_gruppiert, aggregiere_parallel, aggregiere_zeilen, gruppiert_auswerten,
+)
+from csv_daten import CsvLesefehler, CsvRepository
+from datengenerator import erzeuge_csv
+from klassen import Studiengang
+from testdaten import KOPFZEILE, csv_schreiben
+
+def _vergleichbar(aggregat: KennzahlenAggregat) -> tuple:
+    return (aggregat.notensumme, aggregat.notenanzahl, aggregat.ects_abgeschlossen, aggregat.belegte_kurse, aggregat.zeilen)
+
+def test_teilsummen_sind_reihenfolgeunabhaengig():
+    noten = [0.1, 1e16, 2.3, -1e16, 1.7] * 50
+    teile: list = []
+    for n in noten:
+        _teilsumme_addieren(teile, n)
+    rueckwaerts: list = []
+    for n in reversed(noten):
+        _teilsumme_addieren(rueckwaerts, n)
+    assert math.fsum(teile) == math.fsum(rueckwaerts) == math.fsum(noten)
+
+def test_zusammenfuehren_ist_exakt():
+    noten = [1.3, 2.7, 0.1, 3.3] * 250
+    gesamt, links, rechts = KennzahlenAggregat(), KennzahlenAggregat(), KennzahlenAggregat()
+    for n in noten:
+        _teilsumme_addieren(gesamt.notenteile, n)
+    for n in noten[:333]:
+        _teilsumme_addieren(links.notenteile, n)
+    for n in noten[333:]:
+        _teilsumme_addieren(rechts.notenteile, n)
+    links.zusammenfuehren(rechts)
+    assert links.notensumme == gesamt.notensumme == math.fsum(noten)
+
+def test_parallel_wie_seriell_auf_randfaellen(randfaelle_csv: Path):
+    repo = CsvRepository(randfaelle_csv)
+    seriell = aggregiere_zeilen(repo.datenzeilen_iterieren())
+    assert seriell.zeilen == 13 * 40
+    assert _vergleichbar(aggregiere_parallel(repo, worker=2, bereiche_pro_worker=8)) == _vergleichbar(seriell)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parallel_wie_seriell_auf_generierten_daten(tmp_path: Path, seed: int):
+    repo = CsvRepository(erzeuge_csv(tmp_path / "daten.csv", 20_000, seed=seed))
+    seriell = aggregiere_zeilen(repo.datenzeilen_iterieren())
+    assert _vergleichbar(aggregiere_parallel(repo, worker=3)) == _vergleichbar(seriell)
+
+def test_byte_bereiche_decken_datei_ab(randfaelle_csv: Path):
+    repo = CsvRepository(randfaelle_csv)
+    zeilen = [z for a, b in repo.byte_bereiche(16) for z in repo.bereich_zeilen_iterieren(a, b)]
+    assert zeilen == list(repo.datenzeilen_iterieren())
+
+def test_gruppiert_wie_gefilterte_serielle_aggregation(tmp_path: Path):
+    repo = CsvRepository(csv_schreiben(
+        tmp_path / "kohorte.csv",
+        [f"SG {'AB'[i % 2]};{i % 6 + 1};Kurs {i};5;{'BELEGT' if i % 5 == 0 else 'ABGESCHLOSSEN'};{1 + (i % 30) / 10};S{i % 7}"
+         for i in range(700)],
+        kopfzeile=KOPFZEILE + ";matrikel",
+    ))
+    gruppen = aggregiere_gruppiert(repo, "matrikel")
+    assert len(gruppen) == 14
+    for (studiengang, student), aggregat in gruppen.items():
+        referenz = aggregiere_zeilen(
+            z for z in repo.datenzeilen_iterieren() if z["studiengang"] == studiengang and z["matrikel"] == student
+        )
+        assert _vergleichbar(aggregat) == _vergleichbar(referenz)
+
+    vorlage = Studiengang("Vorlage", 36, date(2024, 10, 1), 180)
+    tabelle = gruppiert_auswerten(repo, vorlage)
+    assert [(g.studiengang, g.student, g.zeilen) for g in tabelle] == [("SG A", None, 350), ("SG B", None, 350)]
+    referenz = aggregiere_zeilen(z for z in repo.datenzeilen_iterieren() if z["studiengang"] == "SG A")
+    assert tabelle[0].durchschnitt == referenz.durchschnitt(vorlage)
+    assert tabelle[0].ects_prozent == referenz.ects_prozent(vorlage)
+    assert tabelle[0].anzahl_belegt == len(referenz.belegte_kurse)
+
+def test_gruppiert_mit_unbekannter_student_spalte(randfaelle_csv: Path):
+    with pytest.raises(CsvLesefehler):
+        aggregiere_gruppiert(CsvRepository(randfaelle_csv), "matrikel")
+
+def _anhaengen(pfad: Path, text: str) -> None:
+    with pfad.open("a", encoding="utf-8", newline="") as f:
+        f.write(text)
+
+def test_inkrementell_wie_neuaufbau_bei_anhang(tmp_path: Path):
+    pfad = erzeuge_csv(tmp_path / "daten.csv", 3_000, seed=1)
+    inkrementell = InkrementelleAggregation(CsvRepository(pfad))
+    inkrementell.aktualisieren()
+    _anhaengen(pfad, "SG X;2;Neu;5;ABGESCHLOSSEN;1.3\nSG X;3;Halb")
+    zwischenstand = inkrementell.aktualisieren()
+    _anhaengen(pfad, "fertig;5;BELEGT;\n")
+    ergebnis = inkrementell.aktualisieren()
+    assert inkrementell.vollstaendige_neuaufbauten == 1
+    assert zwischenstand.zeilen == ergebnis.zeilen
+    assert _vergleichbar(ergebnis) == _vergleichbar(aggregiere_zeilen(CsvRepository(pfad).datenzeilen_iterieren()))
+
+def test_inkrementell_erkennt_umschreibung_in_der_mitte(tmp_path: Path):
+    zeilen = [f"SG A;1;Kurs {i};5;ABGESCHLOSSEN;2.0" for i in range(20_000)]
+    pfad = csv_schreiben(tmp_path / "daten.csv", zeilen)
+    inkrementell = InkrementelleAggregation(CsvRepository(pfad))
+    inkrementell.aktualisieren()
+    # Gleiche Länge, anderer Inhalt mitten in der Datei (weit außerhalb von Anfang/Ende), dann ein Anhang.
+    zeilen[10_000] = "SG A;1;Kurs 10000;5;BELEGT       ;2.0"
+    assert pfad.stat().st_size == csv_schreiben(tmp_path / "gleich_lang.csv", zeilen).stat().st_size
+    csv_schreiben(pfad, zeilen)
+    _anhaengen(pfad, "SG A;1;Neu;5;ABGESCHLOSSEN;1.0\n")
+    ergebnis = inkrementell.aktualisieren()
+    assert inkrementell.vollstaendige_neuaufbauten == 2
+    assert _vergleichbar(ergebnis) == _vergleichbar(aggregiere_zeilen(CsvRepository(pfad).datenzeilen_iterieren()))
@@ -0,0 +1,99 @@
+# Pipeline und prozessweiter Memo-Speicher.
+from __future__ import annotations
+from datetime import date
+from pathlib import Path
+
+from berechnung import KennzahlenSpeicher, StudiengangParameter, berechne_kennzahlen
+
+def test_speicher_rechnet_je_tag_nicht_neu(randfaelle_csv: Path):
+    speicher, parameter = KennzahlenSpeicher(), StudiengangParameter()
+    montag = speicher.holen(randfaelle_csv, parameter, heute=date(2025, 1, 6))
+    dienstag = speicher.holen(randfaelle_csv, parameter, heute=date(2025, 1, 7))
+    assert (speicher.berechnungen, speicher.treffer, len(speicher)) == (1, 1, 1)
+    assert dienstag.verbleibende_tage == montag.verbleibende_tage - 1
+    assert dienstag.durchschnitt == montag.durchschnitt
+    referenz = berechne_kennzahlen(randfaelle_csv, parameter, heute=date(2025, 1, 7), zwischenspeichern=False)
+    assert dienstag.verbleibende_tage == referenz.verbleibende_tage
+
+def test_speicher_ist_begrenzt(randfaelle_csv: Path):
+    speicher = KennzahlenSpeicher(max_eintraege=3)
+    for ects in range(100, 110):
+        speicher.holen(randfaelle_csv, StudiengangParameter(maximale_ects=ects))
+    assert len(speicher) == 3
+    speicher.holen(randfaelle_csv, StudiengangParameter(maximale_ects=109))
+    assert speicher.treffer == 1
+
+def test_speicher_rechnet_nach_aenderung_neu(tmp_path: Path):
+    pfad = tmp_path / "daten.csv"
+    pfad.write_text("studiengang;semester_nummer;kurs_name;ects;status;note\nSG;1;A;5;ABGESCHLOSSEN;2.0\n", encoding="utf-8")
+    speicher = KennzahlenSpeicher()
+    assert speicher.holen(pfad, StudiengangParameter()).ects_abgeschlossen == 5
+    pfad.write_text(pfad.read_text(encoding="utf-8") + "SG;1;B;10;ABGESCHLOSSEN;1.0\n", encoding="utf-8")
+    assert speicher.holen(pfad, StudiengangParameter()).ects_abgeschlossen == 15
+
+def test_parameter_aus_args_behaelt_explizite_null():
+    import argparse
+    leer = argparse.Namespace(name=None, regelzeit_monate=None, studienende=None, maximale_ects=None)
+    assert StudiengangParameter.aus_args(leer) == StudiengangParameter()
+    null = argparse.Namespace(name="", regelzeit_monate=0, studienende="2030-09-30", maximale_ects=0)
+    parameter = StudiengangParameter.aus_args(null)
+    assert (parameter.name, parameter.regelzeit_monate, parameter.maximale_ects) == ("", 0, 0)
+    assert parameter.studienende == date(2030, 9, 30)
+
+def test_bericht_nutzt_dieselben_kennzahlen_wie_die_pipeline(randfaelle_csv: Path):
+    import vorlagen
+    from berichte import bericht_erzeugen
+    from csv_daten import CsvRepository
+    parameter, heute = StudiengangParameter(), date(2025, 1, 6)
+    referenz = berechne_kennzahlen(randfaelle_csv, parameter, heute=heute, zwischenspeichern=False)
+    html = bericht_erzeugen("s1", list(CsvRepository(randfaelle_csv).datenzeilen_iterieren()), parameter, heute)
+    kacheln = vorlagen.kennzahl_kacheln(referenz.durchschnitt, referenz.ects_prozent, referenz.ects_abgeschlossen,
+                                        referenz.studiengang.maximaleEcts, referenz.verbleibende_tage)
+    assert all(kachel in html for kachel in kacheln.values())
+    assert vorlagen.kurstabelle(referenz.belegte_kurse) in html
+    assert "<th>Semester</th>" in html
+
+def test_kurstabelle_wie_im_dashboard():
+    import vorlagen
+    from klassen import Kurs, KursStatus
+    kurse = [Kurs("A & B", 5, KursStatus.BELEGT, 2), Kurs("C", None, KursStatus.BELEGT, None)]
+    assert vorlagen.kurszeilen(kurse) == [
+        {"Aktuell belegte Kurse": "A & B", "ECTS": 5, "Semester": 2},
+        {"Aktuell belegte Kurse": "C", "ECTS": "", "Semester": ""},
+    ]
+    assert vorlagen.kurstabelle(kurse) == (
+        "<table><thead><tr><th>Aktuell belegte Kurse</th><th>ECTS</th><th>Semester</th></tr></thead>"
+        "<tbody><tr><td>A &amp; B</td><td>5</td><td>2</td></tr><tr><td>C</td><td></td><td></td></tr></tbody></table>"
+    )
+    assert vorlagen.kurstabelle([]) == f"<p>{vorlagen.KEINE_BELEGTEN_KURSE}</p>"
+
+def test_semesterkurse_aus_der_quelle(randfaelle_csv: Path):
+    from mapping import zeilen_zu_domaene
+    from csv_daten import CsvRepository
+    speicher = KennzahlenSpeicher()
+    kennzahlen = speicher.holen(randfaelle_csv, StudiengangParameter(), heute=date(2025, 1, 6))
+    kurse, _ = zeilen_zu_domaene(CsvRepository(randfaelle_csv).datenzeilen_iterieren())
+    for v in kennzahlen.snapshot.semester.verlauf():
+        assert kennzahlen.semesterkurse(v.nummer) == [k for k in kurse if k.semester_nummer == v.nummer]
+    # Kopien aus dem Memo-Speicher teilen die einmal gebauten Sichten.
+    kopie = speicher.holen(randfaelle_csv, StudiengangParameter(), heute=date(2025, 1, 7))
+    assert kopie.kursindex() is kennzahlen.kursindex()
+    assert kopie._sichten["semester"] is kennzahlen._sichten["semester"]
+
+def test_speicher_behaelt_kein_ergebnis_bei_aenderung_waehrend_berechnung(tmp_path: Path, monkeypatch):
+    import berechnung
+    pfad = tmp_path / "daten.csv"
+    pfad.write_text("studiengang;semester_nummer;kurs_name;ects;status;note\nSG;1;A;5;ABGESCHLOSSEN;2.0\n", encoding="utf-8")
+    original = berechnung.berechne_kennzahlen
+    def mit_aenderung(*args, **kwargs):
+        kennzahlen = original(*args, **kwargs)
+        with pfad.open("a", encoding="utf-8") as f:
+            f.write("SG;1;B;10;ABGESCHLOSSEN;1.0\n")
+        return kennzahlen
+    monkeypatch.setattr(berechnung, "berechne_kennzahlen", mit_aenderung)
+    speicher = KennzahlenSpeicher()
+    assert speicher.holen(pfad, StudiengangParameter()).ects_abgeschlossen == 5
+    assert len(speicher) == 0
+    monkeypatch.setattr(berechnung, "berechne_kennzahlen", original)
+    assert speicher.holen(pfad, StudiengangParameter()).ects_abgeschlossen == 15
+    assert len(speicher) == 1
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+import messung
+from csv_daten import CsvLesefehler, CsvRepository
+from klassen import KursStatus
+from mapping import status_ist, zeile_zu_kurs
+from testdaten import RANDFAELLE, csv_schreiben, zeilen_als_listen
+
+def _bloecke_als_zeilen(repo: CsvRepository, blockgroesse: int):
+    zeilen = []
+    for block in repo.datenbloecke_iterieren(blockgroesse):
+        zeilen.extend(map(list, zip(*(block[name] for name in repo.kopfzeile))))
+    return zeilen
+
+@pytest.mark.parametrize("blockgroesse", [1, 64, 4096, 1 << 20])
+def test_datenbloecke_wie_datenzeilen(randfaelle_csv: Path, blockgroesse: int) -> None:
+    repo = CsvRepository(randfaelle_csv)
+    assert _bloecke_als_zeilen(repo, blockgroesse) == zeilen_als_listen(repo)
+
+def test_quote_mitten_im_feld_ist_kein_feldbeginn(tmp_path: Path) -> None:
+    # Paritätszählung hielte nach O"Brien ein Feld für offen und würde Sätze verschmelzen.
+    pfad = csv_schreiben(tmp_path / "quotes.csv", ['SG;1;O"Brien;5;BELEGT;'] + ["SG;2;Normal;5;ABGESCHLOSSEN;2.0"] * 999)
+    repo = CsvRepository(pfad)
+    assert len(_bloecke_als_zeilen(repo, 100)) == 1000
+    assert _bloecke_als_zeilen(repo, 100) == zeilen_als_listen(repo)
+
+@pytest.mark.parametrize("kodierung", ["utf-8", "utf-8-sig"])
+def test_datenbloecke_mit_und_ohne_bom(tmp_path: Path, kodierung: str) -> None:
+    pfad = csv_schreiben(tmp_path / "bom.csv", RANDFAELLE, kodierung=kodierung)
+    repo = CsvRepository(pfad)
+    assert repo.ist_byte_adressierbar()
+    assert _bloecke_als_zeilen(repo, 32) == zeilen_als_listen(repo)
+
+def test_datenbloecke_fallback_fuer_nicht_ascii_kodierung(tmp_path: Path) -> None:
+    pfad = csv_schreiben(tmp_path / "utf16.csv", RANDFAELLE, kodierung="utf-16")
+    repo = CsvRepository(pfad, kodierung="utf-16")
+    assert not repo.ist_byte_adressierbar()
+    assert _bloecke_als_zeilen(repo, 64) == zeilen_als_listen(repo)
+
+def test_datenbloecke_zaehlt_wie_zeilenweg(randfaelle_csv: Path) -> None:
+    zaehler = {}
+    for lesen in (lambda r: list(r.datenzeilen_iterieren()), lambda r: list(r.datenbloecke_iterieren(256))):
+        messung.aktivieren()
+        messung.zuruecksetzen()
+        try:
+            lesen(CsvRepository(randfaelle_csv))
+            zaehler[len(zaehler)] = messung.bericht()["zaehler"]
+        finally:
+            messung.deaktivieren()
+            messung.zuruecksetzen()
+    assert zaehler[0] == zaehler[1]
+    assert zaehler[0]["csv.zeilen_leer_uebersprungen"] == 4 * 40
+
+def test_projektion_wie_standardweg(randfaelle_csv: Path) -> None:
+    # Auch Zeilen, die erst nach str.strip() leer sind (NBSP), zählen in beiden Wegen als Leerzeilen.
+    repo = CsvRepository(randfaelle_csv)
+    spalten = ["kurs_name", "note"]
+    erwartet = [{name: z[name] for name in spalten} for z in repo.datenzeilen_iterieren()]
+    assert list(repo.datenzeilen_iterieren(spalten=spalten)) == erwartet
+    assert list(repo.datenzeilen_iterieren(spalten=repo.kopfzeile, filter={"note": lambda _: True})) == \
+        list(repo.datenzeilen_iterieren())
+
+def test_filter_auf_status_wie_standardweg(randfaelle_csv: Path) -> None:
+    repo = CsvRepository(randfaelle_csv)
+    spalten = ["kurs_name", "ects", "status", "semester_nummer"]
+    gefiltert = repo.datenzeilen_iterieren(spalten=spalten, filter={"status": status_ist(KursStatus.BELEGT)})
+    erwartet = [z for z in repo.datenzeilen_iterieren() if zeile_zu_kurs(z).status == KursStatus.BELEGT]
+    assert [zeile_zu_kurs(z) for z in gefiltert] == [zeile_zu_kurs(z) for z in erwartet]
+    assert len(erwartet) == 5 * 40
+
+def test_unbekannte_spalte_in_projektion(randfaelle_csv: Path) -> None:
+    with pytest.raises(CsvLesefehler):
+        list(CsvRepository(randfaelle_csv).datenzeilen_iterieren(spalten=["matrikel"]))
@@ -0,0 +1,86 @@
+# Spezialisierter Dekodierer: muss Zeile für Zeile dasselbe liefern wie zeile_mappen über datenzeilen_iterieren.
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from aggregation import erzeuge_snapshot, erzeuge_snapshot_dekodiert
+from csv_daten import CsvRepository
+from datengenerator import erzeuge_csv
+from dekodierer import Zeilendekodierer
+from mapping import zeile_mappen
+import messung
+from testdaten import RANDFAELLE, csv_schreiben
+
+# Zusätzlich zu RANDFAELLE: Zellen, bei denen der Schnellpfad (Ziffern, Dezimalmuster, Statustabelle) nicht greift.
+SONDERZELLEN = [
+    "SG E;1;Komma;5;ABGESCHLOSSEN;2,7",
+    'SG E;"2";"Gequotete Zahlen";"10";"ABGESCHLOSSEN";"1,3"',
+    "SG E;3;'Doppelt';'5';' BELEGT ';\"'2.0'\"",
+    "SG E;4;Vorzeichen;+5;ABGESCHLOSSEN;-1.0",
+    "SG E;5;Exponent;5;ABGESCHLOSSEN;1e0",
+    "SG E; 6 ;Zahl mit NBSP; 5;ABGESCHLOSSEN; 1.7 ",
+    "SG E;٣;Arabische Ziffer;٥;ABGESCHLOSSEN;٢.٥",
+    "SG E;7",
+    "SG E",
+    " ",
+    '"SG E;8;Ein Feld mit Komma;5;ABGESCHLOSSEN;2,3"',
+]
+
+def _referenz(repo: CsvRepository) -> list:
+    return [(z.get("studiengang", ""), *zeile_mappen(z)) for z in repo.datenzeilen_iterieren()]
+
+def _dekodiert(repo: CsvRepository) -> list:
+    return list(Zeilendekodierer.fuer(repo).kurse(repo.rohzeilen_iterieren()))
+
+@pytest.mark.parametrize("zeile", RANDFAELLE + SONDERZELLEN)
+def test_randzeile_wie_referenz(tmp_path: Path, zeile: str):
+    repo = CsvRepository(csv_schreiben(tmp_path / "zeile.csv", [zeile]))
+    assert _dekodiert(repo) == _referenz(repo)
+
+def test_kopfzeile_in_anderer_reihenfolge(tmp_path: Path):
+    kopfzeile = "note;status;extra;kurs_name;ects;semester_nummer;studiengang"
+    pfad = csv_schreiben(tmp_path / "umsortiert.csv", ["2,0;BELEGT;x;Kurs;5;1;SG", "1.0", ";;;"], kopfzeile=kopfzeile)
+    repo = CsvRepository(pfad)
+    assert _dekodiert(repo) == _referenz(repo)
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_erzeugte_datei_wie_referenz(tmp_path: Path, seed: int):
+    repo = CsvRepository(erzeuge_csv(tmp_path / "erzeugt.csv", 2_000, seed=seed))
+    assert _dekodiert(repo) == _referenz(repo)
+
+def test_studium_csv_wie_referenz():
+    repo = CsvRepository(Path(__file__).resolve().parent.parent / "studium.csv")
+    assert _dekodiert(repo) == _referenz(repo)
+
+def _gemessen(lauf) -> dict:
+    messung.aktivieren()
+    messung.zuruecksetzen()
+    try:
+        lauf()
+        return messung.bericht()
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+
+def test_messung_zaehlt_wie_referenz(tmp_path: Path):
+    repo = CsvRepository(csv_schreiben(tmp_path / "alle.csv", (RANDFAELLE + SONDERZELLEN) * 3))
+    referenz = _gemessen(lambda: erzeuge_snapshot(repo.datenzeilen_iterieren()))
+    dekodiert = _gemessen(lambda: erzeuge_snapshot_dekodiert(repo))
+    assert dekodiert["zaehler"] == referenz["zaehler"]
+    assert referenz["zaehler"]["csv.zeilen_aufgefuellt"] > 0
+    for name in ("csv.datenzeilen_iterieren", "csv._sauber", "mapping.zeile_mappen", "aggregation.erzeuge_snapshot"):
+        assert dekodiert["stufen"][name]["zeilen"] == referenz["stufen"][name]["zeilen"], name
+
+def test_messung_aendert_das_ergebnis_nicht(randfaelle_csv: Path):
+    repo = CsvRepository(randfaelle_csv)
+    ohne = erzeuge_snapshot_dekodiert(repo)
+    messung.aktivieren()
+    try:
+        mit = erzeuge_snapshot_dekodiert(repo)
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+    assert mit.aggregat == ohne.aggregat
+    assert mit.semester.verlauf() == ohne.semester.verlauf()
+    assert mit.statistik.studiengaenge() == ohne.statistik.studiengaenge()
@@ -0,0 +1,98 @@
+# Kennzahlen-Dienst: Datenstand wie gefilterte serielle Aggregate, HTTP-Fehlerantworten und Cache-Invalidierung.
+from __future__ import annotations
+import asyncio
+import json
+import logging
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from aggregation import aggregiere_zeilen
+from berechnung import fingerabdruck
+from csv_daten import CsvLesefehler, CsvRepository
+from kennzahlen_dienst import KennzahlenDienst, datenstand_laden
+from testdaten import KOPFZEILE, csv_schreiben
+
+def _vergleichbar(aggregat) -> tuple:
+    return (aggregat.notensumme, aggregat.notenanzahl, aggregat.ects_abgeschlossen, aggregat.belegte_kurse, aggregat.zeilen)
+
+def test_datenstand_wie_gefilterte_aggregate(tmp_path: Path):
+    pfad = csv_schreiben(
+        tmp_path / "kohorte.csv",
+        [f"SG {'AB'[i % 2]};{i % 6 + 1};Kurs {i};5;{'BELEGT' if i % 4 == 0 else 'ABGESCHLOSSEN'};{1 + (i % 30) / 10};S{i % 5}"
+         for i in range(500)],
+        kopfzeile=KOPFZEILE + ";matrikel",
+    )
+    stand = datenstand_laden(pfad, "matrikel")
+    zeilen = list(CsvRepository(pfad).datenzeilen_iterieren())
+    assert stand.fingerabdruck == fingerabdruck(pfad)
+    assert _vergleichbar(stand.gesamt) == _vergleichbar(aggregiere_zeilen(zeilen))
+    assert [s for s in stand.gruppen if s[1] is None] == [("SG A", None), ("SG B", None)]
+    assert len(stand.gruppen) == 2 + 10
+    for (studiengang, student), aggregat in stand.gruppen.items():
+        referenz = aggregiere_zeilen(
+            z for z in zeilen if z["studiengang"] == studiengang and student in (None, z["matrikel"])
+        )
+        assert _vergleichbar(aggregat) == _vergleichbar(referenz)
+
+def test_datenstand_ohne_student_spalte(randfaelle_csv: Path):
+    stand = datenstand_laden(randfaelle_csv)
+    assert all(student is None for _, student in stand.gruppen)
+    assert sum(a.zeilen for a in stand.gruppen.values()) == stand.gesamt.zeilen
+
+def test_datenstand_mit_unbekannter_spalte(randfaelle_csv: Path):
+    with pytest.raises(CsvLesefehler):
+        datenstand_laden(randfaelle_csv, "matrikel")
+
+def _anfragen(dienst: KennzahlenDienst, *anfragen: bytes) -> List[bytes]:
+    """Schickt jede Anfrage über eine eigene Verbindung und liefert die rohen Antworten."""
+    async def lauf() -> List[bytes]:
+        server = await dienst.starten(port=0)
+        port = server.sockets[0].getsockname()[1]
+        antworten = []
+        try:
+            for anfrage in anfragen:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(anfrage)
+                await writer.drain()
+                antworten.append(await asyncio.wait_for(reader.read(), 5))
+                writer.close()
+        finally:
+            await dienst.stoppen(server)
+        return antworten
+    return asyncio.run(lauf())
+
+def test_unerwarteter_fehler_liefert_500_und_wird_geloggt(randfaelle_csv: Path, monkeypatch, caplog):
+    dienst = KennzahlenDienst(randfaelle_csv)
+    def kaputt(*args):
+        raise RuntimeError("kaputt")
+    monkeypatch.setattr(dienst, "_kennzahlen", kaputt)
+    with caplog.at_level(logging.ERROR, logger="studium.dienst"):
+        antwort, = _anfragen(dienst, b"GET /kennzahlen HTTP/1.0\r\n\r\n")
+    assert antwort.startswith(b"HTTP/1.1 500 Internal Server Error\r\n")
+    assert json.loads(antwort.split(b"\r\n\r\n", 1)[1]) == {"fehler": "Interner Fehler."}
+    assert any(r.exc_info and r.exc_info[0] is RuntimeError for r in caplog.records)
+
+def test_kaputte_anfragen_liefern_400(randfaelle_csv: Path):
+    query, laenge = _anfragen(
+        KennzahlenDienst(randfaelle_csv),
+        b"GET /kennzahlen?studiengang=%FF HTTP/1.0\r\n\r\n",
+        b"GET /kennzahlen HTTP/1.1\r\nContent-Length: abc\r\n\r\n",
+    )
+    assert query.startswith(b"HTTP/1.1 400 ") and "UTF-8".encode() in query
+    assert laenge.startswith(b"HTTP/1.1 400 ") and b"Connection: close" in laenge
+
+def test_ergebnis_nach_aenderung_waehrend_berechnung_nicht_gespeichert(randfaelle_csv: Path, monkeypatch):
+    dienst = KennzahlenDienst(randfaelle_csv)
+    original = dienst._kennzahlen
+    def mit_aenderung(*args):
+        with randfaelle_csv.open("a", encoding="utf-8") as f:
+            f.write("SG;1;Neu;5;ABGESCHLOSSEN;1.0\n")
+        return original(*args)
+    monkeypatch.setattr(dienst, "_kennzahlen", mit_aenderung)
+    asyncio.run(dienst.ergebnis("/kennzahlen"))
+    assert len(dienst.cache) == 0
+    monkeypatch.setattr(dienst, "_kennzahlen", original)
+    asyncio.run(dienst.ergebnis("/kennzahlen"))
+    assert len(dienst.cache) == 1
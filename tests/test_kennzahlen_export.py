@@ -0,0 +1,58 @@
+# Headless-Export: JSON/CSV nach stdout, Fehler je Datei nach stderr und Exit-Code 1.
+from __future__ import annotations
+import csv
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+import kennzahlen_export
+from testdaten import csv_schreiben
+
+@pytest.fixture
+def dateien(tmp_path: Path) -> list:
+    erste = csv_schreiben(tmp_path / "erste.csv", [
+        "Informatik;1;Mathe;5;ABGESCHLOSSEN;2,0",
+        "Informatik;1;Programmierung;10;ABGESCHLOSSEN;1.0",
+        "Informatik;2;Datenbanken;5;BELEGT;",
+    ])
+    zweite = csv_schreiben(tmp_path / "zweite.csv", ["Physik;1;Mechanik;8;ABGESCHLOSSEN;3.0"])
+    return [str(erste), str(zweite)]
+
+def _export(capsys, *argv: str):
+    code = kennzahlen_export.main([*argv, "--ohne-cache", "--maximale-ects", "100"])
+    ausgabe = capsys.readouterr()
+    return code, ausgabe.out, ausgabe.err
+
+def test_json_mehrere_dateien(capsys, dateien):
+    code, out, err = _export(capsys, *dateien)
+    assert (code, err) == (0, "")
+    erste, zweite = json.loads(out)
+    assert [erste["datei"], zweite["datei"]] == dateien
+    assert erste["ects_abgeschlossen"] == 15 and erste["ects_prozent"] == 15.0
+    assert erste["maximale_ects"] == 100
+    assert erste["belegte_kurse"] == [{"name": "Datenbanken", "ects": 5}]
+    assert zweite["durchschnitt"] == 3.0 and zweite["belegte_kurse"] == []
+
+def test_csv_ausgabe(capsys, dateien):
+    code, out, _ = _export(capsys, *dateien, "--format", "csv")
+    assert code == 0
+    kopf, erste, zweite = list(csv.reader(io.StringIO(out), delimiter=";"))
+    assert kopf[0] == "datei" and kopf[-1] == "belegte_kurse"
+    zeile = dict(zip(kopf, erste))
+    assert zeile["datei"] == dateien[0]
+    assert (zeile["ects_abgeschlossen"], zeile["belegte_kurse"]) == ("15", "Datenbanken")
+    assert dict(zip(kopf, zweite))["belegte_kurse"] == ""
+
+def test_fehlende_datei_meldet_fehler_und_exportiert_den_rest(capsys, dateien, tmp_path: Path):
+    fehlt = str(tmp_path / "fehlt.csv")
+    code, out, err = _export(capsys, fehlt, dateien[1])
+    assert code == 1
+    assert err.startswith(f"{fehlt}: ") and "nicht gefunden" in err
+    assert [e["datei"] for e in json.loads(out)] == [dateien[1]]
+
+def test_nur_fehlende_dateien(capsys, tmp_path: Path):
+    code, out, err = _export(capsys, str(tmp_path / "a.csv"), "--format", "csv")
+    assert code == 1 and err
+    assert len(out.splitlines()) == 1 and out.startswith("datei;")  # nur Kopfzeile
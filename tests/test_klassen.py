@@ -0,0 +1,111 @@
+# Domäne: Listen- und Tabellenpfad der Studiengang-Kennzahlen liefern dieselben Werte.
+from __future__ import annotations
+from datetime import date
+import math
+import pickle
+from pathlib import Path
+
+import pytest
+
+import messung
+from csv_daten import CsvRepository
+from datengenerator import erzeuge_csv
+from klassen import Kurs, KursStatus, KursTabelle, Pruefungsleistung, SemesterIndex, Studiengang
+from mapping import zeile_mappen, zeilen_zu_domaene, zeilen_zu_tabelle
+
+STUDIENGANG = Studiengang("Softwareentwicklung", 36, date(2023, 9, 30), 180)
+
+def _tabelle_wie_listen(repo: CsvRepository) -> None:
+    kurse, pruefungen = zeilen_zu_domaene(repo.datenzeilen_iterieren())
+    tabelle = zeilen_zu_tabelle(repo.datenzeilen_iterieren())
+    assert len(tabelle) == len(kurse)
+    assert [tabelle.kurs(i) for i in range(len(tabelle))] == kurse
+    assert STUDIENGANG.berechneGesamtdurchschnitt(tabelle) == STUDIENGANG.berechneGesamtdurchschnitt(pruefungen)
+    assert STUDIENGANG.berechneEctsProzent(tabelle) == STUDIENGANG.berechneEctsProzent(kurse)
+    assert STUDIENGANG.getBelegteKurse(tabelle) == STUDIENGANG.getBelegteKurse(kurse)
+
+def test_tabelle_wie_listen_auf_randfaellen(randfaelle_csv: Path):
+    _tabelle_wie_listen(CsvRepository(randfaelle_csv))
+
+def test_tabelle_wie_listen_auf_generierten_daten(tmp_path: Path):
+    _tabelle_wie_listen(CsvRepository(erzeuge_csv(tmp_path / "daten.csv", 5_000, seed=3)))
+
+def test_tabelle_notensumme_exakt_ohne_neuberechnung():
+    tabelle = KursTabelle()
+    noten = [1e16, 1.0, None, -1e16, 0.1] * 3
+    for note in noten:
+        tabelle.anhaengen(Kurs("K", 5, KursStatus.ABGESCHLOSSEN), note)
+    vorhanden = [n for n in noten if n is not None]
+    assert tabelle.notensumme_und_anzahl() == (math.fsum(vorhanden), len(vorhanden))
+    assert sum(vorhanden) != math.fsum(vorhanden)  # naive Summe verliert die kleinen Noten
+
+def test_leere_tabelle():
+    tabelle = KursTabelle()
+    assert STUDIENGANG.berechneGesamtdurchschnitt(tabelle) is None
+    assert STUDIENGANG.berechneEctsProzent(tabelle) == 0.0
+    assert STUDIENGANG.getBelegteKurse(tabelle) == []
+
+@pytest.mark.parametrize("aktiv", [False, True])
+def test_kennzahlen_aus_generatoren(randfaelle_csv: Path, aktiv: bool):
+    kurse, pruefungen = zeilen_zu_domaene(CsvRepository(randfaelle_csv).datenzeilen_iterieren())
+    messung.zuruecksetzen()
+    if aktiv:
+        messung.aktivieren()
+    try:
+        assert STUDIENGANG.berechneGesamtdurchschnitt(p for p in pruefungen) == STUDIENGANG.berechneGesamtdurchschnitt(pruefungen)
+        assert STUDIENGANG.berechneEctsProzent(k for k in kurse) == STUDIENGANG.berechneEctsProzent(kurse)
+        assert STUDIENGANG.getBelegteKurse(k for k in kurse) == STUDIENGANG.getBelegteKurse(kurse)
+        stufen = messung.bericht()["stufen"]
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+    if aktiv:
+        assert stufen["klassen.getBelegteKurse"]["aufrufe"] == 2
+        assert stufen["klassen.getBelegteKurse"]["zeilen"] == len(kurse)
+    else:
+        assert stufen == {}
+
+def test_semesterverlauf_wie_domaenenlisten(tmp_path: Path):
+    repo = CsvRepository(erzeuge_csv(tmp_path / "daten.csv", 20_000, seed=5))
+    index = SemesterIndex()
+    kurse, _ = zeilen_zu_domaene(repo.datenzeilen_iterieren(), semesterindex=index)
+    noten = [pl for _, pl in map(zeile_mappen, repo.datenzeilen_iterieren())]
+    kumuliert: list = []
+    for v in index.verlauf():
+        zeilen = [i for i, k in enumerate(kurse) if k.semester_nummer == v.nummer]
+        semesternoten = [noten[i].note for i in zeilen if noten[i] is not None]
+        kumuliert += semesternoten
+        assert v.anzahl_kurse == len(zeilen)
+        assert v.ects_abgeschlossen == sum(kurse[i].ects or 0 for i in zeilen if kurse[i].status == KursStatus.ABGESCHLOSSEN)
+        assert v.durchschnitt == STUDIENGANG.berechneDurchschnittAus(math.fsum(semesternoten), len(semesternoten))
+        assert v.kumulierter_durchschnitt == pytest.approx(STUDIENGANG.berechneDurchschnittAus(math.fsum(kumuliert), len(kumuliert)))
+    assert sum(v.anzahl_kurse for v in index.verlauf()) + index.ohne_semester.anzahl_kurse == len(kurse)
+    # Gepickelt (Snapshot-Cache) hält der Index nur Summen je Semester und wächst nicht mit der Zeilenzahl.
+    assert len(pickle.dumps(index)) < 4096
+    geladen = pickle.loads(pickle.dumps(index))
+    assert geladen.verlauf() == index.verlauf() and not geladen.zeilen_verfuegbar
+    with pytest.raises(LookupError):
+        geladen.zeilen(1)
+
+def test_semesterindex_liefert_kurse_je_semester(tmp_path: Path):
+    repo = CsvRepository(erzeuge_csv(tmp_path / "daten.csv", 5_000, seed=7))
+    index, tabellenindex = SemesterIndex(), SemesterIndex()
+    kurse, _ = zeilen_zu_domaene(repo.datenzeilen_iterieren(), semesterindex=index)
+    tabelle = zeilen_zu_tabelle(repo.datenzeilen_iterieren(), semesterindex=tabellenindex)
+    for nummer in index.nummern() + [None]:
+        erwartet = [k for k in kurse if k.semester_nummer == nummer]
+        assert index.kurse(nummer, kurse) == erwartet
+        assert tabellenindex.kurse(nummer, tabelle) == erwartet
+    assert index.kurse(99, kurse) == []
+    # Inkrementell: weitere Zeilen werden hinten angehängt.
+    neu, _ = zeilen_zu_domaene(repo.datenzeilen_iterieren(), semesterindex=index)
+    alle = kurse + neu
+    assert index.kurse(1, alle) == [k for k in alle if k.semester_nummer == 1]
+
+def test_semester_notensumme_ist_exakt():
+    index = SemesterIndex()
+    noten = [1e16, 1.3, -1e16, 2.7] * 10
+    for note in noten:
+        index.hinzufuegen(Kurs("K", 5, KursStatus.ABGESCHLOSSEN, 1), Pruefungsleistung(None, note))
+    assert index.semester(1).notensumme == math.fsum(noten) == 40.0
+    assert index.verlauf()[0].durchschnitt == 1.0
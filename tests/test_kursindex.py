@@ -0,0 +1,73 @@
+# Kurstabelle im Dashboard: Suche, Sortierung und Seitenbegrenzung des KursIndex.
+from __future__ import annotations
+
+import pytest
+
+from klassen import Kurs, KursStatus
+from kursindex import KursIndex, tokens
+
+KURSE = [
+    Kurs("Mathematik Grundlagen", 5, KursStatus.ABGESCHLOSSEN, 1),
+    Kurs("Programmierung mit Python", None, KursStatus.BELEGT, None),
+    Kurs("Mathematik Analysis", 10, KursStatus.BELEGT, 2),
+    Kurs("Datenbanken", 5, KursStatus.BELEGT, None),
+    Kurs("Projekt Mathematik", None, KursStatus.BELEGT, 3),
+    Kurs("Statistik", 8, KursStatus.ABGESCHLOSSEN, 2),
+]
+
+def namen(seite):
+    return [k.name for k in seite.kurse]
+
+def test_tokens_normalisiert():
+    assert tokens("Mathe-Grundlagen  II") == ["mathe", "grundlagen", "ii"]
+
+def test_leere_anfrage_ist_kein_filter():
+    index = KursIndex(KURSE)
+    assert index.suchen("") is None
+    assert index.suchen("  - ") is None
+
+def test_suche_praefix_und_schnittmenge():
+    index = KursIndex(KURSE)
+    assert index.suchen("mat") == {0, 2, 4}
+    assert index.suchen("mat gru") == {0}
+    assert index.suchen("MATHEMATIK analysis") == {2}
+    assert index.suchen("mat xyz") == set()
+
+def test_keine_treffer_liefert_leere_seite():
+    seite = KursIndex(KURSE).seite("xyz", seite=3)
+    assert seite.kurse == [] and seite.treffer == 0
+    assert (seite.seite, seite.seiten) == (0, 1)
+
+def test_sortierung_nach_name_auf_und_absteigend():
+    index = KursIndex(KURSE)
+    auf = namen(index.seite(spalte="Kurs"))
+    assert auf == sorted(auf, key=str.casefold)
+    assert namen(index.seite(spalte="Kurs", absteigend=True)) == auf[::-1]
+
+def test_leere_werte_stehen_in_beiden_richtungen_hinten():
+    index = KursIndex(KURSE)
+    auf = index.seite(spalte="ECTS").kurse
+    ab = index.seite(spalte="ECTS", absteigend=True).kurse
+    assert [k.ects for k in auf] == [5, 5, 8, 10, None, None]
+    assert [k.ects for k in ab] == [10, 8, 5, 5, None, None]
+    assert [k.name for k in auf[-2:]] == [k.name for k in ab[-2:]]
+
+@pytest.mark.parametrize("spalte", ["Kurs", "ECTS", "Semester"])
+@pytest.mark.parametrize("absteigend", [False, True])
+def test_gefiltert_gleiche_reihenfolge_wie_ungefiltert(spalte, absteigend):
+    # Jede Anfrage muss dieselbe Reihenfolge liefern wie die ungefilterte Liste, eingeschränkt auf die Treffer.
+    index = KursIndex(KURSE)
+    alle = namen(index.seite(spalte=spalte, absteigend=absteigend))
+    for anfrage in ("mat", "p", "a"):
+        treffer = {KURSE[i].name for i in index.suchen(anfrage)}
+        erwartet = [n for n in alle if n in treffer]
+        assert namen(index.seite(anfrage, spalte=spalte, absteigend=absteigend)) == erwartet
+
+def test_seite_wird_begrenzt():
+    index = KursIndex(KURSE)
+    letzte = index.seite(groesse=4, seite=99)
+    assert (letzte.seite, letzte.seiten, letzte.treffer) == (1, 2, 6)
+    assert len(letzte.kurse) == 2
+    erste = index.seite(groesse=4, seite=-5)
+    assert erste.seite == 0 and len(erste.kurse) == 4
+    assert namen(erste) + namen(letzte) == namen(index.seite(groesse=25))
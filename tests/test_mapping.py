@@ -0,0 +1,112 @@
+# Mapping: feste (unveränderliche) Varianten und String-Pool verhalten sich wie die Standardobjekte.
+from __future__ import annotations
+import dataclasses
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from csv_daten import CsvRepository
+from klassen import Kurs, Pruefungsleistung, Studiengang, UnveraenderlichePruefungsleistung, UnveraenderlicherKurs
+import messung
+from mapping import Duplikatregel, zeilen_deduplizieren, zeilen_zu_domaene
+
+def _felder(objekt) -> tuple:
+    return dataclasses.astuple(objekt)
+
+def test_feste_varianten_wie_standard(randfaelle_csv: Path):
+    repo = CsvRepository(randfaelle_csv)
+    kurse, pruefungen = zeilen_zu_domaene(repo.datenzeilen_iterieren())
+    feste_kurse, feste_pruefungen = zeilen_zu_domaene(repo.datenzeilen_iterieren(), fest=True)
+    assert all(type(k) is Kurs for k in kurse) and all(type(p) is Pruefungsleistung for p in pruefungen)
+    assert all(type(k) is UnveraenderlicherKurs for k in feste_kurse)
+    assert all(type(p) is UnveraenderlichePruefungsleistung for p in feste_pruefungen)
+    assert list(map(_felder, feste_kurse)) == list(map(_felder, kurse))
+    assert list(map(_felder, feste_pruefungen)) == list(map(_felder, pruefungen))
+
+    studiengang = Studiengang("SG", 36, date(2023, 9, 30), 180)
+    assert studiengang.berechneGesamtdurchschnitt(feste_pruefungen) == studiengang.berechneGesamtdurchschnitt(pruefungen)
+    assert studiengang.berechneEctsProzent(feste_kurse) == studiengang.berechneEctsProzent(kurse)
+
+def test_feste_varianten_sind_hashbar_und_unveraenderlich(randfaelle_csv: Path):
+    feste_kurse, _ = zeilen_zu_domaene(CsvRepository(randfaelle_csv).datenzeilen_iterieren(), fest=True)
+    assert len(set(feste_kurse)) == len({_felder(k) for k in feste_kurse})
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        feste_kurse[0].ects = 99
+    assert not hasattr(feste_kurse[0], "__dict__")
+
+def test_kursnamen_werden_geteilt(randfaelle_csv: Path):
+    kurse, _ = zeilen_zu_domaene(CsvRepository(randfaelle_csv).datenzeilen_iterieren())
+    plain = [k.name for k in kurse if k.name == "Plain"]
+    assert len(plain) == 40 and all(n is plain[0] for n in plain)
+    assert not hasattr(kurse[0], "__dict__")
+
+# Wiederholte Kurse: (studiengang, kurs_name) mehrfach, teils mit Leerzeichen/anderer Reihenfolge der Zustände.
+WIEDERHOLUNGEN = [
+    {"studiengang": "SG", "semester_nummer": "1", "kurs_name": "Mathe", "ects": "5", "status": "ABGESCHLOSSEN", "note": "2.0"},
+    {"studiengang": "SG", "semester_nummer": "1", "kurs_name": "Prog", "ects": "10", "status": "BELEGT", "note": ""},
+    {"studiengang": "SG", "semester_nummer": "2", "kurs_name": " Mathe ", "ects": "5", "status": "ABGESCHLOSSEN", "note": "1.3"},
+    {"studiengang": "SG", "semester_nummer": "", "kurs_name": "", "ects": "", "status": "", "note": ""},
+    {"studiengang": "SG", "semester_nummer": "3", "kurs_name": "Mathe", "ects": "5", "status": "BELEGT", "note": ""},
+    {"studiengang": "SG", "semester_nummer": "2", "kurs_name": "Prog", "ects": "10", "status": "ABGESCHLOSSEN", "note": "3.0"},
+    {"studiengang": "Anderer", "semester_nummer": "1", "kurs_name": "Mathe", "ects": "5", "status": "BELEGT", "note": ""},
+    {"studiengang": "SG", "semester_nummer": "", "kurs_name": "", "ects": "", "status": "", "note": ""},
+]
+
+def _semester(zeilen) -> list:
+    return [(z["studiengang"], z["kurs_name"].strip(), z["semester_nummer"]) for z in zeilen]
+
+@pytest.mark.parametrize("regel, erwartet", [
+    (Duplikatregel.LETZTE_ZEILE, [("SG", "Mathe", "3"), ("SG", "Prog", "2")]),
+    (Duplikatregel.BESTE_NOTE, [("SG", "Mathe", "2"), ("SG", "Prog", "2")]),
+    (Duplikatregel.ABGESCHLOSSEN, [("SG", "Mathe", "2"), ("SG", "Prog", "2")]),
+])
+def test_duplikatregeln(regel: Duplikatregel, erwartet: list):
+    ergebnis = _semester(zeilen_deduplizieren(iter(WIEDERHOLUNGEN), regel))
+    # Reihenfolge des ersten Auftretens; Zeilen ohne Kursnamen und andere Studiengänge bleiben erhalten.
+    assert ergebnis == erwartet + [("SG", "", ""), ("Anderer", "Mathe", "1"), ("SG", "", "")]
+
+def test_beste_note_ohne_note_verliert_und_gleichstand_nimmt_die_spaetere():
+    zeilen = [
+        {"studiengang": "SG", "kurs_name": "K", "note": "", "semester_nummer": "1"},
+        {"studiengang": "SG", "kurs_name": "K", "note": "2.3", "semester_nummer": "2"},
+        {"studiengang": "SG", "kurs_name": "K", "note": "", "semester_nummer": "3"},
+        {"studiengang": "SG", "kurs_name": "K", "note": "2,3", "semester_nummer": "4"},
+    ]
+    (gewaehlt,) = zeilen_deduplizieren(zeilen, Duplikatregel.BESTE_NOTE)
+    assert gewaehlt["semester_nummer"] == "4"
+
+def test_duplikate_werden_gezaehlt():
+    messung.aktivieren()
+    messung.zuruecksetzen()
+    try:
+        list(zeilen_deduplizieren(WIEDERHOLUNGEN))
+        zaehler = messung.bericht()["zaehler"]
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+    assert zaehler["mapping.duplikate"] == 3
+
+def test_domaene_mit_duplikatregel():
+    kurse, pruefungen = zeilen_zu_domaene(WIEDERHOLUNGEN, duplikate=Duplikatregel.ABGESCHLOSSEN)
+    studiengang = Studiengang("SG", 36, date(2023, 9, 30), 20)
+    assert [k.name for k in kurse] == ["Mathe", "Prog", "", "Mathe", ""]
+    assert [p.note for p in pruefungen] == [1.3, 3.0]
+    assert studiengang.berechneEctsProzent(kurse) == 75.0  # 5 + 10 statt 5 + 5 + 10
+    ohne, _ = zeilen_zu_domaene(WIEDERHOLUNGEN)
+    assert studiengang.berechneEctsProzent(ohne) == 100.0
+
+def test_duplikatregel_im_zwischengespeicherten_pfad(tmp_path: Path):
+    from berechnung import StudiengangParameter, berechne_kennzahlen
+    from zwischenspeicher import SnapshotCache
+    pfad = tmp_path / "daten.csv"
+    kopf = ["studiengang", "semester_nummer", "kurs_name", "ects", "status", "note"]
+    pfad.write_text(";".join(kopf) + "\n" + "".join(";".join(z[k] for k in kopf) + "\n" for z in WIEDERHOLUNGEN),
+                    encoding="utf-8")
+    cache, parameter = SnapshotCache(tmp_path / "cache"), StudiengangParameter(maximale_ects=20)
+    for _ in range(2):  # zweiter Lauf: Treffer im Zwischenspeicher, je Regel eine eigene Variante
+        mit = berechne_kennzahlen(pfad, parameter, cache=cache, duplikate=Duplikatregel.BESTE_NOTE)
+        ohne = berechne_kennzahlen(pfad, parameter, cache=cache)
+        assert (mit.ects_abgeschlossen, mit.durchschnitt) == (15, round((1.3 + 3.0) / 2, 2))
+        assert (ohne.ects_abgeschlossen, ohne.durchschnitt) == (20, round((2.0 + 1.3 + 3.0) / 3, 2))
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 2
@@ -0,0 +1,37 @@
+# Instrumentierung: geschachtelte Stufen dürfen die Speicherspitze der äußeren Stufe nicht verlieren.
+from __future__ import annotations
+
+import messung
+
+def test_innere_stufe_ueberschreibt_aeussere_spitze_nicht():
+    messung.aktivieren(speicher=True)
+    messung.zuruecksetzen()
+    try:
+        with messung.stufe("aussen"):
+            gross = [0] * 5_000_000  # ca. 40 MB
+            del gross
+            with messung.stufe("innen"):
+                klein = [0] * 1_000
+                del klein
+        stufen = messung.bericht()["stufen"]
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+    assert stufen["aussen"]["spitze_bytes"] >= 40_000_000
+    assert stufen["innen"]["spitze_bytes"] < 40_000_000
+    assert stufen["aussen"]["spitze_bytes"] >= stufen["innen"]["spitze_bytes"]
+
+def test_spitze_der_inneren_stufe_zaehlt_fuer_die_aeussere():
+    messung.aktivieren(speicher=True)
+    messung.zuruecksetzen()
+    try:
+        with messung.stufe("aussen"):
+            with messung.stufe("innen"):
+                gross = [0] * 5_000_000
+                del gross
+        stufen = messung.bericht()["stufen"]
+    finally:
+        messung.deaktivieren()
+        messung.zuruecksetzen()
+    assert stufen["innen"]["spitze_bytes"] >= 40_000_000
+    assert stufen["aussen"]["spitze_bytes"] >= stufen["innen"]["spitze_bytes"]
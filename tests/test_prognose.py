@@ -0,0 +1,46 @@
+# Notenprognose: feste Annahmen exakt, gruppierte Annahmen wie Einzelannahmen, Rundung wie die Kachel.
+from __future__ import annotations
+from datetime import date
+import statistics
+
+import pytest
+
+from klassen import Kurs, KursStatus, Studiengang
+from prognose import EXAKT_BIS, prognostizieren, verteilung_um
+
+STUDIENGANG = Studiengang("SG", 36, date(2023, 9, 30), 180)
+
+def _belegt(anzahl: int) -> list:
+    return [Kurs(f"Kurs {i}", 5, KursStatus.BELEGT, i % 4 + 1) for i in range(anzahl)]
+
+def test_feste_noten_ergeben_genau_einen_wert():
+    kurse = _belegt(3)
+    ergebnis = prognostizieren(STUDIENGANG, 20.0, 10, kurse, {"Kurs 0": 1.0, "Kurs 1": 3.0}, szenarien=50)
+    assert ergebnis.mittelwert == ergebnis.minimum == ergebnis.maximum == round(24.0 / 12, 2)
+    assert set(ergebnis.perzentile.values()) == {2.0}
+
+def test_ohne_noten_keine_prognose():
+    assert prognostizieren(STUDIENGANG, 0.0, 0, _belegt(2), {}).mittelwert is None
+
+def test_einheitliche_annahme_wie_je_kurs():
+    kurse = _belegt(4)
+    verteilung = verteilung_um(2.0, 0.0)
+    je_kurs = prognostizieren(STUDIENGANG, 5.0, 2, kurse, {k.name: verteilung for k in kurse}, szenarien=100, seed=1)
+    einheitlich = prognostizieren(STUDIENGANG, 5.0, 2, kurse, lambda k: verteilung, szenarien=100, seed=1)
+    assert einheitlich.mittelwert == je_kurs.mittelwert == round((5.0 + 4 * 2.0) / 6, 2)
+
+def test_kohortengroesse_mit_einer_annahme():
+    kurse = _belegt(2_000)
+    ergebnis = prognostizieren(STUDIENGANG, 0.0, 0, kurse, lambda k: verteilung_um(2.3, 0.3), szenarien=200, seed=0)
+    assert ergebnis.mittelwert == round(statistics.fmean(ergebnis.werte), 2)
+    assert ergebnis.mittelwert == pytest.approx(2.3, abs=0.05)
+    assert ergebnis.perzentile[5] <= ergebnis.perzentile[50] <= ergebnis.perzentile[95]
+
+@pytest.mark.parametrize("anzahl", [EXAKT_BIS, EXAKT_BIS + 1, 400])
+def test_gruppensumme_hat_die_momente_der_einzelziehungen(anzahl: int):
+    # Zwei Notenstufen, gleich gewichtet: Mittel 2.5, Varianz 2.25 je Kurs.
+    ergebnis = prognostizieren(STUDIENGANG, 0.0, 0, _belegt(anzahl), lambda k: [(1.0, 1.0), (4.0, 1.0)],
+                               szenarien=20_000, seed=3)
+    assert statistics.fmean(ergebnis.werte) == pytest.approx(2.5, abs=0.02)
+    assert statistics.pstdev(ergebnis.werte) == pytest.approx(1.5 / anzahl ** 0.5, rel=0.05)
+    assert 1.0 <= ergebnis.minimum and ergebnis.maximum <= 4.0
@@ -0,0 +1,47 @@
+# SQLite-Repository: gleiche Zeilen und Kennzahlen wie der serielle CSV-Pfad.
+from __future__ import annotations
+from pathlib import Path
+
+import pytest
+
+from aggregation import aggregiere_gruppiert, aggregiere_zeilen
+from csv_daten import CsvLesefehler, CsvRepository
+from datengenerator import erzeuge_csv
+from sqlite_daten import SqliteRepository
+
+def _aggregate_vergleichen(sql, referenz) -> None:
+    # Ganzzahlige Werte und Kursliste exakt; die Notensumme rechnet SQLite mit eigener Summationsreihenfolge.
+    assert (sql.zeilen, sql.notenanzahl, sql.ects_abgeschlossen) == (referenz.zeilen, referenz.notenanzahl, referenz.ects_abgeschlossen)
+    assert sql.belegte_kurse == referenz.belegte_kurse
+    assert sql.notensumme == pytest.approx(referenz.notensumme, rel=1e-12)
+
+@pytest.mark.parametrize("quelle", ["randfaelle", "generiert"])
+def test_sqlite_wie_csv(randfaelle_csv: Path, tmp_path: Path, quelle: str):
+    pfad = randfaelle_csv if quelle == "randfaelle" else erzeuge_csv(tmp_path / "daten.csv", 5_000, seed=4)
+    csv_repo = CsvRepository(pfad)
+    repo = SqliteRepository.aus_csv(csv_repo)
+    try:
+        assert repo.kopfzeile == csv_repo.kopfzeile
+        assert list(repo.datenzeilen_iterieren()) == list(csv_repo.datenzeilen_iterieren())
+        _aggregate_vergleichen(repo.aggregat(), aggregiere_zeilen(csv_repo.datenzeilen_iterieren()))
+        gruppen = aggregiere_gruppiert(csv_repo)
+        assert repo.studiengaenge() == sorted(name for name, _ in gruppen)
+        for (name, _), referenz in gruppen.items():
+            _aggregate_vergleichen(repo.aggregat(name), referenz)
+    finally:
+        repo.schliessen()
+
+def test_sqlite_datei_bleibt_erhalten(randfaelle_csv: Path, tmp_path: Path):
+    datenbank = tmp_path / "studium.sqlite"
+    SqliteRepository.aus_csv(CsvRepository(randfaelle_csv), datenbank).schliessen()
+    repo = SqliteRepository(datenbank)
+    try:
+        assert repo.aggregat().zeilen == aggregiere_zeilen(CsvRepository(randfaelle_csv).datenzeilen_iterieren()).zeilen
+    finally:
+        repo.schliessen()
+
+def test_leere_datenbank():
+    repo = SqliteRepository()
+    with pytest.raises(CsvLesefehler):
+        repo.kopfzeile
+    repo.schliessen()
@@ -0,0 +1,59 @@
+# Notenstatistik: Klassen, Quantile (Nearest-Rank), exakte Summen und Zusammenführen wie ein Durchlauf.
+from __future__ import annotations
+import math
+import random
+
+from statistik import Notenhistogramm, Notenstatistik
+
+def _histogramm(noten) -> Notenhistogramm:
+    h = Notenhistogramm()
+    for n in noten:
+        h.hinzufuegen(n)
+    return h
+
+def test_klassen_und_ausserhalb():
+    h = _histogramm([1.0, 1.3, 1.3, 2.04, 5.0, 0.7, 6.0])
+    assert h.klassen() == [(1.0, 1), (1.3, 2), (2.0, 1), (5.0, 1)]
+    assert (h.anzahl, h.ausserhalb, h.minimum, h.maximum) == (5, 2, 1.0, 5.0)
+
+def test_quantile_nearest_rank():
+    noten = [1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0]
+    h = _histogramm(noten)
+    assert h.median() == 2.3  # Rang ceil(0.5 * 10) = 5
+    assert h.perzentile((10, 25, 90)) == {10: 1.0, 25: 1.7, 90: 3.7}
+    assert h.quantil(0.0) == 1.0 and h.quantil(1.0) == 4.0
+    assert h.mittelwert() == round(sum(noten) / len(noten), 2)
+
+def test_leeres_histogramm():
+    h = Notenhistogramm()
+    assert (h.median(), h.mittelwert(), h.klassen(), h.summe) == (None, None, [], 0.0)
+    assert h.perzentile((50,)) == {50: None}
+
+def test_summe_ist_exakt():
+    h = _histogramm([1.1] * 1_000 + [2.7] * 1_000)
+    assert h.summe == math.fsum([1.1] * 1_000 + [2.7] * 1_000)
+
+def test_zusammenfuehren_wie_ein_durchlauf():
+    zufall = random.Random(4)
+    noten = [round(zufall.uniform(0.5, 5.5), 1) for _ in range(2_000)]
+    links, rechts, gesamt = _histogramm(noten[:700]), _histogramm(noten[700:]), _histogramm(noten)
+    links.zusammenfuehren(rechts)
+    for attribut in ("zaehler", "anzahl", "summe", "minimum", "maximum", "ausserhalb"):
+        assert getattr(links, attribut) == getattr(gesamt, attribut), attribut
+    assert links.perzentile() == gesamt.perzentile()
+
+def test_statistik_kurse_und_zusammenfuehren():
+    a, b = Notenstatistik(), Notenstatistik()
+    a.hinzufuegen("SG B", "Prog", 2.0)
+    a.hinzufuegen("SG A", "Mathe", 1.0)
+    b.hinzufuegen("SG A", "Mathe", 3.0)
+    b.hinzufuegen("SG A", "Algo", 1.7)
+    a.zusammenfuehren(b)
+    assert [(z.studiengang, z.kurs_name, z.anzahl) for z in a.kurse()] == [
+        ("SG A", "Algo", 1), ("SG A", "Mathe", 2), ("SG B", "Prog", 1)]
+    (mathe,) = [z for z in a.kurse("SG A") if z.kurs_name == "Mathe"]
+    assert (mathe.mittelwert, mathe.median, mathe.minimum, mathe.maximum) == (2.0, 1.0, 1.0, 3.0)
+    assert [z.kurs_name for z in a.kurse("SG B")] == ["Prog"]
+    assert a.kurse("Unbekannt") == []
+    assert [(z.studiengang, z.anzahl) for z in a.studiengaenge()] == [("SG A", 3), ("SG B", 1)]
+    assert a.gesamt.anzahl == 4
@@ -0,0 +1,53 @@
+# Exportvergleich: Partitionierung auf der Platte muss dasselbe liefern wie der In-Memory-Index.
+from __future__ import annotations
+import math
+from pathlib import Path
+
+from aggregation import gruppiert_auswerten
+from csv_daten import CsvRepository
+from klassen import Studiengang
+from testdaten import RANDFAELLE, csv_schreiben
+from vergleich import INDEX_FAKTOR, Vergleich
+
+VORLAGE = Studiengang("Vorlage", 36, None, 180)
+
+def _exporte(tmp_path: Path) -> tuple:
+    alt = csv_schreiben(tmp_path / "alt.csv", [f"SG {i % 3};{i % 6};Kurs {i};5;ABGESCHLOSSEN;{1 + i % 30 / 10}" for i in range(300)]
+                        + RANDFAELLE)
+    neu_zeilen = [f"SG {i % 3};{i % 6};Kurs {i};5;{'BELEGT' if i % 7 == 0 else 'ABGESCHLOSSEN'};{1 + i % 25 / 10}"
+                  for i in range(20, 330)]
+    neu = csv_schreiben(tmp_path / "neu.csv", neu_zeilen + RANDFAELLE + ["SG 0;1;Kurs 20;5;ABGESCHLOSSEN;1.0"])
+    return CsvRepository(alt), CsvRepository(neu)
+
+def _sortiert(aenderungen) -> list:
+    return sorted(aenderungen, key=lambda a: (a.art, repr(a.schluessel)))
+
+def test_partitionen_liefern_dasselbe_wie_der_index(tmp_path: Path):
+    alt, neu = _exporte(tmp_path)
+    with Vergleich(alt, neu, VORLAGE) as im_speicher:
+        referenz, kennzahlen, duplikate = _sortiert(im_speicher.aenderungen()), im_speicher.kennzahlen(), im_speicher.duplikate
+    assert im_speicher.partitionen == 1 and referenz
+    # Budget für etwa ein Fünftel des Index: Partitionszahl wächst mit der Datei, kleine Puffer (mehrere Blöcke je Partition).
+    groesse = max(alt.dateipfad.stat().st_size, neu.dateipfad.stat().st_size)
+    budget = groesse * INDEX_FAKTOR // 5
+    with Vergleich(alt, neu, VORLAGE, speicherbudget=budget) as partitioniert:
+        assert partitioniert.partitionen == math.ceil(groesse * INDEX_FAKTOR / budget) > 1
+        assert _sortiert(partitioniert.aenderungen()) == referenz
+        assert partitioniert.kennzahlen() == kennzahlen
+        assert partitioniert.duplikate == duplikate
+
+def test_leere_partitionen_werden_uebersprungen(tmp_path: Path):
+    alt = CsvRepository(csv_schreiben(tmp_path / "alt.csv", ["SG;1;A;5;ABGESCHLOSSEN;2.0"]))
+    neu = CsvRepository(csv_schreiben(tmp_path / "neu.csv", ["SG;1;A;5;ABGESCHLOSSEN;1.0"]))
+    with Vergleich(alt, neu, VORLAGE, partitionen=16) as vergleich:
+        (aenderung,) = vergleich.aenderungen()
+    assert (aenderung.art, aenderung.felder) == ("geaendert", ("note",))
+
+def test_kennzahlen_entsprechen_der_gruppierten_aggregation(tmp_path: Path):
+    alt, neu = _exporte(tmp_path)
+    with Vergleich(alt, neu, VORLAGE, partitionen=5) as vergleich:
+        kennzahlen = {k.studiengang: k.nachher for k in vergleich.kennzahlen()}
+    for gruppe in gruppiert_auswerten(neu, VORLAGE):
+        stand = kennzahlen[gruppe.studiengang]
+        assert (stand.durchschnitt, stand.ects_prozent, stand.ects_abgeschlossen, stand.anzahl_belegt, stand.zeilen) == (
+            gruppe.durchschnitt, gruppe.ects_prozent, gruppe.ects_abgeschlossen, gruppe.anzahl_belegt, gruppe.zeilen)
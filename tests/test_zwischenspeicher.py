@@ -0,0 +1,79 @@
+# Zwischenspeicher: Treffer, Invalidierung und best-effort-Verhalten bei IO-/Pickle-Fehlern.
+from __future__ import annotations
+import logging
+import os
+from pathlib import Path
+
+import zwischenspeicher
+from zwischenspeicher import SnapshotCache
+
+class _Erzeuger:
+    def __init__(self, wert: object) -> None:
+        self.wert = wert
+        self.aufrufe = 0
+
+    def __call__(self) -> object:
+        self.aufrufe += 1
+        return self.wert
+
+def _csv(tmp_path: Path, inhalt: str = "a;b\n1;2\n") -> Path:
+    pfad = tmp_path / "daten.csv"
+    pfad.write_text(inhalt, encoding="utf-8")
+    return pfad
+
+def test_treffer_und_invalidierung(tmp_path: Path):
+    cache, pfad, erzeugen = SnapshotCache(tmp_path / "cache"), _csv(tmp_path), _Erzeuger({"x": 1})
+    assert cache.laden(pfad, erzeugen) == {"x": 1}
+    assert cache.laden(pfad, erzeugen) == {"x": 1}
+    assert erzeugen.aufrufe == 1
+    pfad.write_text("a;b\n1;3\n", encoding="utf-8")
+    cache.laden(pfad, erzeugen)
+    assert erzeugen.aufrufe == 2
+
+def test_verzeichnis_ist_datei(tmp_path: Path, caplog):
+    blockiert = tmp_path / "cache"
+    blockiert.write_text("keine Ablage", encoding="utf-8")
+    erzeugen = _Erzeuger([1, 2])
+    with caplog.at_level(logging.WARNING, logger="studium.zwischenspeicher"):
+        assert SnapshotCache(blockiert).laden(_csv(tmp_path), erzeugen) == [1, 2]
+    assert erzeugen.aufrufe == 1 and "nicht nutzbar" in caplog.text
+
+def test_nicht_serialisierbar(tmp_path: Path):
+    wert = lambda: None  # noqa: E731 - Lambdas lassen sich nicht pickeln
+    assert SnapshotCache(tmp_path / "cache").laden(_csv(tmp_path), lambda: wert) is wert
+
+def test_zu_gross_wird_protokolliert(tmp_path: Path, caplog):
+    cache, pfad, erzeugen = SnapshotCache(tmp_path / "cache", max_bytes=100), _csv(tmp_path), _Erzeuger("x" * 1000)
+    with caplog.at_level(logging.WARNING, logger="studium.zwischenspeicher"):
+        cache.laden(pfad, erzeugen)
+        cache.laden(pfad, erzeugen)
+    assert erzeugen.aufrufe == 2 and "Limit 100" in caplog.text
+
+def test_defekter_eintrag_wird_neu_erzeugt(tmp_path: Path):
+    cache, pfad, erzeugen = SnapshotCache(tmp_path / "cache"), _csv(tmp_path), _Erzeuger(42)
+    cache.laden(pfad, erzeugen)
+    for datei in (tmp_path / "cache").glob("*.pkl"):
+        datei.write_bytes(b"kaputt")
+    assert cache.laden(pfad, erzeugen) == 42 and erzeugen.aufrufe == 2
+
+def test_standardverzeichnis_liegt_neben_dem_modul():
+    assert zwischenspeicher.STANDARD_VERZEICHNIS.parent == Path(zwischenspeicher.__file__).resolve().parent
+
+def test_aenderung_waehrend_des_aufbaus_wird_nicht_abgelegt(tmp_path: Path):
+    # Gleich lange Änderung mit neuer mtime: ein abgelegter Eintrag (alter Stat, neuer Hash) würde später per
+    # Hash-Vergleich den alten Wert für den neuen Inhalt liefern.
+    cache, pfad = SnapshotCache(tmp_path / "cache"), _csv(tmp_path)
+    inhalte = []
+
+    def erzeugen() -> str:
+        inhalte.append(pfad.read_text(encoding="utf-8"))
+        if len(inhalte) == 1:
+            pfad.write_text("a;b\n1;3\n", encoding="utf-8")
+            stat = pfad.stat()
+            os.utime(pfad, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        return inhalte[-1]
+
+    assert cache.laden(pfad, erzeugen) == "a;b\n1;2\n"
+    assert cache.laden(pfad, erzeugen) == "a;b\n1;3\n"
+    assert cache.laden(pfad, erzeugen) == "a;b\n1;3\n"
+    assert len(inhalte) == 2
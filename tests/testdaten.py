@@ -0,0 +1,39 @@
+# Gemeinsame Testdaten: kleine CSV-Dateien mit den Export-Eigenheiten, die alle Lesewege gleich behandeln müssen.
+from __future__ import annotations
+from pathlib import Path
+from typing import List
+
+from csv_daten import CsvRepository
+
+KOPFZEILE = "studiengang;semester_nummer;kurs_name;ects;status;note"
+
+# Je Zeile ein Randfall; Zeilenumbrüche in Quotes, Quotes mitten im Feld, Leer-/Kurz-/Langzeilen, NBSP.
+# Die Anzahl '"' je Durchgang ist ungerade, damit reine Quote-Paritätszählung Satzgrenzen falsch setzen würde.
+RANDFAELLE = [
+    "SG A;1;Plain;5;ABGESCHLOSSEN;2.3",
+    " SG A ; 2 ;  Leerzeichen  ; 5 ; abgeschlossen ; 2,0 ",
+    '"SG A";3;"Gequotet; mit Semikolon";5;BELEGT;',
+    'SG B;1;O"Brien;5;ABGESCHLOSSEN;1.7',
+    'SG B;2;"Mehr-\nzeilig";5;ABGESCHLOSSEN;3.0',
+    'SG B;2;"Escape ""x""";10;ABGESCHLOSSEN;1.0',
+    '"SG C;4;Ein Feld;5;ABGESCHLOSSEN;2.7"',
+    "SG C;4;Zu kurz",
+    "SG C;5;Zu lang;5;ABGESCHLOSSEN;4.0;extra",
+    ";;;;;;Überhang",
+    "",
+    ' ; ;"";\'\'',
+    " ; ; ",
+    "SG D;\u00a03;\u00a0NBSP\u00a0;5;BELEGT;",
+    '\u00a0;\u00a0;"";\u00a0',
+    "SG D;1;'Einfach';5;ABGESCHLOSSEN;'1.3'",
+    "SG D;x;Ungültig;fünf;OFFEN;1,2,3",
+]
+
+def csv_schreiben(pfad: Path, zeilen: List[str], kodierung: str = "utf-8-sig", kopfzeile: str = KOPFZEILE) -> Path:
+    with pfad.open("w", encoding=kodierung, newline="") as f:
+        f.write(kopfzeile + "\n" + "\n".join(zeilen) + "\n")
+    return pfad
+
+def zeilen_als_listen(repo: CsvRepository) -> List[List[str]]:
+    """Referenz: datenzeilen_iterieren als Zeilenlisten in Kopfzeilenreihenfolge."""
+    return [[z[name] for name in repo.kopfzeile] for z in repo.datenzeilen_iterieren()]
@@ -0,0 +1,259 @@
+# Verantwortung: zwei CSV-Exporte (z. B. gestern/heute) vergleichen: Zeilenänderungen plus Kennzahlen je Studiengang.
+# Hash-Index je Schlüssel (studiengang, semester_nummer, kurs_name), O(n); große Dateien werden in
+# mit der Dateigröße skalierte Hash-Partitionen auf die Platte ausgelagert, sodass nur eine Partition gleichzeitig im Speicher liegt.
+# Aufruf: python vergleich.py alt.csv neu.csv [--nur-kennzahlen]   (JSON-Zeilen nach stdout)
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import pickle
+import sys
+import tempfile
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aggregation import KennzahlenAggregat
+from csv_daten import CsvLesefehler, CsvRepository
+from klassen import Studiengang
+from mapping import zeile_mappen
+
+# Schlüssel einer Zeile: (Studiengang, Semesternummer, Kursname).
+Schluessel = Tuple[str, Optional[int], str]
+
+SPEICHERBUDGET_STANDARD = 64 * 1024 * 1024  # Bytes für einen Index im Speicher; zugleich Budget der Schreibpuffer
+INDEX_FAKTOR = 6  # Index im Speicher ~ 6x Dateigröße (Dict-Einträge, Tupel, Zeilenstand je Zeile)
+_EINTRAG_BYTES = 256  # grobe Größe eines gepufferten Eintrags (Tupel mit Schlüssel) im Speicher
+
+@dataclass(frozen=True, slots=True)
+class Zeilenstand:
+    """Verglichene Fachwerte einer Zeile (gemappt wie in der Pipeline)."""
+    ects: Optional[int]
+    status: str
+    note: Optional[float]
+
+@dataclass
+class Aenderung:
+    """Eine Zeilenänderung: neu, entfernt oder geaendert (mit den geänderten Feldern)."""
+    art: str
+    schluessel: Schluessel
+    vorher: Optional[Zeilenstand]
+    nachher: Optional[Zeilenstand]
+    felder: Tuple[str, ...] = ()
+
+@dataclass
+class StudiengangStand:
+    """Kennzahlen eines Studiengangs in einem Export (Formeln aus Studiengang)."""
+    durchschnitt: Optional[float]
+    ects_prozent: float
+    ects_abgeschlossen: int
+    anzahl_belegt: int
+    zeilen: int
+
+@dataclass
+class KennzahlVergleich:
+    """Vorher/Nachher je Studiengang; None, wenn der Studiengang in einem Export fehlt."""
+    studiengang: str
+    vorher: Optional[StudiengangStand]
+    nachher: Optional[StudiengangStand]
+
+def _stand(aggregat: Optional[KennzahlenAggregat], studiengang: Studiengang) -> Optional[StudiengangStand]:
+    if aggregat is None:
+        return None
+    return StudiengangStand(
+        durchschnitt=aggregat.durchschnitt(studiengang),
+        ects_prozent=aggregat.ects_prozent(studiengang),
+        ects_abgeschlossen=aggregat.ects_abgeschlossen,
+        anzahl_belegt=aggregat.anzahl_belegt,
+        zeilen=aggregat.zeilen,
+    )
+
+def _felder(vorher: Zeilenstand, nachher: Zeilenstand) -> Tuple[str, ...]:
+    return tuple(name for name in ("status", "note", "ects") if getattr(vorher, name) != getattr(nachher, name))
+
+@dataclass
+class _Seite:
+    """Gelesener Export: Index (eine Partition) oder Partitionsdateien, plus Aggregat je Studiengang."""
+    gruppen: Dict[str, KennzahlenAggregat] = field(default_factory=dict)
+    index: Dict[Schluessel, Zeilenstand] = field(default_factory=dict)
+    partitionen: List[Path] = field(default_factory=list)
+    duplikate: int = 0
+
+def _block_anhaengen(pfad: Path, block: list) -> None:
+    """Schreibt einen Pufferblock ans Ende der Partitionsdatei; die Datei ist nur dafür kurz geöffnet."""
+    with pfad.open("ab") as f:
+        pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+    block.clear()
+
+def _lesen(repo: CsvRepository, partitionen: int, puffergroesse: int, verzeichnis: Optional[Path], praefix: str) -> _Seite:
+    """
+    Ein Durchlauf: Zeilen mappen, Aggregat je Studiengang fortschreiben und jede Zeile entweder in den
+    In-Memory-Index (partitionen == 1) oder per crc32(Schlüssel) in eine Partitionsdatei schreiben.
+    - Je Partition werden bis zu `puffergroesse` Einträge gesammelt und als ein Pickle-Block angehängt
+    - Partitionsdateien werden nur beim Anhängen geöffnet (höchstens ein offener Dateideskriptor)
+    """
+    seite = _Seite()
+    puffer: List[list] = []
+    if partitionen > 1:
+        seite.partitionen = [verzeichnis / f"{praefix}_{i}.bin" for i in range(partitionen)]
+        puffer = [[] for _ in range(partitionen)]
+    for z in repo.datenzeilen_iterieren():
+        kurs, pl = zeile_mappen(z)
+        name = z.get("studiengang", "")
+        aggregat = seite.gruppen.get(name)
+        if aggregat is None:
+            aggregat = seite.gruppen[name] = KennzahlenAggregat(kurse_behalten=False)
+        aggregat.hinzufuegen(kurs, pl)
+        note = None if pl is None else pl.note
+
+        schluessel = (name, kurs.semester_nummer, kurs.name)
+        if puffer:
+            i = zlib.crc32(repr(schluessel).encode("utf-8")) % partitionen
+            block = puffer[i]
+            block.append((schluessel, kurs.ects, kurs.status.value, note))  # Tupel: billiger zu picklen
+            if len(block) >= puffergroesse:
+                _block_anhaengen(seite.partitionen[i], block)
+        else:
+            if schluessel in seite.index:
+                seite.duplikate += 1
+            seite.index[schluessel] = Zeilenstand(kurs.ects, kurs.status.value, note)
+    for pfad, block in zip(seite.partitionen, puffer):
+        if block:
+            _block_anhaengen(pfad, block)
+    return seite
+
+def _partition_laden(pfad: Path, seite: _Seite) -> Dict[Schluessel, Zeilenstand]:
+    index: Dict[Schluessel, Zeilenstand] = {}
+    if not pfad.exists():  # keine Zeile in diese Partition gefallen
+        return index
+    with pfad.open("rb") as f:
+        while True:
+            try:
+                block = pickle.load(f)
+            except EOFError:
+                break
+            for schluessel, ects, status, note in block:
+                if schluessel in index:
+                    seite.duplikate += 1
+                index[schluessel] = Zeilenstand(ects, status, note)
+    pfad.unlink()
+    return index
+
+def _vergleichen(alt: Dict[Schluessel, Zeilenstand], neu: Dict[Schluessel, Zeilenstand]) -> Iterator[Aenderung]:
+    for schluessel, vorher in alt.items():
+        nachher = neu.get(schluessel)
+        if nachher is None:
+            yield Aenderung("entfernt", schluessel, vorher, None)
+        elif nachher != vorher:
+            yield Aenderung("geaendert", schluessel, vorher, nachher, _felder(vorher, nachher))
+    for schluessel, nachher in neu.items():
+        if schluessel not in alt:
+            yield Aenderung("neu", schluessel, None, nachher)
+
+class Vergleich:
+    """
+    Vergleich zweier Exporte. Beim Anlegen wird jede Datei genau einmal gelesen (Kennzahlen stehen
+    danach sofort bereit); aenderungen() streamt die Zeilenänderungen partitionsweise.
+    - Mehrfach vorkommende Schlüssel: die letzte Zeile zählt (Anzahl in `duplikate`)
+    - Reihenfolge: je Partition erst entfernte/geänderte (Reihenfolge im alten Export), dann neue
+    - partitionen=None: ceil(Dateigröße * INDEX_FAKTOR / Budget), d. h. 1, solange der Index ins Budget passt;
+      darüber wächst die Anzahl mit der Datei, sodass eine geladene Partition im Budget bleibt
+    - Schreibpuffer je Partition: Speicherbudget / (Partitionen * _EINTRAG_BYTES) Einträge
+    Als Kontextmanager verwenden (räumt die Partitionsdateien auf).
+    """
+
+    def __init__(
+        self,
+        alt: CsvRepository,
+        neu: CsvRepository,
+        vorlage: Studiengang,
+        speicherbudget: int = SPEICHERBUDGET_STANDARD,
+        partitionen: Optional[int] = None,
+    ) -> None:
+        alt.kopfzeile, neu.kopfzeile  # frühe Validierung -> CsvLesefehler statt OSError
+        if partitionen is None:
+            groesse = max(alt.dateipfad.stat().st_size, neu.dateipfad.stat().st_size)
+            partitionen = max(1, math.ceil(groesse * INDEX_FAKTOR / speicherbudget))
+        self.partitionen = partitionen
+        puffergroesse = max(1, speicherbudget // (partitionen * _EINTRAG_BYTES))
+        self._verzeichnis = tempfile.TemporaryDirectory(prefix="vergleich_") if partitionen > 1 else None
+        pfad = Path(self._verzeichnis.name) if self._verzeichnis else None
+        try:
+            self._alt = _lesen(alt, partitionen, puffergroesse, pfad, "alt")
+            self._neu = _lesen(neu, partitionen, puffergroesse, pfad, "neu")
+        except BaseException:
+            self.schliessen()
+            raise
+        self._vorlage = vorlage
+
+    def __enter__(self) -> "Vergleich":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.schliessen()
+
+    def schliessen(self) -> None:
+        if self._verzeichnis is not None:
+            self._verzeichnis.cleanup()
+            self._verzeichnis = None
+
+    @property
+    def duplikate(self) -> Tuple[int, int]:
+        """Mehrfach vorkommende Schlüssel (alt, neu); bei Partitionierung erst nach aenderungen() vollständig."""
+        return self._alt.duplikate, self._neu.duplikate
+
+    def aenderungen(self) -> Iterator[Aenderung]:
+        """
+        Zeilenänderungen; bei Partitionierung liegt jeweils nur ein Partitionspaar im Speicher
+        (die Partitionsdateien werden dabei verbraucht, also nur einmal iterierbar).
+        """
+        if self.partitionen == 1:
+            yield from _vergleichen(self._alt.index, self._neu.index)
+            return
+        for pfad_alt, pfad_neu in zip(self._alt.partitionen, self._neu.partitionen):
+            yield from _vergleichen(_partition_laden(pfad_alt, self._alt), _partition_laden(pfad_neu, self._neu))
+
+    def kennzahlen(self) -> List[KennzahlVergleich]:
+        """Studiengang-Kennzahlen vorher/nachher, sortiert nach Studiengang (Regelzeit/ECTS aus `vorlage`)."""
+        ergebnis: List[KennzahlVergleich] = []
+        for name in sorted(self._alt.gruppen.keys() | self._neu.gruppen.keys()):
+            studiengang = Studiengang(name, self._vorlage.regelzeitMonate, self._vorlage.startDatum,
+                                      self._vorlage.maximaleEcts)
+            ergebnis.append(KennzahlVergleich(
+                studiengang=name,
+                vorher=_stand(self._alt.gruppen.get(name), studiengang),
+                nachher=_stand(self._neu.gruppen.get(name), studiengang),
+            ))
+        return ergebnis
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Zwei CSV-Exporte vergleichen (JSON-Zeilen nach stdout).")
+    parser.add_argument("alt", type=Path)
+    parser.add_argument("neu", type=Path)
+    parser.add_argument("--nur-kennzahlen", action="store_true", help="Keine Zeilenänderungen ausgeben")
+    parser.add_argument("--speicherbudget", type=int, default=SPEICHERBUDGET_STANDARD,
+                        help="Speicher (Bytes) für einen Index; größere Exporte werden auf die Platte partitioniert")
+    parser.add_argument("--partitionen", type=int, default=None, help="Anzahl Hash-Partitionen erzwingen")
+    args = parser.parse_args(argv)
+
+    from berechnung import StudiengangParameter
+
+    try:
+        vergleich = Vergleich(CsvRepository(args.alt), CsvRepository(args.neu), StudiengangParameter().studiengang(),
+                              args.speicherbudget, args.partitionen)
+    except CsvLesefehler as e:
+        print(e.nachricht, file=sys.stderr)
+        return 1
+    with vergleich:
+        schreiben = sys.stdout.write
+        if not args.nur_kennzahlen:
+            for a in vergleich.aenderungen():
+                schreiben(json.dumps(asdict(a), ensure_ascii=False) + "\n")
+        for k in vergleich.kennzahlen():
+            schreiben(json.dumps({"art": "kennzahlen", **asdict(k)}, ensure_ascii=False) + "\n")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
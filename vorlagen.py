@@ -0,0 +1,127 @@
+# Verantwortung: HTML-Bausteine für Kacheln und Kurstabelle (geteilt von dashboard.py und berichte.py).
+# Vorlagen werden einmal beim Import geparst (string.Template) und je Aufruf nur befüllt; keine IO hier.
+from __future__ import annotations
+from html import escape
+from string import Template
+from typing import Dict, Iterable, List, Optional, Union
+
+from klassen import Kurs
+
+# CI-Farben für Kacheln.
+FARBE_LILA = "#8e44ad"
+FARBE_BLAU = "#2E86C1"
+FARBE_ROT = "#c0392b"
+
+# Kachel-Visuals (Dashboard und Berichte).
+KACHEL_STIL = """
+.kachel {
+  padding: 24px;
+  border-radius: 12px;
+  color: white;
+  text-align: center;
+  height: 180px;
+  display: flex;
+  flex-direction: column;
+  justify-content: center;
+}
+.k_title { font-size: 18px; margin-bottom: 8px; font-weight: 600; }
+.k_value { font-size: 36px; font-weight: 800; }
+.k_zusatz { margin-top: 4px; font-size: 16px; font-weight: 600; }
+.table_header {
+  font-size: 18px;
+  font-weight: 600;
+  margin-bottom: 8px;
+}
+"""
+
+_KACHEL = Template(
+    '<div class="kachel" style="background:$farbe;">'
+    '<div class="k_title">$titel</div>'
+    '<div class="k_value">$wert</div>'
+    '$zusatz'
+    '</div>'
+)
+_ZUSATZ = Template('<div class="k_zusatz">$text</div>')
+
+# Kurstabelle (Dashboard: st.table mit denselben Zeilen; Berichte: HTML).
+KURSTABELLE_HEADLINE = "Aktuell belegte Kurse"
+KEINE_BELEGTEN_KURSE = "Derzeit sind keine Kurse mit Status 'BELEGT' vorhanden."
+
+_BERICHT = Template("""<!DOCTYPE html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<title>$titel</title>
+<style>
+body { font-family: sans-serif; margin: 2rem auto; max-width: 960px; color: #222; }
+h2 { text-align: center; margin: 0 0 16px 0; }
+.raster { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #ddd; padding: 6px 8px; text-align: left; }
+@media print {
+  body { margin: 0; }
+  .kachel { -webkit-print-color-adjust: exact; print-color-adjust: exact; }
+}
+$kachel_stil
+</style>
+</head>
+<body>
+<h2>$titel</h2>
+<div class="raster">
+$durchschnitt
+$ects
+<div>$tabelle</div>
+$tage
+</div>
+</body>
+</html>
+""")
+
+def kachel(titel: str, wert: str, farbe: str, zusatz: str = "") -> str:
+    """Eine Kennzahl-Kachel; Texte werden HTML-escaped."""
+    return _KACHEL.substitute(
+        farbe=farbe,
+        titel=escape(titel),
+        wert=escape(wert),
+        zusatz=_ZUSATZ.substitute(text=escape(zusatz)) if zusatz else "",
+    )
+
+def durchschnitt_text(durchschnitt: Optional[float]) -> str:
+    """Formatierung bei None -> "-"."""
+    return "-" if durchschnitt is None else f"{durchschnitt:.2f}"
+
+def kennzahl_kacheln(durchschnitt: Optional[float], ects_prozent: float, ects_abgeschlossen: Optional[int],
+                     maximale_ects: int, verbleibende_tage: int) -> dict:
+    """Die drei Kacheln des Dashboards als HTML (Schlüssel: durchschnitt, ects, tage)."""
+    ects_abs_text = f"{ects_abgeschlossen}/{maximale_ects}" if ects_abgeschlossen is not None else ""
+    return {
+        "durchschnitt": kachel("Gesamtnotendurchschnitt", durchschnitt_text(durchschnitt), FARBE_LILA),
+        "ects": kachel("ECTS-Fortschritt", f"{ects_prozent:.2f}%", FARBE_BLAU, ects_abs_text),
+        "tage": kachel("Verbleibende Tage bis Studienende", str(verbleibende_tage), FARBE_ROT),
+    }
+
+def kurszeilen(kurse: Iterable[Kurs], headline: str = KURSTABELLE_HEADLINE) -> List[Dict[str, Union[str, int]]]:
+    """Zeilen der Kurstabelle (Spalten: Kursname unter `headline`, ECTS, Semester; None -> leer)."""
+    return [
+        {
+            headline: k.name,
+            "ECTS": "" if k.ects is None else k.ects,
+            "Semester": "" if k.semester_nummer is None else k.semester_nummer,
+        }
+        for k in kurse
+    ]
+
+def kurstabelle(kurse: Iterable[Kurs], headline: str = KURSTABELLE_HEADLINE) -> str:
+    """Tabelle der belegten Kurse als HTML, mit denselben Spalten wie im Dashboard."""
+    zeilen = kurszeilen(kurse, headline)
+    if not zeilen:
+        return f"<p>{KEINE_BELEGTEN_KURSE}</p>"
+    kopf = "".join(f"<th>{escape(spalte)}</th>" for spalte in zeilen[0])
+    koerper = "".join(
+        "<tr>" + "".join(f"<td>{escape(str(wert))}</td>" for wert in zeile.values()) + "</tr>" for zeile in zeilen
+    )
+    return f"<table><thead><tr>{kopf}</tr></thead><tbody>{koerper}</tbody></table>"
+
+def bericht(titel: str, kacheln: dict, tabelle: str) -> str:
+    """Vollständige, druckbare HTML-Seite im 2x2-Raster des Dashboards."""
+    return _BERICHT.substitute(titel=escape(titel), kachel_stil=KACHEL_STIL, tabelle=tabelle, **kacheln)
@@ -0,0 +1,178 @@
+# Verantwortung: aufbereitete Daten je CSV-Datei binär auf der Platte zwischenspeichern
+# (Fingerabdruck aus Pfad, Größe, mtime und Inhalts-Hash; LRU-Verdrängung mit Größenlimit).
+# Keine Fachlogik hier; was gespeichert wird, bestimmt der Aufrufer. Cache-IO ist best-effort:
+# Fehler beim Lesen/Schreiben werden protokolliert, der Wert wird dann einfach neu erzeugt.
+from __future__ import annotations
+from pathlib import Path
+from typing import Callable, Dict, Optional, TypeVar
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+
+T = TypeVar("T")
+
+logger = logging.getLogger("studium.zwischenspeicher")
+
+# Erhöhen, wenn sich das Format der gespeicherten Objekte ändert (alte Einträge werden dann neu gebaut).
+FORMAT_VERSION = 10
+
+# Standardverzeichnis neben den Modulen (unabhängig vom Arbeitsverzeichnis des Aufrufers).
+STANDARD_VERZEICHNIS = Path(__file__).resolve().parent / ".kennzahlen_cache"
+
+def inhalts_hash(pfad: Path, blockgroesse: int = 1024 * 1024) -> str:
+    """BLAKE2b-Hash des Dateiinhalts (blockweise gelesen)."""
+    h = hashlib.blake2b(digest_size=20)
+    with pfad.open("rb") as f:
+        for block in iter(lambda: f.read(blockgroesse), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class SnapshotCache:
+    """
+    Binärer Zwischenspeicher für aus CSV-Dateien erzeugte Objekte.
+    - Warmstart: stimmen Größe und mtime, wird ohne Hashen direkt geladen
+    - Geänderte mtime: Inhalts-Hash entscheidet, ob der Eintrag noch gilt
+    - Defekte Einträge/Indizes werden verworfen und transparent neu erzeugt
+    - Nicht nutzbares Verzeichnis, IO- oder Pickle-Fehler: Wert wird ohne Cache erzeugt
+    - Ändert sich die Datei während des Aufbaus, wird der Wert geliefert, aber nicht abgelegt
+    """
+
+    INDEX_DATEI = "index.json"
+
+    def __init__(self, verzeichnis: Path = STANDARD_VERZEICHNIS, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self._verzeichnis = verzeichnis
+        self._max_bytes = max_bytes
+
+    def _lade_index(self) -> Dict[str, dict]:
+        """Liest den Index; fehlend oder defekt -> leerer Index."""
+        try:
+            with (self._verzeichnis / self.INDEX_DATEI).open("r", encoding="utf-8") as f:
+                index = json.load(f)
+            return index if isinstance(index, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _schreibe_atomar(self, ziel: Path, daten: bytes) -> None:
+        """Schreibt über eine temporäre Datei + os.replace (kein halbfertiger Zustand bei Abbruch)."""
+        import tempfile  # lazy: zieht random/shutil nach sich und wird nur beim Schreiben gebraucht
+
+        fd, tmp = tempfile.mkstemp(dir=self._verzeichnis, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(daten)
+            os.replace(tmp, ziel)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _speichere_index(self, index: Dict[str, dict]) -> None:
+        self._schreibe_atomar(self._verzeichnis / self.INDEX_DATEI, json.dumps(index).encode("utf-8"))
+
+    def _index_sichern(self, index: Dict[str, dict]) -> None:
+        """Wie _speichere_index, aber ein Schreibfehler wird nur protokolliert."""
+        try:
+            self._speichere_index(index)
+        except OSError as e:
+            logger.warning("Index des Zwischenspeichers nicht schreibbar: %s", e)
+
+    def _lade_eintrag(self, eintrag: dict) -> Optional[object]:
+        """Lädt den gespeicherten Wert; None, wenn Datei fehlt, defekt ist oder nicht passt."""
+        try:
+            with (self._verzeichnis / eintrag["datei"]).open("rb") as f:
+                version, hashwert, wert = pickle.load(f)
+        except Exception:
+            return None
+        if version != FORMAT_VERSION or hashwert != eintrag.get("hash"):
+            return None
+        return wert
+
+    def _entferne(self, index: Dict[str, dict], schluessel: str) -> None:
+        eintrag = index.pop(schluessel, None)
+        if eintrag is not None:
+            (self._verzeichnis / eintrag["datei"]).unlink(missing_ok=True)
+
+    def _verdraengen(self, index: Dict[str, dict]) -> None:
+        """LRU: entfernt die am längsten nicht genutzten Einträge, bis das Größenlimit passt."""
+        gesamt = sum(e.get("bytes", 0) for e in index.values())
+        for schluessel in sorted(index, key=lambda s: index[s].get("zugriff", 0)):
+            if gesamt <= self._max_bytes:
+                break
+            gesamt -= index[schluessel].get("bytes", 0)
+            self._entferne(index, schluessel)
+
+    def laden(self, pfad: Path, erzeugen: Callable[[], T], variante: str = "") -> T:
+        """
+        Liefert den Wert für die CSV-Datei `pfad` aus dem Cache oder erzeugt ihn über `erzeugen`
+        und legt ihn ab. `variante` trennt unterschiedliche Aufbereitungen derselben Datei.
+        """
+        stat = pfad.stat()
+        schluessel = f"{pfad.resolve()}|{variante}"
+        try:
+            self._verzeichnis.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning("Zwischenspeicher %s nicht nutzbar (%s); ohne Cache weiter.", self._verzeichnis, e)
+            return erzeugen()
+        index = self._lade_index()
+        eintrag = index.get(schluessel)
+
+        hashwert: Optional[str] = None
+        if eintrag is not None:
+            gleich = eintrag.get("groesse") == stat.st_size and eintrag.get("mtime_ns") == stat.st_mtime_ns
+            if not gleich and eintrag.get("groesse") == stat.st_size:
+                hashwert = inhalts_hash(pfad)
+                gleich = hashwert == eintrag.get("hash")
+            wert = self._lade_eintrag(eintrag) if gleich else None
+            if wert is not None:
+                eintrag.update(mtime_ns=stat.st_mtime_ns, zugriff=time.time())
+                self._index_sichern(index)
+                return wert  # type: ignore[return-value]
+            try:
+                self._entferne(index, schluessel)
+            except OSError as e:
+                logger.warning("Veralteter Cache-Eintrag für %s nicht entfernbar: %s", pfad, e)
+
+        wert = erzeugen()
+        if hashwert is None:
+            hashwert = inhalts_hash(pfad)
+        # Während des Erzeugens/Hashens geändert: Wert und Hash passen evtl. nicht zu `stat` -> nicht ablegen.
+        try:
+            danach = pfad.stat()
+        except OSError:
+            danach = None
+        if danach is None or (danach.st_size, danach.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            logger.info("%s wurde während des Aufbaus geändert; Ergebnis wird nicht zwischengespeichert.", pfad)
+            return wert
+        try:
+            daten = pickle.dumps((FORMAT_VERSION, hashwert, wert), protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            logger.warning("Wert für %s nicht serialisierbar (%s); wird nicht zwischengespeichert.", pfad, e)
+            return wert
+        if len(daten) > self._max_bytes:
+            logger.warning(
+                "Snapshot für %s ist %d Bytes groß (Limit %d); wird nicht zwischengespeichert.",
+                pfad, len(daten), self._max_bytes,
+            )
+            return wert
+        datei = hashlib.blake2b(schluessel.encode("utf-8"), digest_size=16).hexdigest() + ".pkl"
+        try:
+            self._schreibe_atomar(self._verzeichnis / datei, daten)
+        except OSError as e:
+            logger.warning("Cache-Eintrag für %s nicht schreibbar: %s", pfad, e)
+            return wert
+        index[schluessel] = {
+            "datei": datei,
+            "groesse": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "hash": hashwert,
+            "bytes": len(daten),
+            "zugriff": time.time(),
+        }
+        try:
+            self._verdraengen(index)
+        except OSError as e:
+            logger.warning("Verdrängung im Zwischenspeicher fehlgeschlagen: %s", e)
+        self._index_sichern(index)
+        return wert